@@ -5,11 +5,18 @@ import logging
 import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
 
 from .const import DOMAIN, PLATFORMS
 from .coordinator import EasySmartMonitorCoordinator
 from .client import EasySmartMonitorApiClient
+from .devices import (
+    async_migrate_legacy_devices,
+    async_sync_equipment_devices,
+)
+from .entity_index import async_release_entity_index
+from .services import async_register_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,6 +24,7 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup(hass: HomeAssistant, config: dict):
     """Setup inicial da integração."""
     hass.data.setdefault(DOMAIN, {})
+    async_register_services(hass)
     return True
 
 
@@ -48,13 +56,48 @@ async def async_setup_entry(
 
     await coordinator.async_initialize()
 
+    # 🔹 Dispositivos de todos os equipamentos de uma vez; as
+    # plataformas só referenciam (evita resolver cada um por entidade).
+    # Antes, os de versões anteriores (por uuid) passam para o id
+    equipments = coordinator.storage.get_equipments()
+    async_migrate_legacy_devices(hass, entry, equipments)
+    async_sync_equipment_devices(hass, entry, equipments)
+
+    # 🔹 Parada do HA não descarrega a entry: envio final aqui também
+    async def _async_drain_on_stop(_event: Event) -> None:
+        await coordinator.async_shutdown()
+        await session.close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, _async_drain_on_stop
+        )
+    )
+
     await hass.config_entries.async_forward_entry_setups(
         entry, PLATFORMS
     )
 
+    # 🔹 Coleta / envio agendados; options aplicadas sem recarga
+    coordinator.async_start()
+    entry.async_on_unload(
+        entry.add_update_listener(async_options_updated)
+    )
+
     return True
 
 
+async def async_options_updated(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+) -> None:
+    """Options alteradas: aplica a diferença no coordinator."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    if coordinator.async_apply_options(entry.options):
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -67,9 +110,14 @@ async def async_unload_entry(
     if unload_ok:
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
 
+        # Envio final (com prazo) antes de fechar a sessão HTTP
+        await coordinator.async_shutdown()
+
         # Fecha a sessão HTTP
-        await coordinator.api_client._session.close()
+        await coordinator.api._session.close()
 
-        await coordinator.async_shutdown()
+        # Última entry: o índice de entidades deixa de ouvir o registry
+        if not hass.data[DOMAIN]:
+            async_release_entity_index(hass)
 
     return unload_ok
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""
+Agregação de telemetria em janelas de tempo.
+
+Responsabilidades:
+- Manter min / max / soma / contagem / último por (equipamento, tipo)
+- Emitir um único evento agregado quando a janela fecha
+- Compactar telemetria antiga da fila em agregados durante quedas da API
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COMPACTION_CHUNK_SIZE,
+    COMPACTION_WINDOWS,
+    DEFAULT_QUEUE_WATERMARK,
+    TELEMETRY_SENSOR_TYPES,
+)
+
+
+def window_start(timestamp: datetime, window: int) -> datetime:
+    """Início da janela (alinhada à época) que contém o timestamp."""
+    epoch = int(timestamp.timestamp())
+    return dt_util.utc_from_timestamp(epoch - epoch % window)
+
+
+@dataclass
+class RunningAggregate:
+    """Estatísticas O(1) de uma janela aberta."""
+
+    start: datetime
+    window: int
+    min: float
+    max: float
+    sum: float
+    count: int
+    last: float
+
+    @classmethod
+    def first(
+        cls, value: float, timestamp: datetime, window: int
+    ) -> RunningAggregate:
+        return cls(
+            start=window_start(timestamp, window),
+            window=window,
+            min=value,
+            max=value,
+            sum=value,
+            count=1,
+            last=value,
+        )
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(seconds=self.window)
+
+    @classmethod
+    def empty(cls, start: datetime, window: int) -> RunningAggregate:
+        return cls(
+            start=start,
+            window=window,
+            min=float("inf"),
+            max=float("-inf"),
+            sum=0.0,
+            count=0,
+            last=0.0,
+        )
+
+    def add(self, value: float) -> None:
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sum += value
+        self.count += 1
+        self.last = value
+
+    def merge_event(self, event: dict[str, Any]) -> None:
+        """Incorpora um evento bruto ou um agregado já existente."""
+        if not event.get("aggregate"):
+            self.add(event["value"])
+            return
+
+        self.min = min(self.min, event["min"])
+        self.max = max(self.max, event["max"])
+        self.sum += event["value"] * event["count"]
+        self.count += event["count"]
+        self.last = event["last"]
+
+    def to_event(
+        self, equipment_id: str, sensor_type: str
+    ) -> dict[str, Any]:
+        """Evento agregado; `value` é a média da janela."""
+        return {
+            "equipment_id": equipment_id,
+            "type": sensor_type,
+            "value": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+            "last": self.last,
+            "window": self.window,
+            "aggregate": True,
+            "timestamp": self.start.isoformat(),
+        }
+
+
+class WindowAggregator:
+    """
+    Estágio entre a coleta e a fila.
+
+    Cada (equipamento, tipo) tem no máximo uma janela aberta. Uma amostra
+    que cai em uma janela posterior fecha a anterior.
+    """
+
+    def __init__(self) -> None:
+        self._open: dict[tuple[str, str], RunningAggregate] = {}
+
+    def add(
+        self,
+        equipment_id: str,
+        sensor_type: str,
+        value: float,
+        timestamp: datetime,
+        window: int,
+    ) -> dict[str, Any] | None:
+        """Acumula a amostra; retorna o agregado fechado, se houver."""
+        key = (equipment_id, sensor_type)
+        current = self._open.get(key)
+
+        if (
+            current is not None
+            and current.window == window
+            and timestamp < current.end
+        ):
+            current.add(value)
+            return None
+
+        self._open[key] = RunningAggregate.first(value, timestamp, window)
+
+        if current is None:
+            return None
+
+        return current.to_event(equipment_id, sensor_type)
+
+    def close_expired(self, now: datetime) -> list[dict[str, Any]]:
+        """Fecha e retorna todas as janelas que já terminaram."""
+        closed = [
+            key for key, aggregate in self._open.items()
+            if aggregate.end <= now
+        ]
+
+        return [
+            self._open.pop(key).to_event(*key)
+            for key in closed
+        ]
+
+    def close_all(self) -> list[dict[str, Any]]:
+        """Fecha todas as janelas, mesmo incompletas (ex.: encerramento)."""
+        events = [
+            aggregate.to_event(*key)
+            for key, aggregate in self._open.items()
+        ]
+        self._open.clear()
+        return events
+
+
+# ============================================================
+# COMPACTAÇÃO DA FILA
+# ============================================================
+
+def is_compactable(event: dict[str, Any]) -> bool:
+    """Telemetria numérica (bruta ou agregada); alarmes nunca."""
+    return (
+        event.get("type") in TELEMETRY_SENSOR_TYPES
+        and "value" in event
+    )
+
+
+def compact_events(
+    events: list[dict[str, Any]], window: int
+) -> list[dict[str, Any]]:
+    """
+    Agrupa telemetria por (equipamento, tipo, janela) em agregados.
+
+    Eventos não compactáveis (alarmes) e agregados de janela igual ou
+    maior que `window` são mantidos intactos: reagrupá-los em baldes
+    menores só perderia a janela original. Cada agregado ocupa a
+    posição da primeira amostra da sua janela, o que preserva a ordem
+    cronológica aproximada da fila.
+    """
+    output: list[dict[str, Any] | tuple[str, str, datetime]] = []
+    buckets: dict[tuple[str, str, datetime], RunningAggregate] = {}
+
+    for event in events:
+        if not is_compactable(event) or event.get("window", 0) >= window:
+            output.append(event)
+            continue
+
+        timestamp = dt_util.parse_datetime(event["timestamp"])
+        key = (
+            event["equipment_id"],
+            event["type"],
+            window_start(timestamp, window),
+        )
+
+        aggregate = buckets.get(key)
+        if aggregate is None:
+            aggregate = buckets[key] = RunningAggregate.empty(
+                key[2], window
+            )
+            output.append(key)
+
+        aggregate.merge_event(event)
+
+    return [
+        buckets[item].to_event(item[0], item[1])
+        if isinstance(item, tuple)
+        else item
+        for item in output
+    ]
+
+
+class BacklogCompactor:
+    """
+    Compactação incremental e retomável da fila acumulada.
+
+    A cada etapa, processa no máximo `chunk_size` eventos a partir do
+    cursor (tudo antes dele já foi compactado na janela atual). Quando não
+    há mais o que compactar e a fila continua acima do limite, passa para
+    a próxima janela de COMPACTION_WINDOWS e recomeça do início, fundindo
+    os agregados anteriores.
+    """
+
+    def __init__(
+        self,
+        *,
+        watermark: int = DEFAULT_QUEUE_WATERMARK,
+        chunk_size: int = COMPACTION_CHUNK_SIZE,
+        windows: tuple[int, ...] = COMPACTION_WINDOWS,
+    ) -> None:
+        self.watermark = watermark
+        self.chunk_size = chunk_size
+        self._windows = windows
+        self._level = 0
+        self.cursor = 0
+
+    @property
+    def window(self) -> int:
+        return self._windows[self._level]
+
+    def reset(self) -> None:
+        """Fila drenada: volta para a janela mais fina."""
+        self._level = 0
+        self.cursor = 0
+
+    def needs_compaction(self, queue: list[dict[str, Any]]) -> bool:
+        return len(queue) > self.watermark
+
+    def compact_step(
+        self, queue: list[dict[str, Any]], now: datetime
+    ) -> bool:
+        """
+        Compacta um bloco da fila, no lugar.
+
+        Só considera eventos mais antigos que a janela atual. Retorna
+        False quando não há mais progresso possível.
+        """
+        cutoff = now - timedelta(seconds=self.window)
+        start = min(self.cursor, len(queue))
+        end = start
+        limit = min(len(queue), start + self.chunk_size)
+
+        while end < limit and (
+            dt_util.parse_datetime(queue[end]["timestamp"]) < cutoff
+        ):
+            end += 1
+
+        if end == start:
+            if self._level + 1 >= len(self._windows):
+                return False
+
+            self._level += 1
+            self.cursor = 0
+            return True
+
+        compacted = compact_events(queue[start:end], self.window)
+        queue[start:end] = compacted
+        self.cursor = start + len(compacted)
+        return True
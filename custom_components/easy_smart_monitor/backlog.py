@@ -0,0 +1,482 @@
+"""
+Fila persistente (backlog) do Easy Smart Monitor.
+
+Responsabilidades:
+- Guardar em disco os eventos ainda não confirmados pela API
+- Usar blocos comprimidos (ver gorilla.py) para reduzir escritas
+- Segmentos só de acréscimo, com registros delimitados e CRC32
+- Recuperar após queda de energia até o último registro válido
+- Entregar os registros, do mais antigo ao mais novo, para envio
+
+Layout de um registro: MAGIC | tamanho (u32) | crc32 (u32) | bloco.
+
+Os registros confirmados são marcados por um cursor (arquivo `cursor`),
+gravado sem fsync: após uma queda, alguns eventos podem ser reenviados,
+mas nenhum é perdido.
+
+Todos os métodos fazem I/O bloqueante e devem rodar no executor.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from .const import SEGMENT_MAX_BYTES
+from .gorilla import decode_block, encode_block, read_block_header
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+CURSOR_FILE = "cursor"
+
+RECORD_MAGIC = b"ESMR"
+_FRAME = struct.Struct(">4sII")
+
+
+@dataclass
+class RecordInfo:
+    """Metadados de um registro (lidos só do cabeçalho do bloco)."""
+
+    seq: int
+    offset: int
+    size: int
+    count: int
+    min_ts: int | None
+
+    @property
+    def position(self) -> tuple[int, int]:
+        return self.seq, self.offset
+
+
+def _frame(payload: bytes) -> bytes:
+    return _FRAME.pack(
+        RECORD_MAGIC, len(payload), zlib.crc32(payload)
+    ) + payload
+
+
+def _scan_segment(
+    data: bytes,
+) -> tuple[list[tuple[int, int, bytes]], int]:
+    """
+    Percorre os registros de um segmento.
+
+    Retorna ([(offset, tamanho, bloco)], fim do último registro válido).
+    Para no primeiro registro truncado ou corrompido.
+    """
+    records: list[tuple[int, int, bytes]] = []
+    offset = 0
+
+    while offset + _FRAME.size <= len(data):
+        magic, length, crc = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        payload = data[start:start + length]
+
+        if (
+            magic != RECORD_MAGIC
+            or len(payload) != length
+            or zlib.crc32(payload) != crc
+        ):
+            break
+
+        records.append((offset, _FRAME.size + length, payload))
+        offset = start + length
+
+    return records, offset
+
+
+def _fsync_directory(directory: str) -> None:
+    """Garante que a criação de um arquivo sobreviva a uma queda."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SegmentBacklog:
+    """
+    Backlog em disco formado por segmentos numerados sequencialmente.
+
+    Novos registros são acrescentados ao segmento ativo; ao passar de
+    `segment_max_bytes`, um novo segmento é iniciado. Segmentos cujos
+    registros foram todos confirmados são apagados.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        segment_max_bytes: int = SEGMENT_MAX_BYTES,
+    ) -> None:
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self._records: deque[RecordInfo] = deque()
+        self._sizes: dict[int, int] = {}
+        self._active_seq = 0
+        self._io_lock = threading.Lock()
+
+    # =========================================================
+    # LOAD / RECUPERAÇÃO
+    # =========================================================
+
+    def load(self) -> None:
+        """
+        Indexa os segmentos existentes (ex.: após reinício).
+
+        Um registro incompleto ou corrompido (queda durante a escrita)
+        é descartado junto com tudo que vem depois dele no segmento.
+        """
+        with self._io_lock:
+            self._records.clear()
+            self._sizes.clear()
+            self._active_seq = 0
+
+            if not os.path.isdir(self.directory):
+                return
+
+            cursor = self._read_cursor()
+            seqs = sorted(
+                int(name.removesuffix(SEGMENT_SUFFIX))
+                for name in os.listdir(self.directory)
+                if name.endswith(SEGMENT_SUFFIX)
+                and name.removesuffix(SEGMENT_SUFFIX).isdigit()
+            )
+
+            for seq in seqs:
+                self._load_segment(seq, cursor)
+
+            if seqs:
+                self._active_seq = seqs[-1]
+
+            for seq in seqs:
+                self._remove_if_acked(seq)
+
+            if self._records:
+                _LOGGER.info(
+                    "Backlog carregado: %s eventos em %s segmentos",
+                    self.event_count,
+                    len(self._sizes),
+                )
+
+    def _load_segment(self, seq: int, cursor: tuple[int, int]) -> None:
+        path = self._path(seq)
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError as err:
+            _LOGGER.warning("Segmento ilegível ignorado (%s): %s", path, err)
+            return
+
+        records, valid_end = _scan_segment(data)
+
+        if valid_end < len(data):
+            _LOGGER.warning(
+                "Segmento %s truncado em %s bytes (registro incompleto)",
+                seq,
+                valid_end,
+            )
+            with open(path, "r+b") as file:
+                file.truncate(valid_end)
+                file.flush()
+                os.fsync(file.fileno())
+
+        self._sizes[seq] = valid_end
+
+        for offset, size, payload in records:
+            if (seq, offset) < cursor:
+                continue
+
+            try:
+                header, _offset = read_block_header(payload)
+            except ValueError as err:
+                _LOGGER.warning("Registro inválido ignorado: %s", err)
+                continue
+
+            self._records.append(
+                RecordInfo(seq, offset, size, header["count"], header["min_ts"])
+            )
+
+    # =========================================================
+    # ESCRITA / LEITURA
+    # =========================================================
+
+    def append(
+        self,
+        events: Iterable[dict[str, Any]],
+        *,
+        fsync: bool = True,
+    ) -> RecordInfo:
+        """
+        Acrescenta um registro com os eventos ao segmento ativo.
+
+        Um único fsync cobre o registro inteiro. Se a escrita falhar no
+        meio, o segmento volta ao tamanho anterior.
+        """
+        payload = encode_block(events)
+        header, _offset = read_block_header(payload)
+        record = _frame(payload)
+
+        with self._io_lock:
+            os.makedirs(self.directory, exist_ok=True)
+
+            seq = self._active_seq
+            offset = self._sizes.get(seq, 0)
+
+            if offset and offset >= self.segment_max_bytes:
+                seq = self._active_seq = seq + 1
+                offset = 0
+
+            path = self._path(seq)
+            created = not os.path.exists(path)
+
+            with open(path, "ab", buffering=0) as file:
+                try:
+                    view = memoryview(record)
+                    while view:
+                        view = view[file.write(view):]
+                    if fsync:
+                        os.fsync(file.fileno())
+                except OSError:
+                    file.truncate(offset)
+                    raise
+
+            if created and fsync:
+                _fsync_directory(self.directory)
+
+            self._sizes[seq] = offset + len(record)
+            info = RecordInfo(
+                seq, offset, len(record), header["count"], header["min_ts"]
+            )
+            self._records.append(info)
+            return info
+
+    def read_record(self, info: RecordInfo) -> Iterator[dict[str, Any]]:
+        """
+        Eventos de um registro, decodificados sob demanda.
+
+        KeyError se o registro não está mais pendente (ex.: segmento
+        reescrito pela retenção); ValueError se estiver corrompido.
+        """
+        with self._io_lock:
+            if info not in self._records:
+                raise KeyError(info.position)
+
+            with open(self._path(info.seq), "rb") as file:
+                file.seek(info.offset)
+                data = file.read(info.size)
+
+        records, _end = _scan_segment(data)
+        if not records:
+            raise ValueError(f"Registro corrompido: {info.position}")
+
+        return decode_block(records[0][2])
+
+    def ack(self, info: RecordInfo) -> None:
+        """
+        Confirma um registro (ex.: após envio aceito pela API).
+
+        Avança o cursor e apaga os segmentos que não têm mais registros
+        pendentes.
+        """
+        with self._io_lock:
+            try:
+                self._records.remove(info)
+            except ValueError:
+                return
+
+            self._remove_if_acked(info.seq)
+
+            self._update_cursor()
+
+    # =========================================================
+    # RETENÇÃO
+    # =========================================================
+
+    def discard_history(self) -> None:
+        """Sem histórico local neste backend: eventos enviados são apagados."""
+
+    def sealed_segments(self) -> list[int]:
+        """
+        Fecha o segmento ativo e lista os segmentos com registros
+        pendentes, do mais antigo ao mais novo.
+
+        A próxima escrita inicia um novo segmento, então os listados
+        podem ser reescritos pela retenção.
+        """
+        with self._io_lock:
+            seqs = sorted({info.seq for info in self._records})
+
+            if seqs and seqs[-1] == self._active_seq:
+                self._active_seq += 1
+
+            return seqs
+
+    def read_segment(self, seq: int) -> list[dict[str, Any]]:
+        """Todos os eventos pendentes de um segmento."""
+        events: list[dict[str, Any]] = []
+
+        for info in [r for r in self.records if r.seq == seq]:
+            try:
+                events.extend(self.read_record(info))
+            except (KeyError, ValueError) as err:
+                _LOGGER.warning("Registro ignorado na retenção: %s", err)
+
+        return events
+
+    def rewrite_segment(
+        self, seq: int, events: list[dict[str, Any]]
+    ) -> None:
+        """
+        Substitui um segmento fechado por um único registro.
+
+        Usado pela retenção para gravar a versão compactada. Se um envio
+        do segmento estiver em andamento, seus eventos podem ser
+        reenviados (entrega pelo menos uma vez).
+        """
+        if not events:
+            self.drop_segment(seq)
+            return
+
+        payload = encode_block(events)
+        header, _offset = read_block_header(payload)
+        record = _frame(payload)
+        path = self._path(seq)
+        tmp_path = f"{path}.tmp"
+
+        with self._io_lock:
+            with open(tmp_path, "wb") as file:
+                file.write(record)
+                file.flush()
+                os.fsync(file.fileno())
+
+            pending = [info for info in self._records if info.seq != seq]
+            pending.append(
+                RecordInfo(seq, 0, len(record), header["count"], header["min_ts"])
+            )
+            pending.sort(key=lambda info: info.position)
+            self._records = deque(pending)
+
+            # Cursor antes do arquivo: uma queda aqui só causa reenvio
+            self._update_cursor()
+            os.replace(tmp_path, path)
+            self._sizes[seq] = len(record)
+
+    def drop_segment(self, seq: int) -> None:
+        """Descarta um segmento inteiro, pendente ou não."""
+        with self._io_lock:
+            self._records = deque(
+                info for info in self._records if info.seq != seq
+            )
+            self._remove_if_acked(seq)
+            self._update_cursor()
+
+    def close(self) -> None:
+        """Nada a fechar: cada operação abre e fecha seus arquivos."""
+
+    # =========================================================
+    # INTERNOS
+    # =========================================================
+
+    def _path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{seq:012d}{SEGMENT_SUFFIX}")
+
+    def _remove_if_acked(self, seq: int) -> None:
+        """Apaga o segmento se nenhum registro dele estiver pendente."""
+        if any(info.seq == seq for info in self._records):
+            return
+
+        if seq == self._active_seq:
+            # Segmento ativo vazio: o próximo registro inicia outro
+            self._active_seq += 1
+
+        self._sizes.pop(seq, None)
+
+        try:
+            os.remove(self._path(seq))
+        except FileNotFoundError:
+            pass
+
+    def _update_cursor(self) -> None:
+        if self._records:
+            self._write_cursor(self._records[0].position)
+        else:
+            # Nada pendente: o cursor aponta para a próxima escrita
+            self._write_cursor(
+                (self._active_seq, self._sizes.get(self._active_seq, 0))
+            )
+
+    def _read_cursor(self) -> tuple[int, int]:
+        try:
+            with open(
+                os.path.join(self.directory, CURSOR_FILE), encoding="utf-8"
+            ) as file:
+                data = json.load(file)
+            return int(data["seq"]), int(data["offset"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0, 0
+
+    def _write_cursor(self, position: tuple[int, int]) -> None:
+        path = os.path.join(self.directory, CURSOR_FILE)
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"seq": position[0], "offset": position[1]}, file)
+        os.replace(tmp_path, path)
+
+    # =========================================================
+    # INFO
+    # =========================================================
+
+    @property
+    def records(self) -> list[RecordInfo]:
+        """Registros pendentes, do mais antigo para o mais novo."""
+        return list(self._records)
+
+    @property
+    def event_count(self) -> int:
+        return sum(info.count for info in self._records)
+
+    @property
+    def oldest_timestamp(self) -> int | None:
+        """Timestamp (ms) do evento pendente mais antigo."""
+        return min(
+            (info.min_ts for info in self._records if info.min_ts is not None),
+            default=None,
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+
+def migrate_pending(source: Any, target: Any) -> int:
+    """
+    Move os eventos pendentes de um backlog para outro (ex.: troca de
+    backend). Cada registro só é confirmado na origem após ser gravado
+    no destino. Retorna o número de eventos movidos.
+    """
+    moved = 0
+
+    for info in source.records:
+        events = list(source.read_record(info))
+        target.append(events)
+        source.ack(info)
+        moved += len(events)
+
+    return moved
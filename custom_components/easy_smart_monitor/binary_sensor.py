@@ -5,10 +5,13 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
 )
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, MANUFACTURER, MODEL_VIRTUAL
+from .const import DOMAIN, SENSOR_TYPE_DOOR
 from .coordinator import EasySmartMonitorCoordinator
+from .entity import (
+    EasySmartMonitorSourceEntity,
+    async_setup_equipment_entities,
+)
 
 
 # ============================================================
@@ -20,26 +23,16 @@ async def async_setup_entry(hass, entry, async_add_entities):
         entry.entry_id
     ]
 
-    entities: list[BinarySensorEntity] = []
-
-    for equipment_id, equipment in (
-        coordinator.storage.get_equipments().items()
-    ):
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, equipment_id)},
-            name=equipment["name"],
-            manufacturer=MANUFACTURER,
-            model=MODEL_VIRTUAL,
-            suggested_area=equipment.get("location"),
-        )
-
-        entities.append(
+    def _equipment_entities(equipment_id, equipment, device_info):
+        return [
             EasySmartMonitorDoorBinarySensor(
                 coordinator, equipment_id, device_info
             )
-        )
+        ]
 
-    async_add_entities(entities)
+    async_setup_equipment_entities(
+        coordinator, entry, async_add_entities, _equipment_entities
+    )
 
 
 # ============================================================
@@ -47,11 +40,10 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # ============================================================
 
 class EasySmartMonitorDoorBinarySensor(
-    CoordinatorEntity, BinarySensorEntity
+    EasySmartMonitorSourceEntity, BinarySensorEntity
 ):
     """Estado da porta do equipamento."""
 
-    _attr_has_entity_name = True
     _attr_device_class = BinarySensorDeviceClass.DOOR
 
     def __init__(
@@ -60,22 +52,12 @@ class EasySmartMonitorDoorBinarySensor(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
-        self.equipment_id = equipment_id
+        super().__init__(
+            coordinator, equipment_id, device_info, SENSOR_TYPE_DOOR
+        )
         self._attr_name = "Porta"
         self._attr_unique_id = f"{equipment_id}_door"
-        self._attr_device_info = device_info
 
     @property
     def is_on(self) -> bool | None:
-        source = self.coordinator.storage.get_sensor_source(
-            self.equipment_id, "door"
-        )
-        if not source:
-            return None
-
-        state = self.coordinator.hass.states.get(source)
-        if not state:
-            return None
-
-        return state.state == "on"
\ No newline at end of file
+        return self.source_value
\ No newline at end of file
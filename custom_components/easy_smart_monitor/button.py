@@ -1,28 +1,14 @@
 from __future__ import annotations
 
 from homeassistant.components.button import ButtonEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import (
-    DOMAIN,
-    MANUFACTURER,
-    MODEL_VIRTUAL,
-)
+from .const import DOMAIN
 from .coordinator import EasySmartMonitorCoordinator
-
-
-# ============================================================
-# HELPERS
-# ============================================================
-
-def _get_equipments(entry) -> list[dict]:
-    """Retorna equipamentos de options ou data."""
-    return (
-        entry.options.get("equipments")
-        or entry.data.get("equipments")
-        or []
-    )
+from .entity import (
+    EasySmartMonitorEquipmentEntity,
+    async_setup_equipment_entities,
+)
 
 
 # ============================================================
@@ -35,24 +21,16 @@ async def async_setup_entry(hass, entry, async_add_entities):
         entry.entry_id
     ]
 
-    entities: list[ButtonEntity] = []
-
-    for equipment in _get_equipments(entry):
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, equipment["uuid"])},
-            name=equipment["name"],
-            manufacturer=MANUFACTURER,
-            model=MODEL_VIRTUAL,
-            suggested_area=equipment.get("location"),
-        )
-
-        entities.append(
+    def _equipment_entities(equipment_id, equipment, device_info):
+        return [
             EasySmartMonitorSilenceAlarmButton(
-                coordinator, equipment, device_info
+                coordinator, equipment_id, equipment["uuid"], device_info
             )
-        )
+        ]
 
-    async_add_entities(entities)
+    async_setup_equipment_entities(
+        coordinator, entry, async_add_entities, _equipment_entities
+    )
 
 
 # ============================================================
@@ -60,28 +38,22 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # ============================================================
 
 class EasySmartMonitorSilenceAlarmButton(
-    CoordinatorEntity, ButtonEntity
+    EasySmartMonitorEquipmentEntity, ButtonEntity
 ):
     """Botão para silenciar o alarme do equipamento."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:bell-off"
 
     def __init__(
         self,
         coordinator: EasySmartMonitorCoordinator,
-        equipment: dict,
+        equipment_id: str,
+        equipment_uuid: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
-        self.equipment = equipment
+        super().__init__(coordinator, equipment_id, device_info)
         self._attr_name = "Silenciar Alarme"
-        self._attr_unique_id = (
-            f"{equipment['uuid']}_silence_alarm"
-        )
-        self._attr_device_info = device_info
+        self._attr_unique_id = f"{equipment_uuid}_silence_alarm"
 
     async def async_press(self):
-        await self.coordinator.async_silence_siren(
-            self.equipment["id"]
-        )
\ No newline at end of file
+        await self.coordinator.async_silence_siren(self.equipment_id)
@@ -7,7 +7,8 @@ from typing import Any
 import aiohttp
 from aiohttp import ClientTimeout, ClientResponseError
 
-from .const import TEST_MODE
+from .const import CONTENT_TYPE_JSON, TEST_MODE
+from .encoders import EventEncoder, JsonEventEncoder, negotiate_encoder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ class EasySmartMonitorApiClient:
 
     Responsabilidades:
     - Autenticação (login / refresh)
-    - Envio de eventos
+    - Envio de eventos (JSON ou binário negociado)
     - Consulta de status
     - Respeitar TEST_MODE
     """
@@ -41,6 +42,9 @@ class EasySmartMonitorApiClient:
         self._access_token: str | None = None
         self._token_expires_at: float | None = None
 
+        self._encoder: EventEncoder = JsonEventEncoder()
+        self._encoding_negotiated = False
+
         self._lock = asyncio.Lock()
 
     # =========================================================
@@ -101,33 +105,36 @@ class EasySmartMonitorApiClient:
                 headers=headers,
                 timeout=self._timeout,
             ) as resp:
-                if resp.status == 401:
-                    _LOGGER.warning(
-                        "Token inválido, realizando novo login"
-                    )
-                    await self.async_login()
-                    return
+                relogin = resp.status == 401
 
-                resp.raise_for_status()
-                data = await resp.json()
+                if not relogin:
+                    resp.raise_for_status()
+                    data = await resp.json()
 
-                self._access_token = data["access_token"]
-                self._token_expires_at = data.get("expires_at")
+                    self._access_token = data["access_token"]
+                    self._token_expires_at = data.get("expires_at")
 
-                _LOGGER.info("Token renovado com sucesso")
+                    _LOGGER.info("Token renovado com sucesso")
+
+        # Login fora do lock: asyncio.Lock não é reentrante
+        if relogin:
+            _LOGGER.warning("Token inválido, realizando novo login")
+            await self.async_login()
 
     # =========================================================
     # REQUEST CORE
     # =========================================================
 
-    async def _get_auth_headers(self) -> dict[str, str]:
+    async def _get_auth_headers(
+        self, content_type: str = CONTENT_TYPE_JSON
+    ) -> dict[str, str]:
         """Garante token válido e retorna headers."""
         if not self._access_token:
             await self.async_login()
 
         return {
             "Authorization": f"Bearer {self._access_token}",
-            "Content-Type": "application/json",
+            "Content-Type": content_type,
         }
 
     async def _request(
@@ -136,10 +143,14 @@ class EasySmartMonitorApiClient:
         endpoint: str,
         *,
         json_data: Any | None = None,
+        data: bytes | None = None,
+        content_type: str = CONTENT_TYPE_JSON,
     ) -> Any:
         """
         Executa uma requisição autenticada.
         Trata 401 com refresh automático.
+
+        `data` envia um corpo já serializado com o `content_type` informado.
         """
         if TEST_MODE:
             _LOGGER.debug(
@@ -150,13 +161,14 @@ class EasySmartMonitorApiClient:
             return {}
 
         url = f"{self._base_url}{endpoint}"
-        headers = await self._get_auth_headers()
+        headers = await self._get_auth_headers(content_type)
 
         try:
             async with self._session.request(
                 method,
                 url,
                 json=json_data,
+                data=data,
                 headers=headers,
                 timeout=self._timeout,
             ) as resp:
@@ -165,12 +177,13 @@ class EasySmartMonitorApiClient:
                         "401 recebido, tentando renovar token"
                     )
                     await self.async_refresh_token()
-                    headers = await self._get_auth_headers()
+                    headers = await self._get_auth_headers(content_type)
 
                     async with self._session.request(
                         method,
                         url,
                         json=json_data,
+                        data=data,
                         headers=headers,
                         timeout=self._timeout,
                     ) as retry_resp:
@@ -197,6 +210,34 @@ class EasySmartMonitorApiClient:
     # PUBLIC API
     # =========================================================
 
+    async def async_negotiate_encoding(self) -> EventEncoder:
+        """
+        Negocia o formato do payload de eventos com o servidor.
+
+        O servidor anuncia os formatos aceitos em `content_types` no
+        `/status`. Em caso de falha, mantém JSON.
+        """
+        if TEST_MODE:
+            self._encoding_negotiated = True
+            return self._encoder
+
+        try:
+            status = await self._request("GET", "/status")
+        except (ClientResponseError, asyncio.TimeoutError, aiohttp.ClientError):
+            _LOGGER.debug("Negociação de formato falhou, usando JSON")
+            status = {}
+
+        accepted = (
+            status.get("content_types") if isinstance(status, dict) else None
+        )
+        self._encoder = negotiate_encoder(accepted)
+        self._encoding_negotiated = True
+
+        _LOGGER.debug(
+            "Formato de envio negociado: %s", self._encoder.content_type
+        )
+        return self._encoder
+
     async def send_events(self, events: list[dict[str, Any]]) -> None:
         """
         Envia eventos para a API.
@@ -212,13 +253,34 @@ class EasySmartMonitorApiClient:
             )
             return
 
-        payload = {"events": events}
+        if not self._encoding_negotiated:
+            await self.async_negotiate_encoding()
 
-        await self._request(
-            method="POST",
-            endpoint="/events",
-            json_data=payload,
-        )
+        try:
+            await self._request(
+                method="POST",
+                endpoint="/events",
+                data=self._encoder.encode(events),
+                content_type=self._encoder.content_type,
+            )
+        except ClientResponseError as err:
+            # 415: servidor deixou de aceitar o formato negociado
+            if err.status != 415 or isinstance(
+                self._encoder, JsonEventEncoder
+            ):
+                raise
+
+            _LOGGER.warning(
+                "Formato %s recusado pela API, voltando para JSON",
+                self._encoder.content_type,
+            )
+            self._encoder = JsonEventEncoder()
+            await self._request(
+                method="POST",
+                endpoint="/events",
+                data=self._encoder.encode(events),
+                content_type=self._encoder.content_type,
+            )
 
         _LOGGER.info(
             "Envio de %s eventos realizado com sucesso",
@@ -242,6 +304,11 @@ class EasySmartMonitorApiClient:
     # INFO / DEBUG
     # =========================================================
 
+    @property
+    def content_type(self) -> str:
+        """Content type usado no envio de eventos."""
+        return self._encoder.content_type
+
     @property
     def token_expires_at(self) -> float | None:
         """Retorna timestamp de expiração do token."""
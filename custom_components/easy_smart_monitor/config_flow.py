@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-import uuid
 from typing import Any
 
 import voluptuous as vol
@@ -9,17 +8,26 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers import aiohttp_client, selector
-from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 
 from .const import (
     DOMAIN,
     CONF_API_HOST,
     CONF_USERNAME,
     CONF_PASSWORD,
+    BACKLOG_BACKEND_SEGMENTS,
+    BACKLOG_BACKEND_SQLITE,
+    DEFAULT_DISK_BUDGET_MB,
     DEFAULT_DOOR_OPEN_SECONDS,
+    DEFAULT_DURABILITY_WINDOW,
+    DEFAULT_SEND_INTERVAL,
+    DEFAULT_SHUTDOWN_DEADLINE,
+    ENTITY_UPDATE_MODE_MIRROR,
+    ENTITY_UPDATE_MODE_SNAPSHOT,
     TEST_MODE,
 )
 from .client import EasySmartMonitorApiClient
+from .entity_index import async_get_entity_index
+from .storage import EasySmartMonitorStorage
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,8 +67,7 @@ class EasySmartMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_PASSWORD: password,
                     },
                     options={
-                        "equipments": [],
-                        "send_interval": 60,
+                        "send_interval": DEFAULT_SEND_INTERVAL,
                         "paused": False,
                     },
                 )
@@ -89,8 +96,7 @@ class EasySmartMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_PASSWORD: password,
                     },
                     options={
-                        "equipments": [],
-                        "send_interval": 60,
+                        "send_interval": DEFAULT_SEND_INTERVAL,
                         "paused": False,
                     },
                 )
@@ -129,11 +135,21 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
 
         # Estrutura garantida
         self.options = dict(entry.options)
-        self.options.setdefault("equipments", [])
-        self.options.setdefault("send_interval", 60)
+        self.options.setdefault("send_interval", DEFAULT_SEND_INTERVAL)
         self.options.setdefault("paused", False)
+        self.options.setdefault(
+            "durability_window", DEFAULT_DURABILITY_WINDOW
+        )
+        self.options.setdefault("disk_budget_mb", DEFAULT_DISK_BUDGET_MB)
+        self.options.setdefault("backlog_backend", BACKLOG_BACKEND_SEGMENTS)
+        self.options.setdefault(
+            "shutdown_deadline", DEFAULT_SHUTDOWN_DEADLINE
+        )
+        self.options.setdefault(
+            "entity_update_mode", ENTITY_UPDATE_MODE_SNAPSHOT
+        )
 
-        self._selected_equipment_id: int | None = None
+        self._selected_equipment_id: str | None = None
 
     # =========================================================
     # MENU PRINCIPAL
@@ -157,6 +173,17 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             self.options["send_interval"] = user_input["send_interval"]
             self.options["paused"] = user_input["paused"]
+            self.options["durability_window"] = user_input[
+                "durability_window"
+            ]
+            self.options["disk_budget_mb"] = user_input["disk_budget_mb"]
+            self.options["backlog_backend"] = user_input["backlog_backend"]
+            self.options["shutdown_deadline"] = user_input[
+                "shutdown_deadline"
+            ]
+            self.options["entity_update_mode"] = user_input[
+                "entity_update_mode"
+            ]
             return self.async_create_entry(title="", data=self.options)
 
         return self.async_show_form(
@@ -171,6 +198,33 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
                         "paused",
                         default=self.options["paused"],
                     ): bool,
+                    vol.Required(
+                        "durability_window",
+                        default=self.options["durability_window"],
+                    ): vol.All(int, vol.Range(min=1, max=3600)),
+                    vol.Required(
+                        "disk_budget_mb",
+                        default=self.options["disk_budget_mb"],
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        "backlog_backend",
+                        default=self.options["backlog_backend"],
+                    ): vol.In(
+                        [BACKLOG_BACKEND_SEGMENTS, BACKLOG_BACKEND_SQLITE]
+                    ),
+                    vol.Required(
+                        "shutdown_deadline",
+                        default=self.options["shutdown_deadline"],
+                    ): vol.All(int, vol.Range(min=0, max=60)),
+                    vol.Required(
+                        "entity_update_mode",
+                        default=self.options["entity_update_mode"],
+                    ): vol.In(
+                        [
+                            ENTITY_UPDATE_MODE_SNAPSHOT,
+                            ENTITY_UPDATE_MODE_MIRROR,
+                        ]
+                    ),
                 }
             ),
         )
@@ -185,11 +239,28 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
             menu_options=[
                 "add_equipment",
                 "select_equipment",
+                "remove_equipment",
             ],
         )
 
+    def _storage(self) -> EasySmartMonitorStorage | None:
+        """Registro de equipamentos da entry (None se não carregada)."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(
+            self.entry.entry_id
+        )
+        return coordinator.storage if coordinator else None
+
+    def _equipment_changed(self, **changes: list[str]) -> None:
+        """Aplica a alteração ao vivo (entidades só do equipamento)."""
+        self.hass.data[DOMAIN][
+            self.entry.entry_id
+        ].async_apply_equipment_changes(**changes)
+
     async def async_step_select_equipment(self, user_input=None):
-        if not self.options["equipments"]:
+        storage = self._storage()
+        if storage is None:
+            return self.async_abort(reason="not_loaded")
+        if not storage.get_equipments():
             return await self.async_step_add_equipment()
 
         if user_input is not None:
@@ -197,8 +268,8 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
             return await self.async_step_edit_equipment()
 
         equipment_map = {
-            f"{e['name']} ({e['location']})": e["id"]
-            for e in self.options["equipments"]
+            equipment_id: f"{e['name']} ({e['location']})"
+            for equipment_id, e in storage.get_equipments().items()
         }
 
         return self.async_show_form(
@@ -211,27 +282,22 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
         )
 
     async def async_step_add_equipment(self, user_input=None):
+        storage = self._storage()
+        if storage is None:
+            return self.async_abort(reason="not_loaded")
+
         if user_input is not None:
-            equipment_id = (
-                max([e["id"] for e in self.options["equipments"]], default=0)
-                + 1
-            )
+            equipment_id = storage.next_equipment_id()
 
-            self.options["equipments"].append(
-                {
-                    "id": equipment_id,
-                    "uuid": uuid.uuid4().hex,
-                    "name": user_input["name"],
-                    "location": user_input["location"],
-                    "collect_interval": user_input["collect_interval"],
-                    "enabled": True,
-                    "door": {
-                        "enable_siren": True,
-                        "open_timeout": DEFAULT_DOOR_OPEN_SECONDS,
-                    },
-                    "sensors": [],
-                }
+            await storage.add_equipment(
+                equipment_id=equipment_id,
+                name=user_input["name"],
+                location=user_input["location"],
             )
+            await storage.set_collect_interval(
+                equipment_id, user_input["collect_interval"]
+            )
+            self._equipment_changed(added=[equipment_id])
 
             return self.async_create_entry(title="", data=self.options)
 
@@ -249,26 +315,37 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
         )
 
     async def async_step_edit_equipment(self, user_input=None):
-        equipment = next(
-            e for e in self.options["equipments"]
-            if e["id"] == self._selected_equipment_id
+        storage = self._storage()
+        equipment = (
+            storage.get_equipment(self._selected_equipment_id)
+            if storage is not None
+            else None
         )
+        if equipment is None:
+            return self.async_abort(reason="not_loaded")
 
+        equipment_id = equipment["id"]
         door_cfg = equipment.get("door", {})
 
         if user_input is not None:
-            equipment.update(
-                {
-                    "name": user_input["name"],
-                    "location": user_input["location"],
-                    "collect_interval": user_input["collect_interval"],
-                    "enabled": user_input["enabled"],
-                    "door": {
-                        "enable_siren": user_input["enable_siren"],
-                        "open_timeout": user_input["open_timeout"],
-                    },
-                }
+            await storage.set_equipment_info(
+                equipment_id,
+                name=user_input["name"],
+                location=user_input["location"],
+            )
+            await storage.set_collect_interval(
+                equipment_id, user_input["collect_interval"]
+            )
+            await storage.set_equipment_enabled(
+                equipment_id, user_input["enabled"]
             )
+            await storage.set_door_config(
+                equipment_id,
+                enable_siren=user_input["enable_siren"],
+                open_timeout=user_input["open_timeout"],
+            )
+            self._equipment_changed(updated=[equipment_id])
+
             return self.async_create_entry(title="", data=self.options)
 
         return self.async_show_form(
@@ -301,6 +378,34 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
             ),
         )
 
+    async def async_step_remove_equipment(self, user_input=None):
+        storage = self._storage()
+        if storage is None:
+            return self.async_abort(reason="not_loaded")
+        if not storage.get_equipments():
+            return await self.async_step_add_equipment()
+
+        if user_input is not None:
+            equipment_id = user_input["equipment_id"]
+            await storage.remove_equipment(equipment_id)
+            self._equipment_changed(removed=[equipment_id])
+
+            return self.async_create_entry(title="", data=self.options)
+
+        equipment_map = {
+            equipment_id: f"{e['name']} ({e['location']})"
+            for equipment_id, e in storage.get_equipments().items()
+        }
+
+        return self.async_show_form(
+            step_id="remove_equipment",
+            data_schema=vol.Schema(
+                {
+                    vol.Required("equipment_id"): vol.In(equipment_map),
+                }
+            ),
+        )
+
     # =========================================================
     # MENU 3 — CONFIGURAÇÃO DE SENSORES
     # =========================================================
@@ -317,35 +422,33 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
         if self._selected_equipment_id is None:
             return await self.async_step_select_equipment()
 
-        equipment = next(
-            e for e in self.options["equipments"]
-            if e["id"] == self._selected_equipment_id
-        )
+        storage = self._storage()
+        if storage is None:
+            return self.async_abort(reason="not_loaded")
+
+        index = async_get_entity_index(self.hass)
+        errors: dict[str, str] = {}
 
         if user_input is not None:
-            sensor_id = (
-                max([s["id"] for s in equipment["sensors"]], default=0)
-                + 1
-            )
+            # A lista abaixo mistura todos os tipos: confere o escolhido
+            if index.accepts(
+                user_input["sensor_type"], user_input["entity_id"]
+            ):
+                await storage.set_sensor_source(
+                    self._selected_equipment_id,
+                    user_input["sensor_type"],
+                    user_input["entity_id"],
+                )
+                self._equipment_changed(
+                    updated=[self._selected_equipment_id]
+                )
 
-            equipment["sensors"].append(
-                {
-                    "id": sensor_id,
-                    "uuid": uuid.uuid4().hex,
-                    "entity_id": user_input["entity_id"],
-                    "type": user_input["sensor_type"],
-                    "enabled": True,
-                }
-            )
+                return self.async_create_entry(title="", data=self.options)
 
-            return self.async_create_entry(title="", data=self.options)
+            errors["entity_id"] = "incompatible_entity"
 
-        entity_reg = async_get_entity_registry(self.hass)
-        entities = [
-            e.entity_id
-            for e in entity_reg.entities.values()
-            if not e.disabled
-        ]
+        # Só entidades compatíveis com algum tipo de sensor
+        entities = index.entity_ids()
 
         return self.async_show_form(
             step_id="add_sensor",
@@ -370,4 +473,5 @@ class EasySmartMonitorOptionsFlow(config_entries.OptionsFlow):
                     ),
                 }
             ),
+            errors=errors,
         )
\ No newline at end of file
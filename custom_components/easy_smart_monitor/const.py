@@ -34,6 +34,14 @@ CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 
 
+# ============================================================
+# API — FORMATOS DE PAYLOAD
+# ============================================================
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+
+
 # ============================================================
 # TEST MODE
 # ============================================================
@@ -60,9 +68,139 @@ TEST_MODE = True
 # Intervalo padrão de envio para API (segundos)
 DEFAULT_SEND_INTERVAL = 60
 
+# Prazo para o envio final ao descarregar / encerrar o HA (segundos)
+DEFAULT_SHUTDOWN_DEADLINE = 10
+
 # Tempo padrão de porta aberta para disparar sirene (segundos)
 DEFAULT_DOOR_OPEN_SECONDS = 120
 
+# Banda morta padrão por sensor (0 = descarta apenas valores repetidos)
+DEFAULT_DEADBAND = 0.0
+
+# Intervalo máximo sem envio de um sensor (heartbeat, segundos)
+DEFAULT_HEARTBEAT_SECONDS = 900
+
+# Limites aceitos (segundos): intervalo de coleta e tempo de porta aberta
+COLLECT_INTERVAL_RANGE = (10, 3600)
+DOOR_OPEN_TIMEOUT_RANGE = (10, 900)
+
+# Limites aceitos (segundos): heartbeat do filtro por sensor
+HEARTBEAT_RANGE = (10, 86400)
+
+
+# ============================================================
+# STORAGE — GRAVAÇÃO AGRUPADA
+# ============================================================
+
+# Alterações de configuração são gravadas juntas após este atraso...
+STORAGE_SAVE_DELAY = 1
+
+# ...mas nunca mais que isto depois da primeira alteração pendente
+STORAGE_SAVE_MAX_DELAY = 10
+
+
+# ============================================================
+# FILTRO POR MUDANÇA DE VALOR (DEADBAND)
+# ============================================================
+
+DEADBAND_MODE_ABSOLUTE = "absolute"
+DEADBAND_MODE_PERCENT = "percent"
+
+
+# ============================================================
+# MODO DE ENVIO DE TELEMETRIA
+# ============================================================
+
+# raw: cada leitura vira um evento
+# aggregate: um evento (min/max/média/contagem) por janela
+TELEMETRY_MODE_RAW = "raw"
+TELEMETRY_MODE_AGGREGATE = "aggregate"
+
+# Janela padrão de agregação (segundos)
+DEFAULT_AGGREGATE_WINDOW = 300
+
+# Limites aceitos para a janela de agregação (segundos)
+AGGREGATE_WINDOW_RANGE = (60, 86400)
+
+
+# ============================================================
+# FILA — COMPACTAÇÃO DURANTE QUEDAS DA API
+# ============================================================
+
+# Acima deste tamanho, telemetria antiga é compactada em agregados
+DEFAULT_QUEUE_WATERMARK = 10_000
+
+# Eventos processados por etapa de compactação
+COMPACTION_CHUNK_SIZE = 2_000
+
+# Janelas usadas na compactação, da mais fina para a mais grossa
+# (cada uma é múltipla da anterior, para que agregados se combinem)
+COMPACTION_WINDOWS = (300, 900, 3600, 21600, 86400)
+
+
+# ============================================================
+# BACKLOG EM DISCO — GROUP COMMIT
+# ============================================================
+
+# Janela de durabilidade padrão (segundos): eventos coletados ficam no
+# máximo este tempo só em memória antes de um fsync
+DEFAULT_DURABILITY_WINDOW = 30
+
+# Volume estimado (bytes) que força um commit antes da janela acabar
+DEFAULT_COMMIT_BYTES = 256 * 1024
+
+# Tamanho a partir do qual um novo segmento é iniciado
+SEGMENT_MAX_BYTES = 1024 * 1024
+
+
+# ============================================================
+# BACKLOG EM DISCO — RETENÇÃO
+# ============================================================
+
+# Orçamento de disco padrão do backlog, por config entry (MiB)
+DEFAULT_DISK_BUDGET_MB = 50
+
+# Janela dos agregados gerados ao compactar segmentos antigos (segundos)
+RETENTION_COMPACTION_WINDOW = 3600
+
+
+# ============================================================
+# BACKLOG EM DISCO — BACKEND
+# ============================================================
+
+# segments: arquivos comprimidos (padrão)
+# sqlite: banco SQLite em modo WAL, com histórico local consultável
+BACKLOG_BACKEND_SEGMENTS = "segments"
+BACKLOG_BACKEND_SQLITE = "sqlite"
+
+# Dias de eventos já enviados mantidos no SQLite para consultas locais
+DEFAULT_LOCAL_HISTORY_DAYS = 7
+
+# Eventos por grupo ao reindexar pendentes do SQLite
+SQLITE_BATCH_ROWS = 2_000
+
+
+# ============================================================
+# ENTIDADES — MODO DE ATUALIZAÇÃO
+# ============================================================
+
+# snapshot: sensores leem o snapshot publicado pelo coordinator (padrão)
+# mirror: cada sensor escuta a própria entidade de origem no HA
+ENTITY_UPDATE_MODE_SNAPSHOT = "snapshot"
+ENTITY_UPDATE_MODE_MIRROR = "mirror"
+
+# Opção "sem fonte" nos selects de origem dos sensores
+SOURCE_OPTION_NONE = "Nenhum"
+
+
+# ============================================================
+# OPTIONS — APLICAÇÃO AO VIVO
+# ============================================================
+
+# Options que só valem recarregando a entry (classe das entidades /
+# backend do backlog); as demais são aplicadas sem recriar nada
+RELOAD_OPTIONS = ("backlog_backend", "entity_update_mode")
+
 
 # ============================================================
 # STATUS DA INTEGRAÇÃO
@@ -92,6 +230,26 @@ SENSOR_TYPE_HUMIDITY = "humidity"
 SENSOR_TYPE_ENERGY = "energy"
 SENSOR_TYPE_DOOR = "door"
 
+# Tipos numéricos (telemetria que pode ser agregada)
+TELEMETRY_SENSOR_TYPES = (
+    SENSOR_TYPE_TEMPERATURE,
+    SENSOR_TYPE_HUMIDITY,
+    SENSOR_TYPE_ENERGY,
+)
+
+# Entidades oferecidas como origem de cada tipo de sensor:
+# (domínio, device_classes aceitas, unidades aceitas sem device_class)
+SOURCE_ENTITY_FILTERS = {
+    SENSOR_TYPE_TEMPERATURE: ("sensor", ("temperature",), ("°C", "°F", "K")),
+    SENSOR_TYPE_HUMIDITY: ("sensor", ("humidity",), ("%",)),
+    SENSOR_TYPE_ENERGY: ("sensor", ("energy",), ("Wh", "kWh", "MWh")),
+    SENSOR_TYPE_DOOR: (
+        "binary_sensor",
+        ("door", "opening", "garage_door"),
+        (),
+    ),
+}
+
 
 # ============================================================
 # ATRIBUTOS PADRÃO
@@ -104,6 +262,9 @@ ATTR_VALUE = "value"
 ATTR_MIN = "min"
 ATTR_MAX = "max"
 
+# Select de origem: a entidade associada não é compatível com o tipo
+ATTR_INCOMPATIBLE_SOURCE = "incompatible_source"
+
 
 # ============================================================
 # PLATFORMS (Home Assistant)
@@ -117,4 +278,24 @@ PLATFORMS = [
     "switch",
     "number",
     "select",
-]
\ No newline at end of file
+]
+
+# ============================================================
+# SINAIS (DISPATCHER)
+# ============================================================
+
+# Atualização de um único equipamento: {entry_id}, {equipment_id}
+SIGNAL_EQUIPMENT_UPDATED = f"{DOMAIN}_equipment_updated_{{}}_{{}}"
+
+# Equipamentos novos de uma config entry: {entry_id}
+# (payload: lista de equipment_id)
+SIGNAL_EQUIPMENTS_ADDED = f"{DOMAIN}_equipments_added_{{}}"
+
+# Backlog em disco alterado (commit, retenção, envio): {entry_id}
+SIGNAL_BACKLOG_UPDATED = f"{DOMAIN}_backlog_updated_{{}}"
+
+# Integração pausada / retomada: {entry_id}
+SIGNAL_PAUSE_CHANGED = f"{DOMAIN}_pause_changed_{{}}"
+
+# Opções de origem de um tipo de sensor mudaram: {sensor_type}
+SIGNAL_ENTITY_OPTIONS_UPDATED = f"{DOMAIN}_entity_options_updated_{{}}"
@@ -2,33 +2,101 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+from collections.abc import Iterable, Mapping
 from datetime import datetime, timedelta
+from functools import partial
+from types import MappingProxyType
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, TEST_MODE
+from .const import (
+    BACKLOG_BACKEND_SEGMENTS,
+    BACKLOG_BACKEND_SQLITE,
+    DEFAULT_DISK_BUDGET_MB,
+    DEFAULT_DURABILITY_WINDOW,
+    DEFAULT_SEND_INTERVAL,
+    DEFAULT_SHUTDOWN_DEADLINE,
+    DOMAIN,
+    ENTITY_UPDATE_MODE_MIRROR,
+    ENTITY_UPDATE_MODE_SNAPSHOT,
+    RELOAD_OPTIONS,
+    SIGNAL_EQUIPMENT_UPDATED,
+    SIGNAL_BACKLOG_UPDATED,
+    SIGNAL_EQUIPMENTS_ADDED,
+    SIGNAL_PAUSE_CHANGED,
+    TELEMETRY_MODE_AGGREGATE,
+    TELEMETRY_SENSOR_TYPES,
+    TEST_MODE,
+)
+from .aggregation import BacklogCompactor, WindowAggregator, is_compactable
+from .backlog import RecordInfo, SegmentBacklog, migrate_pending
 from .client import EasySmartMonitorApiClient
+from .devices import async_sync_equipment_devices
+from .filters import (
+    ChangeOfValueFilter,
+    SourceFreshnessTracker,
+    sample_timestamp,
+)
+from .group_commit import GroupCommitWriter
+from .retention import RetentionManager
+from .scheduler import CollectionScheduler
+from .snapshot import (
+    ALARM_REASON_DOOR,
+    ALARM_REASON_MANUAL,
+    EquipmentSnapshot,
+    door_reading,
+    freeze,
+    numeric_reading,
+)
+from .sqlite_backlog import DATABASE_FILE, RowRange, SqliteBacklog
 from .storage import EasySmartMonitorStorage
 
 _LOGGER = logging.getLogger(__name__)
 
+# Padrão de cada option (comparação das options antes / depois)
+_OPTION_DEFAULTS: dict[str, Any] = {
+    "send_interval": DEFAULT_SEND_INTERVAL,
+    "paused": False,
+    "durability_window": DEFAULT_DURABILITY_WINDOW,
+    "disk_budget_mb": DEFAULT_DISK_BUDGET_MB,
+    "backlog_backend": BACKLOG_BACKEND_SEGMENTS,
+    "shutdown_deadline": DEFAULT_SHUTDOWN_DEADLINE,
+    "entity_update_mode": ENTITY_UPDATE_MODE_SNAPSHOT,
+}
 
-class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+
+class EasySmartMonitorCoordinator(
+    DataUpdateCoordinator[Mapping[str, EquipmentSnapshot]]
+):
     """
     Coordinator central do Easy Smart Monitor.
 
     Responsabilidades:
     - Orquestrar leitura de sensores do HA
     - Respeitar configuração do storage
+    - Descartar amostras de fontes que não atualizaram
+    - Filtrar leituras repetidas (deadband / heartbeat)
+    - Agregar leituras por janela (modo "aggregate")
     - Enfileirar eventos
     - Enviar eventos para API
+    - Persistir em disco eventos não enviados (backlog comprimido,
+      com commit em grupo e orçamento de disco)
+    - Compactar a fila acumulada durante quedas da API
     - Controlar sirene e lógica de porta
+    - Publicar um snapshot imutável por equipamento (`data`)
+    - Notificar só as entidades do equipamento alterado
+    - Agendar a coleta (por intervalo) e o envio; pausar / retomar e
+      aplicar options alteradas sem recriar coordinator nem cliente
     """
 
     def __init__(
@@ -50,12 +118,66 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         self.storage = EasySmartMonitorStorage(hass)
 
-        self._queue: list[dict[str, Any]] = []
+        # Snapshot por equipamento, publicado a cada ciclo
+        self.data: Mapping[str, EquipmentSnapshot] = MappingProxyType({})
+
         self._last_door_open: dict[str, datetime] = {}
+        self._manual_alarms: dict[str, datetime] = {}
+        self._freshness = SourceFreshnessTracker()
+        self._value_filter = ChangeOfValueFilter()
+        self._aggregator = WindowAggregator()
+        self._compactor = BacklogCompactor()
+        backlog_dir = hass.config.path(
+            STORAGE_DIR, f"{DOMAIN}_backlog", entry.entry_id
+        )
+        self._backlog: SegmentBacklog | SqliteBacklog = (
+            SqliteBacklog(backlog_dir)
+            if entry.options.get("backlog_backend") == BACKLOG_BACKEND_SQLITE
+            else SegmentBacklog(backlog_dir)
+        )
+        self._retention = RetentionManager(
+            self._backlog,
+            budget_bytes=entry.options.get(
+                "disk_budget_mb", DEFAULT_DISK_BUDGET_MB
+            )
+            * 1024
+            * 1024,
+        )
+        self._writer = GroupCommitWriter(
+            hass,
+            self._backlog,
+            interval=entry.options.get(
+                "durability_window", DEFAULT_DURABILITY_WINDOW
+            ),
+            on_commit_failed=self._compact_queue,
+            on_commit=self._async_backlog_updated,
+            retention=self._retention,
+        )
+        # Fila em memória = eventos ainda não gravados no backlog
+        self._queue: list[dict[str, Any]] = self._writer.pending
+        # Lote retirado da fila e ainda sem confirmação da API
+        self._in_flight: list[dict[str, Any]] = []
         self._last_successful_sync: datetime | None = None
+        self._shutdown_deadline = entry.options.get(
+            "shutdown_deadline", DEFAULT_SHUTDOWN_DEADLINE
+        )
+        self._closed = False
+        # Sensores escutam a própria fonte em vez do snapshot
+        self.mirror_sources = (
+            entry.options.get("entity_update_mode")
+            == ENTITY_UPDATE_MODE_MIRROR
+        )
 
         self._lock = asyncio.Lock()
 
+        # Agendamento: coleta por intervalo e envio periódico
+        self._options = dict(entry.options)
+        self.paused: bool = self._option("paused")
+        self._send_interval: int = self._option("send_interval")
+        self._scheduler = CollectionScheduler(hass, self._async_collect)
+        self._unsub_upload: CALLBACK_TYPE | None = None
+        self._started = False
+
     # =========================================================
     # LIFECYCLE
     # =========================================================
@@ -63,6 +185,8 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     async def async_initialize(self) -> None:
         """Inicialização assíncrona do coordinator."""
         await self.storage.async_load()
+        await self.hass.async_add_executor_job(self._load_backlog)
+        self._adopt_legacy_equipments()
 
         # Garante que existe pelo menos um equipamento em TEST_MODE
         if TEST_MODE and not self.storage.get_equipments():
@@ -72,18 +196,216 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 location="TEST MODE",
             )
 
+        self._refresh_equipments(list(self.storage.get_equipments()))
+
         _LOGGER.info(
             "Easy Smart Monitor iniciado com %s equipamentos",
             len(self.storage.get_equipments()),
         )
 
+    async def async_shutdown(self) -> None:
+        """
+        Encerramento (unload da entry ou parada do HA).
+
+        - Configuração alterada e ainda não gravada vai para o disco
+        - Janelas de agregação abertas viram eventos (parciais)
+        - Envio final dentro de `shutdown_deadline`, alarmes primeiro
+        - O que sobrar é gravado no backlog em disco
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        self._stop_timers()
+        await self.storage.async_flush()
+
+        self._writer.async_cancel()
+
+        for event in self._aggregator.close_all():
+            self._enqueue_event(event)
+
+        try:
+            async with asyncio.timeout(self._shutdown_deadline):
+                async with self._lock:
+                    if await self._send_alarms():
+                        await self._flush_queue()
+        except TimeoutError:
+            _LOGGER.warning(
+                "Prazo de encerramento (%ss) esgotado; %s eventos ficam "
+                "em disco",
+                self._shutdown_deadline,
+                self.queue_size,
+            )
+
+        await self._writer.async_commit()
+        await self.hass.async_add_executor_job(self._backlog.close)
+        await super().async_shutdown()
+
+    def _adopt_legacy_equipments(self) -> None:
+        """
+        Equipamentos antigos em `entry.options["equipments"]` passam
+        para o registro do storage e saem das options.
+        """
+        legacy = self.entry.options.get("equipments")
+        if legacy is None:
+            return
+
+        adopted = self.storage.adopt_legacy_equipments(legacy)
+        if adopted:
+            _LOGGER.info(
+                "Easy Smart Monitor: %s equipamentos migrados das options",
+                len(adopted),
+            )
+
+        options = dict(self.entry.options)
+        del options["equipments"]
+        self.hass.config_entries.async_update_entry(
+            self.entry, options=options
+        )
+
+    def _load_backlog(self) -> None:
+        """
+        Carrega o backlog (executor).
+
+        Se o backend mudou, os pendentes do anterior são migrados.
+        """
+        self._backlog.load()
+        directory = self._backlog.directory
+
+        if isinstance(self._backlog, SqliteBacklog):
+            previous: SegmentBacklog | SqliteBacklog = SegmentBacklog(
+                directory
+            )
+        elif os.path.exists(os.path.join(directory, DATABASE_FILE)):
+            previous = SqliteBacklog(directory)
+        else:
+            return
+
+        previous.load()
+        moved = migrate_pending(previous, self._backlog)
+        previous.close()
+
+        if moved:
+            _LOGGER.info(
+                "%s eventos pendentes migrados para o novo backlog", moved
+            )
+
+    # =========================================================
+    # AGENDAMENTO / PAUSA / OPTIONS
+    # =========================================================
+
+    def _option(self, key: str) -> Any:
+        return self._options.get(key, _OPTION_DEFAULTS[key])
+
+    @callback
+    def async_start(self) -> None:
+        """Liga os timers de coleta e de envio (nada, se pausado)."""
+        self._started = True
+        if self.paused or self._closed:
+            return
+
+        self._scheduler.async_start()
+        if self._unsub_upload is None:
+            self._unsub_upload = async_track_time_interval(
+                self.hass,
+                self._async_upload,
+                timedelta(seconds=self._send_interval),
+                name=f"{DOMAIN} envio",
+            )
+
+    @callback
+    def _stop_timers(self) -> None:
+        self._scheduler.async_stop()
+        if self._unsub_upload is not None:
+            self._unsub_upload()
+            self._unsub_upload = None
+
+    @callback
+    def async_set_paused(self, paused: bool) -> None:
+        """
+        Pausa / retoma a integração.
+
+        Pausada: nenhum timer de coleta ou envio e nenhuma inscrição em
+        fontes (modo espelho); o custo de CPU fica perto de zero. Fila
+        e backlog em disco são mantidos para a retomada.
+        """
+        if paused == self.paused:
+            return
+        self.paused = paused
+
+        if paused:
+            self._stop_timers()
+        elif self._started:
+            self.async_start()
+
+        # Entidades espelho soltam / refazem a inscrição na origem; as
+        # demais não são acordadas
+        async_dispatcher_send(self.hass, self.pause_signal)
+
+        _LOGGER.info(
+            "Easy Smart Monitor %s", "pausado" if paused else "retomado"
+        )
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> bool:
+        """
+        Aplica a diferença das options sem recriar coordinator nem
+        cliente.
+
+        Retorna True se alguma option alterada só vale recarregando a
+        entry (`RELOAD_OPTIONS`).
+        """
+        previous = self._options
+        self._options = dict(options)
+        changed = {
+            key
+            for key, default in _OPTION_DEFAULTS.items()
+            if previous.get(key, default) != self._option(key)
+        }
+        if not changed:
+            return False
+
+        if "durability_window" in changed:
+            self._writer.interval = self._option("durability_window")
+        if "disk_budget_mb" in changed:
+            self._retention.budget_bytes = (
+                self._option("disk_budget_mb") * 1024 * 1024
+            )
+            self._async_backlog_updated()
+        if "shutdown_deadline" in changed:
+            self._shutdown_deadline = self._option("shutdown_deadline")
+        if "send_interval" in changed:
+            self._send_interval = self._option("send_interval")
+            # Só o timer de envio é refeito
+            if self._unsub_upload is not None:
+                self._unsub_upload()
+                self._unsub_upload = None
+                self.async_start()
+        if "paused" in changed:
+            self.async_set_paused(self._option("paused"))
+
+        _LOGGER.debug("Options aplicadas: %s", sorted(changed))
+        return not changed.isdisjoint(RELOAD_OPTIONS)
+
+    async def _async_collect(self, equipment_ids: list[str]) -> None:
+        """Coleta de um grupo de equipamentos (timer do scheduler)."""
+        await self._process_equipments(equipment_ids=equipment_ids)
+
+    async def _async_upload(self, _now: datetime) -> None:
+        """Envio periódico da fila (timer de `send_interval`)."""
+        # Envio anterior ainda em andamento: fica para o próximo
+        if self._lock.locked():
+            return
+        async with self._lock:
+            await self._flush_queue()
+
     # =========================================================
     # UPDATE CORE
     # =========================================================
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Não usado — updates são manuais."""
-        return {}
+    async def _async_update_data(self) -> Mapping[str, EquipmentSnapshot]:
+        """Não usado — o snapshot é publicado por `async_process`."""
+        return self.data
 
     # =========================================================
     # LOOP PRINCIPAL
@@ -101,54 +423,100 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             await self._process_equipments()
             await self._flush_queue()
 
-    async def _process_equipments(self) -> None:
-        """Processa todos os equipamentos ativos."""
-        now = dt_util.utcnow()
+    async def _process_equipments(
+        self,
+        now: datetime | None = None,
+        equipment_ids: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Processa os equipamentos (todos, ou só `equipment_ids`) e
+        publica o snapshot deles.
+        """
+        now = now or dt_util.utcnow()
+        snapshots: dict[str, EquipmentSnapshot] = {}
 
-        for equipment_id, equipment in self.storage.get_equipments().items():
+        equipments = self.storage.get_equipments()
+        if equipment_ids is not None:
+            equipments = {
+                equipment_id: equipments[equipment_id]
+                for equipment_id in equipment_ids
+                if equipment_id in equipments
+            }
+
+        for equipment_id, equipment in equipments.items():
             if not equipment.get("enabled", True):
+                snapshots[equipment_id] = self._read_equipment(
+                    equipment_id, equipment, now
+                )
                 continue
 
-            await self._process_equipment(
+            snapshots[equipment_id] = await self._process_equipment(
                 equipment_id,
                 equipment,
                 now,
             )
 
+        # Janelas de agregação encerradas viram eventos
+        for event in self._aggregator.close_expired(now):
+            self._enqueue_event(event)
+
+        self._publish(snapshots)
+
     async def _process_equipment(
         self,
         equipment_id: str,
         equipment: dict[str, Any],
         now: datetime,
-    ) -> None:
-        """Processa um único equipamento."""
+    ) -> EquipmentSnapshot:
+        """Processa um único equipamento e retorna o snapshot dele."""
         sensors = equipment.get("sensors", {})
         door_cfg = equipment.get("door", {})
+        telemetry_cfg = self.storage.get_telemetry_mode(equipment_id)
+
+        values, sampled, door_open = self._read_sources(equipment)
 
         # -----------------------------------------------------
         # TEMPERATURA / UMIDADE / ENERGIA
         # -----------------------------------------------------
 
-        for sensor_type in ("temperature", "humidity", "energy"):
-            entity_id = sensors.get(sensor_type)
-            if not entity_id:
+        for sensor_type, value in values.items():
+            entity_id = sensors[sensor_type]
+            sampled_at = sampled[sensor_type]
+
+            # Fonte sem atualização desde o último ciclo: nada de novo
+            if not self._freshness.is_new(
+                (equipment_id, sensor_type), entity_id, sampled_at
+            ):
                 continue
 
-            state = self.hass.states.get(entity_id)
-            if not state or state.state in ("unknown", "unavailable"):
+            # Modo agregado: toda amostra nova entra na janela
+            if telemetry_cfg["mode"] == TELEMETRY_MODE_AGGREGATE:
+                closed = self._aggregator.add(
+                    equipment_id,
+                    sensor_type,
+                    value,
+                    sampled_at,
+                    telemetry_cfg["window"],
+                )
+                if closed:
+                    self._enqueue_event(closed)
                 continue
 
-            try:
-                value = float(state.state)
-            except ValueError:
+            if not self._value_filter.accept(
+                (equipment_id, sensor_type),
+                entity_id,
+                value,
+                sampled_at,
+                self.storage.get_sensor_filter(equipment_id, sensor_type),
+            ):
                 continue
 
-            self._queue.append(
+            self._enqueue_event(
                 {
                     "equipment_id": equipment_id,
                     "type": sensor_type,
                     "value": value,
-                    "timestamp": now.isoformat(),
+                    "timestamp": sampled_at.isoformat(),
                 }
             )
 
@@ -156,30 +524,302 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # PORTA + SIRENE
         # -----------------------------------------------------
 
+        if door_open is not None:
+            last_open = self._last_door_open.get(equipment_id)
+
+            if door_open and not last_open:
+                self._last_door_open[equipment_id] = now
+
+            if not door_open:
+                self._last_door_open.pop(equipment_id, None)
+
+            if (
+                door_open
+                and door_cfg.get("enable_siren", True)
+                and last_open
+            ):
+                elapsed = (now - last_open).total_seconds()
+                if elapsed >= door_cfg.get("open_timeout", 120):
+                    await self._trigger_siren(
+                        equipment_id, elapsed
+                    )
+
+        return self._snapshot(
+            equipment_id, equipment, values, sampled, door_open, now
+        )
+
+    # =========================================================
+    # SNAPSHOT
+    # =========================================================
+
+    def _read_sources(
+        self, equipment: dict[str, Any]
+    ) -> tuple[dict[str, float], dict[str, datetime], bool | None]:
+        """
+        Lê e converte as fontes do equipamento.
+
+        Retorna os valores numéricos válidos, o momento de cada amostra e
+        o estado da porta (None sem fonte de porta).
+        """
+        sensors = equipment.get("sensors", {})
+        values: dict[str, float] = {}
+        sampled: dict[str, datetime] = {}
+
+        for sensor_type in TELEMETRY_SENSOR_TYPES:
+            entity_id = sensors.get(sensor_type)
+            if not entity_id:
+                continue
+
+            state = self.hass.states.get(entity_id)
+            value = numeric_reading(state)
+            if value is None:
+                continue
+
+            values[sensor_type] = value
+            sampled[sensor_type] = sample_timestamp(state)
+
+        door_open: bool | None = None
         door_entity = sensors.get("door")
         if door_entity:
-            state = self.hass.states.get(door_entity)
-            if state:
-                is_open = state.state == "on"
+            door_open = door_reading(self.hass.states.get(door_entity))
+
+        return values, sampled, door_open
+
+    def _read_equipment(
+        self,
+        equipment_id: str,
+        equipment: dict[str, Any],
+        now: datetime,
+    ) -> EquipmentSnapshot:
+        """Snapshot sem processamento (sem eventos, sem sirene)."""
+        values, sampled, door_open = self._read_sources(equipment)
+        return self._snapshot(
+            equipment_id, equipment, values, sampled, door_open, now
+        )
 
-                last_open = self._last_door_open.get(equipment_id)
+    def _snapshot(
+        self,
+        equipment_id: str,
+        equipment: dict[str, Any],
+        values: dict[str, float],
+        sampled: dict[str, datetime],
+        door_open: bool | None,
+        now: datetime,
+    ) -> EquipmentSnapshot:
+        door_cfg = equipment.get("door", {})
+        open_since = (
+            self._last_door_open.get(equipment_id) if door_open else None
+        )
 
-                if is_open and not last_open:
-                    self._last_door_open[equipment_id] = now
+        alarm_reason: str | None = None
+        triggered_at: datetime | None = None
 
-                if not is_open:
-                    self._last_door_open.pop(equipment_id, None)
+        if equipment_id in self._manual_alarms:
+            alarm_reason = ALARM_REASON_MANUAL
+            triggered_at = self._manual_alarms[equipment_id]
+        elif open_since and door_cfg.get("enable_siren", True):
+            deadline = open_since + timedelta(
+                seconds=door_cfg.get("open_timeout", 120)
+            )
+            if now >= deadline:
+                alarm_reason = ALARM_REASON_DOOR
+                triggered_at = deadline
 
-                if (
-                    is_open
-                    and door_cfg.get("enable_siren", True)
-                    and last_open
-                ):
-                    elapsed = (now - last_open).total_seconds()
-                    if elapsed >= door_cfg.get("open_timeout", 120):
-                        await self._trigger_siren(
-                            equipment_id, elapsed
-                        )
+        frozen_values, frozen_sampled = freeze(values, sampled)
+
+        return EquipmentSnapshot(
+            equipment_id=equipment_id,
+            enabled=equipment.get("enabled", True),
+            values=frozen_values,
+            sampled_at=frozen_sampled,
+            door_open=door_open,
+            door_open_since=open_since,
+            alarm_reason=alarm_reason,
+            alarm_triggered_at=triggered_at,
+        )
+
+    def _publish(self, snapshots: dict[str, EquipmentSnapshot]) -> None:
+        """
+        Publica o snapshot do ciclo para todas as entidades.
+
+        Equipamentos sem mudança (ou fora do ciclo) mantêm o objeto
+        anterior, e as entidades deles não reescrevem o estado.
+        """
+        data = dict(self.data)
+        for equipment_id, snapshot in snapshots.items():
+            if data.get(equipment_id) != snapshot:
+                data[equipment_id] = snapshot
+        self.async_set_updated_data(MappingProxyType(data))
+
+    # =========================================================
+    # ATUALIZAÇÃO POR EQUIPAMENTO
+    # =========================================================
+
+    def equipment_signal(self, equipment_id: str) -> str:
+        """Sinal do dispatcher de um equipamento desta config entry."""
+        return SIGNAL_EQUIPMENT_UPDATED.format(
+            self.entry.entry_id, equipment_id
+        )
+
+    @property
+    def equipments_added_signal(self) -> str:
+        """Sinal do dispatcher de equipamentos novos desta config entry."""
+        return SIGNAL_EQUIPMENTS_ADDED.format(self.entry.entry_id)
+
+    @property
+    def backlog_signal(self) -> str:
+        """Sinal do dispatcher de backlog alterado desta config entry."""
+        return SIGNAL_BACKLOG_UPDATED.format(self.entry.entry_id)
+
+    @callback
+    def _async_backlog_updated(self) -> None:
+        """
+        Avisa os sensores de diagnóstico do backlog (uso de disco, evento
+        mais antigo, descartes) fora do ciclo de coleta: após commit (e
+        retenção), confirmação de envio ou novo orçamento.
+        """
+        async_dispatcher_send(self.hass, self.backlog_signal)
+
+    @property
+    def pause_signal(self) -> str:
+        """Sinal do dispatcher de pausa / retomada desta config entry."""
+        return SIGNAL_PAUSE_CHANGED.format(self.entry.entry_id)
+
+    @callback
+    def async_update_equipment(self, equipment_id: str) -> None:
+        """
+        Atualiza o snapshot de um equipamento e reescreve o estado só
+        das entidades dele.
+
+        Ao contrário de `async_set_updated_data`, não acorda as
+        entidades dos demais equipamentos.
+        """
+        self._refresh_equipments([equipment_id])
+        async_dispatcher_send(
+            self.hass, self.equipment_signal(equipment_id)
+        )
+
+    @callback
+    def async_apply_equipment_changes(
+        self,
+        *,
+        added: Iterable[str] = (),
+        updated: Iterable[str] = (),
+        removed: Iterable[str] = (),
+    ) -> None:
+        """
+        Aplica ao vivo a diferença de configuração dos equipamentos,
+        sem recarregar a config entry.
+
+        - Novos: snapshot inicial, dispositivo e sinal para cada
+          plataforma criar só as entidades deles
+        - Alterados: snapshot, dispositivo (nome / local) e estado só
+          das entidades deles
+        - Removidos: estado em memória descartado e dispositivo
+          removido; as entidades se removem ao receber o próprio sinal
+
+        Sessão HTTP, fila e entidades dos demais equipamentos seguem
+        intactas.
+        """
+        equipments = self.storage.get_equipments()
+        added = [e for e in added if e in equipments]
+        updated = [e for e in updated if e in equipments]
+        removed = [e for e in removed if e not in equipments]
+
+        async_sync_equipment_devices(
+            self.hass,
+            self.entry,
+            {e: equipments[e] for e in (*added, *updated)},
+            removed,
+        )
+        self._refresh_equipments([*added, *updated, *removed])
+        for equipment_id in removed:
+            self._forget_equipment(equipment_id)
+
+        for equipment_id in (*updated, *removed):
+            async_dispatcher_send(
+                self.hass, self.equipment_signal(equipment_id)
+            )
+        if added:
+            async_dispatcher_send(
+                self.hass, self.equipments_added_signal, added
+            )
+
+    def _refresh_equipments(self, equipment_ids: list[str]) -> None:
+        """
+        Relê o snapshot dos equipamentos (remove os inexistentes) e
+        ajusta o agendamento da coleta de cada um.
+        """
+        data = dict(self.data)
+        now = dt_util.utcnow()
+
+        for equipment_id in equipment_ids:
+            equipment = self.storage.get_equipment(equipment_id)
+            if equipment is None:
+                data.pop(equipment_id, None)
+                self._scheduler.async_remove(equipment_id)
+                continue
+
+            data[equipment_id] = self._read_equipment(
+                equipment_id, equipment, now
+            )
+            self._scheduler.async_set(
+                equipment_id,
+                equipment["collect_interval"]
+                if equipment.get("enabled", True)
+                else None,
+            )
+
+        self.data = MappingProxyType(data)
+
+    def _forget_equipment(self, equipment_id: str) -> None:
+        """Descarta o estado em memória de um equipamento removido."""
+        self._last_door_open.pop(equipment_id, None)
+        self._manual_alarms.pop(equipment_id, None)
+        self._freshness.reset(equipment_id)
+        self._value_filter.reset(equipment_id)
+
+    async def async_bulk_update(
+        self, changes: list[dict[str, Any]]
+    ) -> list[str]:
+        """
+        Alterações de configuração em lote (ver storage).
+
+        Uma gravação no storage e uma atualização por equipamento
+        afetado. ValueError se alguma alteração for inválida.
+        """
+        changed = await self.storage.async_bulk_update(changes)
+        for equipment_id in changed:
+            self.async_update_equipment(equipment_id)
+        return changed
+
+    async def async_import_equipments(
+        self,
+        records: Iterable[Any],
+        *,
+        replace: bool = False,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Importa a frota (ver storage) e retorna o relatório.
+
+        Dispositivos criados / atualizados / removidos de uma vez;
+        entidades criadas / removidas só dos equipamentos afetados,
+        sem recarregar a entry.
+        """
+        report = await self.storage.async_import_equipments(
+            records, replace=replace, dry_run=dry_run
+        )
+        if not report["applied"]:
+            return report
+
+        self.async_apply_equipment_changes(
+            added=report["created"],
+            updated=report["updated"],
+            removed=report["removed"],
+        )
+
+        return report
 
     # =========================================================
     # SIRENE
@@ -189,7 +829,7 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self, equipment_id: str, elapsed: float
     ) -> None:
         """Dispara evento de sirene."""
-        self._queue.append(
+        self._enqueue_event(
             {
                 "equipment_id": equipment_id,
                 "type": "door_alarm",
@@ -200,44 +840,216 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     async def async_trigger_siren(self, equipment_id: str) -> None:
         """Disparo manual da sirene."""
-        self._queue.append(
+        now = dt_util.utcnow()
+        self._manual_alarms[equipment_id] = now
+        self._enqueue_event(
             {
                 "equipment_id": equipment_id,
                 "type": "manual_alarm",
-                "timestamp": dt_util.utcnow().isoformat(),
+                "timestamp": now.isoformat(),
             }
         )
+        self.async_update_equipment(equipment_id)
 
     async def async_silence_siren(self, equipment_id: str) -> None:
         """Silencia sirene (apenas limpa estado interno)."""
         self._last_door_open.pop(equipment_id, None)
+        self._manual_alarms.pop(equipment_id, None)
+        self.async_update_equipment(equipment_id)
 
     # =========================================================
     # FILA / ENVIO
     # =========================================================
 
+    def _enqueue_event(self, event: dict[str, Any]) -> None:
+        """Enfileira um evento; o writer agenda o commit em disco."""
+        self._writer.add(event)
+
     async def _flush_queue(self) -> None:
-        """Envia eventos acumulados para a API."""
-        if not self._queue:
-            return
+        """
+        Envia eventos acumulados para a API.
 
-        events = list(self._queue)
-        self._queue.clear()
+        O backlog em disco (mais antigo) é enviado antes da fila em
+        memória. Eventos em memória enviados com sucesso nunca tocam o
+        disco; se o envio falhar, são gravados no backlog.
+
+        Se a task for cancelada (unload / shutdown), o lote em voo volta
+        para o início da fila e registros do backlog continuam sem
+        confirmação.
+        """
+        if not self._queue and not self._backlog.records:
+            return
 
         if TEST_MODE:
             _LOGGER.info(
                 "TEST_MODE ativo — %s eventos simulados",
-                len(events),
+                len(self._queue),
             )
+            self._writer.take()
             self._last_successful_sync = dt_util.utcnow()
             return
 
+        if not await self._flush_backlog():
+            await self._writer.async_commit()
+            return
+
+        if not self._queue:
+            return
+
+        # Segura o writer: um commit no meio do envio gravaria eventos
+        # mais novos antes dos que podem voltar para a fila
+        async with self._writer.lock:
+            sent = await self._send_batch(self._writer.take())
+
+        if not sent:
+            await self._writer.async_commit()
+            return
+
+        self._compactor.reset()
+
+    async def _send_alarms(self) -> bool:
+        """
+        Envia, antes de tudo, os alarmes que estão na fila em memória.
+
+        Retorna False se a API falhar (os alarmes voltam para a fila).
+        """
+        if TEST_MODE:
+            return True
+
+        async with self._writer.lock:
+            alarms = [e for e in self._queue if not is_compactable(e)]
+            if not alarms:
+                return True
+
+            self._queue[:] = [e for e in self._queue if is_compactable(e)]
+            return await self._send_batch(alarms)
+
+    async def _send_batch(self, events: list[dict[str, Any]]) -> bool:
+        """
+        Envia um lote já retirado da fila (com o lock do writer).
+
+        Em falha ou cancelamento, o lote volta para o início da fila.
+        """
+        self._in_flight = events
+
         try:
             await self.api.send_events(events)
-            self._last_successful_sync = dt_util.utcnow()
+        except asyncio.CancelledError:
+            self._writer.restore(events)
+            raise
         except Exception as err:  # noqa: BLE001
             _LOGGER.error("Erro ao enviar eventos: %s", err)
-            self._queue.extend(events)
+            # Eventos mais antigos voltam para o início da fila
+            self._writer.restore(events)
+            return False
+        finally:
+            self._in_flight = []
+
+        self._last_successful_sync = dt_util.utcnow()
+        return True
+
+    async def _flush_backlog(self) -> bool:
+        """
+        Envia os registros do backlog, do mais antigo ao mais novo.
+
+        Cada registro só é decodificado na sua vez e só é confirmado após
+        resposta da API. Retorna False na primeira falha.
+        """
+        while records := self._backlog.records:
+            info = records[0]
+
+            try:
+                events = await self.hass.async_add_executor_job(
+                    self._read_backlog_record, info
+                )
+            except KeyError:
+                # Segmento reescrito pela retenção: relê a lista
+                continue
+            except (OSError, ValueError) as err:
+                _LOGGER.error("Registro do backlog descartado: %s", err)
+                await self.hass.async_add_executor_job(
+                    self._backlog.ack, info
+                )
+                self._async_backlog_updated()
+                continue
+
+            try:
+                await self.api.send_events(events)
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.error("Erro ao enviar backlog: %s", err)
+                return False
+
+            # Confirmação protegida: um cancelamento aqui não faz a API
+            # receber o registro de novo
+            await asyncio.shield(
+                self.hass.async_add_executor_job(self._backlog.ack, info)
+            )
+            self._last_successful_sync = dt_util.utcnow()
+            self._async_backlog_updated()
+
+        return True
+
+    def _read_backlog_record(
+        self, info: RecordInfo | RowRange
+    ) -> list[dict[str, Any]]:
+        """Decodifica um registro do backlog (executor)."""
+        return list(self._backlog.read_record(info))
+
+    async def _compact_queue(self) -> None:
+        """
+        Compacta telemetria antiga enquanto a fila estiver acima do limite.
+
+        Alarmes não são alterados. O trabalho é feito em blocos, cedendo o
+        event loop entre eles.
+        """
+        if not self._compactor.needs_compaction(self._queue):
+            return
+
+        before = len(self._queue)
+        now = dt_util.utcnow()
+
+        while self._compactor.needs_compaction(
+            self._queue
+        ) and self._compactor.compact_step(self._queue, now):
+            await asyncio.sleep(0)
+
+        _LOGGER.warning(
+            "Fila compactada de %s para %s eventos (janela de %ss)",
+            before,
+            len(self._queue),
+            self._compactor.window,
+        )
+
+    # =========================================================
+    # HISTÓRICO LOCAL
+    # =========================================================
+
+    async def async_query_history(
+        self,
+        equipment_id: str,
+        *,
+        days: float = 1,
+        sensor_type: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Eventos dos últimos `days` dias, lidos do backlog local.
+
+        Disponível apenas com o backend SQLite.
+        """
+        if not isinstance(self._backlog, SqliteBacklog):
+            raise ValueError(
+                "Histórico local disponível apenas com o backend SQLite"
+            )
+
+        since = dt_util.utcnow() - timedelta(days=days)
+        return await self.hass.async_add_executor_job(
+            partial(
+                self._backlog.query,
+                equipment_id,
+                since_ms=int(since.timestamp() * 1000),
+                sensor_type=sensor_type,
+            )
+        )
 
     # =========================================================
     # INFO PARA ENTIDADES
@@ -249,4 +1061,33 @@ class EasySmartMonitorCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
     @property
     def queue_size(self) -> int:
-        return len(self._queue)
\ No newline at end of file
+        return (
+            len(self._queue)
+            + len(self._in_flight)
+            + self._backlog.event_count
+        )
+
+    @property
+    def backlog_size_bytes(self) -> int:
+        return self._backlog.size_bytes
+
+    @property
+    def disk_budget_bytes(self) -> int:
+        return self._retention.budget_bytes
+
+    @property
+    def evicted_bytes(self) -> int:
+        return self._retention.evicted_bytes
+
+    @property
+    def oldest_buffered_event(self) -> datetime | None:
+        """Timestamp do evento mais antigo ainda não enviado."""
+        candidates = []
+
+        if (oldest_ms := self._backlog.oldest_timestamp) is not None:
+            candidates.append(dt_util.utc_from_timestamp(oldest_ms / 1000))
+
+        if head := self._in_flight or self._queue:
+            candidates.append(dt_util.parse_datetime(head[0]["timestamp"]))
+
+        return min(candidates, default=None)
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Dispositivos (device registry) dos equipamentos do Easy Smart Monitor.
+
+Responsabilidades:
+- Montar o DeviceInfo de um equipamento
+- Criar / atualizar / remover os dispositivos de vários equipamentos
+  de uma vez (setup da entry, importação da frota), sem esperar pela
+  criação das entidades
+- Referência das entidades ao dispositivo já criado (só
+  identificadores), para que o entity platform não reprocesse nome,
+  fabricante e área a cada entidade
+- Migrar os dispositivos de versões anteriores, identificados pelo
+  uuid do equipamento (sirene / botão), para o equipment_id
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo
+
+from .const import DOMAIN, MANUFACTURER, MODEL_VIRTUAL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def equipment_device_info(
+    equipment_id: str, equipment: Mapping[str, Any]
+) -> DeviceInfo:
+    """DeviceInfo de um equipamento do storage."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, equipment_id)},
+        name=equipment["name"],
+        manufacturer=MANUFACTURER,
+        model=MODEL_VIRTUAL,
+        suggested_area=equipment.get("location"),
+    )
+
+
+def equipment_device_link(equipment_id: str) -> DeviceInfo:
+    """
+    Referência ao dispositivo do equipamento, criado antes das
+    entidades (tipo "link" do device registry: só identificadores).
+    """
+    return DeviceInfo(identifiers={(DOMAIN, equipment_id)})
+
+
+@callback
+def async_sync_equipment_devices(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    equipments: Mapping[str, Mapping[str, Any]],
+    removed: Iterable[str] = (),
+) -> None:
+    """
+    Cria ou atualiza os dispositivos dos equipamentos e remove os dos
+    equipamentos excluídos.
+
+    Tudo no mesmo ciclo do event loop: o device registry agrupa as
+    alterações em uma única gravação.
+    """
+    registry = dr.async_get(hass)
+
+    for equipment_id, equipment in equipments.items():
+        registry.async_get_or_create(
+            config_entry_id=entry.entry_id,
+            **equipment_device_info(equipment_id, equipment),
+        )
+
+    for equipment_id in removed:
+        device = registry.async_get_device(
+            identifiers={(DOMAIN, equipment_id)}
+        )
+        if device is not None:
+            registry.async_remove_device(device.id)
+
+
+@callback
+def async_migrate_legacy_devices(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    equipments: Mapping[str, Mapping[str, Any]],
+) -> None:
+    """
+    Dispositivos identificados pelo uuid do equipamento (sirene e botão
+    em versões anteriores) passam a usar o equipment_id.
+
+    Sem dispositivo pelo id, o antigo só troca de identificador
+    (mantendo área e nome dados pelo usuário). Se os dois existirem, as
+    entidades do antigo passam para o atual e ele é removido.
+    """
+    registry = dr.async_get(hass)
+    entities = er.async_get(hass)
+
+    for equipment_id, equipment in equipments.items():
+        if equipment["uuid"] == equipment_id:
+            continue
+
+        legacy = registry.async_get_device(
+            identifiers={(DOMAIN, equipment["uuid"])}
+        )
+        if legacy is None or entry.entry_id not in legacy.config_entries:
+            continue
+
+        current = registry.async_get_device(
+            identifiers={(DOMAIN, equipment_id)}
+        )
+        if current is None:
+            registry.async_update_device(
+                legacy.id, new_identifiers={(DOMAIN, equipment_id)}
+            )
+        else:
+            for entity in er.async_entries_for_device(
+                entities, legacy.id, include_disabled_entities=True
+            ):
+                entities.async_update_entity(
+                    entity.entity_id, device_id=current.id
+                )
+            registry.async_remove_device(legacy.id)
+
+        _LOGGER.info(
+            "Dispositivo do equipamento %s migrado do uuid para o id",
+            equipment_id,
+        )
@@ -0,0 +1,104 @@
+"""
+Codificadores de payload de eventos do Easy Smart Monitor.
+
+Responsabilidades:
+- Serializar lotes de eventos para envio à API
+- Desserializar payloads (usado pelo servidor de testes)
+- Negociar o formato com o servidor (JSON / MessagePack)
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import msgpack
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .const import CONTENT_TYPE_JSON, CONTENT_TYPE_MSGPACK
+
+
+class EventEncoder(ABC):
+    """Interface base de codificação de lotes de eventos."""
+
+    content_type: str = ""
+
+    @abstractmethod
+    def encode(self, events: Sequence[dict[str, Any]]) -> bytes:
+        """Serializa o lote no formato {"events": [...]}."""
+
+    @abstractmethod
+    def decode(self, payload: bytes) -> list[dict[str, Any]]:
+        """Retorna a lista de eventos contida no payload."""
+
+
+class JsonEventEncoder(EventEncoder):
+    """Codificação JSON (padrão, sempre disponível)."""
+
+    content_type = CONTENT_TYPE_JSON
+
+    def encode(self, events: Sequence[dict[str, Any]]) -> bytes:
+        # Serializa evento a evento, sem montar o dict intermediário
+        return b'{"events":[' + b",".join(
+            json_bytes(event) for event in events
+        ) + b"]}"
+
+    def decode(self, payload: bytes) -> list[dict[str, Any]]:
+        return json_loads(payload)["events"]
+
+
+class MsgpackEventEncoder(EventEncoder):
+    """Codificação binária MessagePack (requisito do manifest)."""
+
+    content_type = CONTENT_TYPE_MSGPACK
+
+    def encode(self, events: Sequence[dict[str, Any]]) -> bytes:
+        packer = msgpack.Packer()
+        buffer = bytearray(packer.pack_map_header(1))
+        buffer += packer.pack("events")
+        buffer += packer.pack_array_header(len(events))
+
+        for event in events:
+            buffer += packer.pack(event)
+
+        return bytes(buffer)
+
+    def decode(self, payload: bytes) -> list[dict[str, Any]]:
+        return msgpack.unpackb(payload)["events"]
+
+
+# ============================================================
+# REGISTRO / NEGOCIAÇÃO
+# ============================================================
+
+ENCODERS: dict[str, type[EventEncoder]] = {
+    CONTENT_TYPE_JSON: JsonEventEncoder,
+    CONTENT_TYPE_MSGPACK: MsgpackEventEncoder,
+}
+
+# Ordem de preferência do cliente (mais compacto primeiro)
+PREFERRED_CONTENT_TYPES = (CONTENT_TYPE_MSGPACK, CONTENT_TYPE_JSON)
+
+
+def get_encoder(content_type: str) -> EventEncoder:
+    """Retorna o encoder de um content type (JSON como fallback)."""
+    encoder_cls = ENCODERS.get(content_type, JsonEventEncoder)
+    return encoder_cls()
+
+
+def negotiate_encoder(accepted: Iterable[str] | None) -> EventEncoder:
+    """
+    Escolhe o melhor encoder suportado pelos dois lados.
+
+    Servidores que não anunciam formatos recebem JSON.
+    """
+    accepted_set = set(accepted or ())
+
+    for content_type in PREFERRED_CONTENT_TYPES:
+        if content_type in accepted_set and content_type in ENCODERS:
+            return get_encoder(content_type)
+
+    return JsonEventEncoder()
@@ -0,0 +1,274 @@
+"""
+Entidade base por equipamento do Easy Smart Monitor.
+
+Responsabilidades:
+- Guardar equipment_id e DeviceInfo do equipamento
+- Escutar o sinal de atualização do próprio equipamento, para que a
+  alteração de um equipamento só reescreva o estado das entidades dele
+- Expor o snapshot do equipamento publicado pelo coordinator
+- Modo espelho: sensores escutam só a própria entidade de origem e o
+  sinal de pausa, nunca as atualizações do coordinator
+- Criar as entidades dos equipamentos no setup da plataforma e as de
+  cada equipamento novo depois, sem recarregar a config entry; a
+  entidade de um equipamento removido se remove sozinha
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, Event, State, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.update_coordinator import (
+    BaseCoordinatorEntity,
+    CoordinatorEntity,
+)
+
+from .const import SENSOR_TYPE_DOOR
+from .coordinator import EasySmartMonitorCoordinator
+from .devices import equipment_device_link
+from .snapshot import EquipmentSnapshot, door_reading, numeric_reading
+
+
+class EasySmartMonitorEquipmentEntity(
+    CoordinatorEntity[EasySmartMonitorCoordinator]
+):
+    """Entidade vinculada a um equipamento."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: EasySmartMonitorCoordinator,
+        equipment_id: str,
+        device_info: DeviceInfo,
+    ):
+        super().__init__(coordinator)
+        self.equipment_id = equipment_id
+        self._attr_device_info = device_info
+        self._written: EquipmentSnapshot | None = None
+
+    @property
+    def snapshot(self) -> EquipmentSnapshot | None:
+        """Snapshot atual do equipamento (None antes do primeiro ciclo)."""
+        return self.coordinator.data.get(self.equipment_id)
+
+    @property
+    def _listens_to_coordinator(self) -> bool:
+        """Escutar as atualizações do coordinator (todo ciclo)?"""
+        return True
+
+    async def async_added_to_hass(self) -> None:
+        if self._listens_to_coordinator:
+            await super().async_added_to_hass()
+        else:
+            # Pula só a inscrição do CoordinatorEntity
+            await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        # A plataforma escreve o estado inicial logo após a adição
+        self._written = self.snapshot
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self.coordinator.equipment_signal(self.equipment_id),
+                self._handle_equipment_update,
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Ciclo sem mudança neste equipamento: mesmo objeto, nada a escrever
+        if self.snapshot is self._written:
+            return
+        self._handle_equipment_update()
+
+    @callback
+    def _handle_equipment_update(self) -> None:
+        if self.coordinator.storage.get_equipment(self.equipment_id) is None:
+            # Equipamento removido: o registro some com o dispositivo
+            self.hass.async_create_task(self.async_remove(force_remove=True))
+            return
+        self._written = self.snapshot
+        self.async_write_ha_state()
+
+
+# Entidades de um equipamento: (equipment_id, equipamento, DeviceInfo)
+EquipmentEntitiesFactory = Callable[
+    [str, Mapping[str, Any], DeviceInfo], Iterable[Entity]
+]
+
+
+@callback
+def async_setup_equipment_entities(
+    coordinator: EasySmartMonitorCoordinator,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    factory: EquipmentEntitiesFactory,
+    entities: Iterable[Entity] = (),
+) -> None:
+    """
+    Adiciona as entidades de todos os equipamentos (mais `entities`,
+    as globais da plataforma) e passa a criar as de cada equipamento
+    novo quando o coordinator sinaliza, sem recarregar a entry.
+
+    Os dispositivos já existem (setup da entry / coordinator): cada
+    entidade recebe só a referência ao dispositivo do equipamento.
+    """
+    storage = coordinator.storage
+
+    def _build(equipment_ids: Iterable[str]) -> list[Entity]:
+        built: list[Entity] = []
+        for equipment_id in equipment_ids:
+            equipment = storage.get_equipment(equipment_id)
+            if equipment is None:
+                continue
+            built.extend(
+                factory(
+                    equipment_id,
+                    equipment,
+                    equipment_device_link(equipment_id),
+                )
+            )
+        return built
+
+    @callback
+    def _async_equipments_added(equipment_ids: list[str]) -> None:
+        async_add_entities(_build(equipment_ids))
+
+    async_add_entities([*entities, *_build(storage.get_equipments())])
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            coordinator.hass,
+            coordinator.equipments_added_signal,
+            _async_equipments_added,
+        )
+    )
+
+
+class EasySmartMonitorSourceEntity(EasySmartMonitorEquipmentEntity):
+    """
+    Entidade que reflete uma fonte do HA (temperatura, umidade, energia
+    ou porta) vinculada ao equipamento.
+
+    - Modo snapshot (padrão): lê o snapshot publicado pelo coordinator
+    - Modo espelho: escuta só a entidade de origem e escreve o estado
+      quando ela muda, sem se inscrever nas atualizações do
+      coordinator. Trocar a origem pelo select move a inscrição; pausar
+      a integração (sinal próprio) solta
+    """
+
+    def __init__(
+        self,
+        coordinator: EasySmartMonitorCoordinator,
+        equipment_id: str,
+        device_info: DeviceInfo,
+        sensor_type: str,
+    ):
+        super().__init__(coordinator, equipment_id, device_info)
+        self.sensor_type = sensor_type
+
+        self._mirror = coordinator.mirror_sources
+        self._source: str | None = None
+        self._source_value: Any = None
+        self._unsub_source: CALLBACK_TYPE | None = None
+
+    @property
+    def _listens_to_coordinator(self) -> bool:
+        return not self._mirror
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._mirror:
+            self._bind_source()
+            self.async_on_remove(self._unbind_source)
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    self.coordinator.pause_signal,
+                    self._handle_pause_changed,
+                )
+            )
+
+    @property
+    def source_value(self) -> Any:
+        """Leitura atual da fonte (None sem fonte ou indisponível)."""
+        if self._mirror:
+            return self._source_value
+
+        snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        if self.sensor_type == SENSOR_TYPE_DOOR:
+            return snapshot.door_open
+        return snapshot.values.get(self.sensor_type)
+
+    def _parse(self, state: State | None) -> Any:
+        if self.sensor_type == SENSOR_TYPE_DOOR:
+            return door_reading(state)
+        return numeric_reading(state)
+
+    # =========================================================
+    # MODO ESPELHO
+    # =========================================================
+
+    @callback
+    def _bind_source(self) -> None:
+        """
+        Inscreve na origem vinculada (move a inscrição se mudou).
+
+        Com a integração pausada, solta a inscrição e mantém a última
+        leitura.
+        """
+        if self.coordinator.paused:
+            self._unbind_source()
+            # Refaz a inscrição ao retomar
+            self._source = None
+            return
+
+        source = self.coordinator.storage.get_sensor_source(
+            self.equipment_id, self.sensor_type
+        )
+        if source == self._source:
+            return
+
+        self._unbind_source()
+        self._source = source
+        self._source_value = None
+
+        if source:
+            self._source_value = self._parse(self.hass.states.get(source))
+            self._unsub_source = async_track_state_change_event(
+                self.hass, source, self._handle_source_event
+            )
+
+    @callback
+    def _unbind_source(self) -> None:
+        if self._unsub_source is not None:
+            self._unsub_source()
+            self._unsub_source = None
+
+    @callback
+    def _handle_source_event(self, event: Event) -> None:
+        self._source_value = self._parse(event.data["new_state"])
+        self.async_write_ha_state()
+
+    # =========================================================
+    # ATUALIZAÇÕES
+    # =========================================================
+
+    @callback
+    def _handle_pause_changed(self) -> None:
+        """Pausa / retomada: solta ou refaz a inscrição na origem."""
+        self._bind_source()
+        if not self.coordinator.paused:
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_equipment_update(self) -> None:
+        if self._mirror:
+            self._bind_source()
+        super()._handle_equipment_update()
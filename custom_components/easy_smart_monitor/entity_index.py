@@ -0,0 +1,205 @@
+"""
+Índice de entidades do HA para as listas de opções do Easy Smart Monitor.
+
+Responsabilidades:
+- Manter as entidades habilitadas que servem de origem agrupadas por
+  (domínio, device_class, unidade), cada grupo em ordem
+- Oferecer a cada tipo de sensor só as entidades compatíveis
+  (ex.: porta → binary_sensor de porta / abertura)
+- Atualizar o índice de forma incremental a partir dos eventos do
+  entity registry, sem varrer o registry de novo, avisando (sinal por
+  tipo de sensor) só os selects cujas opções mudaram
+- Ser compartilhado por todos os selects e pelo config flow
+  (um índice por integração)
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from heapq import merge
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    DOMAIN,
+    SIGNAL_ENTITY_OPTIONS_UPDATED,
+    SOURCE_ENTITY_FILTERS,
+    SOURCE_OPTION_NONE,
+)
+
+DATA_ENTITY_INDEX = f"{DOMAIN}_entity_index"
+
+# (domínio, device_class, unidade)
+IndexKey = tuple[str, str | None, str | None]
+
+
+def _key(entry: er.RegistryEntry) -> IndexKey:
+    return (
+        entry.domain,
+        entry.device_class or entry.original_device_class,
+        entry.unit_of_measurement,
+    )
+
+
+def _matches(sensor_type: str, key: IndexKey) -> bool:
+    """A entidade serve de origem para o tipo de sensor?"""
+    domain, device_classes, units = SOURCE_ENTITY_FILTERS[sensor_type]
+    key_domain, device_class, unit = key
+
+    if key_domain != domain:
+        return False
+    if device_class is not None:
+        return device_class in device_classes
+    return unit in units
+
+
+class EntityOptionIndex:
+    """Entidades habilitadas do registry, por domínio / classe / unidade."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._groups: dict[IndexKey, list[str]] = {}
+        self._keys: dict[str, IndexKey] = {}
+        # Listas prontas por tipo de sensor (None = todos), compartilhadas
+        self._entity_ids: dict[str | None, list[str]] = {}
+        self._options: dict[str, list[str]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    # =========================================================
+    # CICLO DE VIDA
+    # =========================================================
+
+    @callback
+    def async_start(self) -> None:
+        """Indexa o registry (uma varredura) e passa a ouvir mudanças."""
+        for entry in er.async_get(self.hass).entities.values():
+            self._add(entry)
+
+        self._unsub = self.hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED, self._handle_registry_updated
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    # =========================================================
+    # CONSULTA
+    # =========================================================
+
+    def entity_ids(self, sensor_type: str | None = None) -> list[str]:
+        """
+        Entidades compatíveis com um tipo de sensor, em ordem.
+
+        Sem tipo, retorna as compatíveis com qualquer tipo. A lista é
+        compartilhada e não deve ser alterada por quem a recebe.
+        """
+        entity_ids = self._entity_ids.get(sensor_type)
+        if entity_ids is None:
+            groups = [
+                group
+                for key, group in self._groups.items()
+                if sensor_type is None or _matches(sensor_type, key)
+            ]
+            entity_ids = list(merge(*groups))
+            self._entity_ids[sensor_type] = entity_ids
+        return entity_ids
+
+    def accepts(self, sensor_type: str, entity_id: str) -> bool:
+        """A entidade (indexada) serve de origem para o tipo de sensor?"""
+        key = self._keys.get(entity_id)
+        return key is not None and _matches(sensor_type, key)
+
+    @staticmethod
+    def options_signal(sensor_type: str) -> str:
+        """Sinal do dispatcher de opções alteradas de um tipo de sensor."""
+        return SIGNAL_ENTITY_OPTIONS_UPDATED.format(sensor_type)
+
+    def options(self, sensor_type: str) -> list[str]:
+        """Opções de um select de origem: "Nenhum" + compatíveis."""
+        options = self._options.get(sensor_type)
+        if options is None:
+            options = self._options[sensor_type] = [
+                SOURCE_OPTION_NONE,
+                *self.entity_ids(sensor_type),
+            ]
+        return options
+
+    # =========================================================
+    # ATUALIZAÇÃO INCREMENTAL
+    # =========================================================
+
+    def _add(self, entry: er.RegistryEntry) -> None:
+        if entry.disabled or entry.entity_id in self._keys:
+            return
+
+        key = _key(entry)
+        if not any(_matches(t, key) for t in SOURCE_ENTITY_FILTERS):
+            return
+
+        group = self._groups.setdefault(key, [])
+        group.insert(bisect_left(group, entry.entity_id), entry.entity_id)
+        self._keys[entry.entity_id] = key
+        self._invalidate(key)
+
+    def _remove(self, entity_id: str) -> None:
+        key = self._keys.pop(entity_id, None)
+        if key is None:
+            return
+
+        group = self._groups[key]
+        del group[bisect_left(group, entity_id)]
+        if not group:
+            del self._groups[key]
+        self._invalidate(key)
+
+    def _invalidate(self, key: IndexKey) -> None:
+        """
+        Descarta as listas prontas dos tipos afetados pelo grupo e avisa
+        os selects desses tipos.
+        """
+        for sensor_type in SOURCE_ENTITY_FILTERS:
+            if _matches(sensor_type, key):
+                self._entity_ids.pop(sensor_type, None)
+                self._options.pop(sensor_type, None)
+                self._entity_ids.pop(None, None)
+                async_dispatcher_send(
+                    self.hass, self.options_signal(sensor_type)
+                )
+
+    @callback
+    def _handle_registry_updated(self, event: Event) -> None:
+        action = event.data["action"]
+        entity_id = event.data["entity_id"]
+
+        # Remoção, renomeação, classe/unidade alterada, (des)habilitação
+        self._remove(event.data.get("old_entity_id", entity_id))
+        if action == "remove":
+            return
+
+        self._remove(entity_id)
+        entry = er.async_get(self.hass).async_get(entity_id)
+        if entry is not None:
+            self._add(entry)
+
+
+@callback
+def async_get_entity_index(hass: HomeAssistant) -> EntityOptionIndex:
+    """Índice compartilhado da integração (criado no primeiro uso)."""
+    index: EntityOptionIndex | None = hass.data.get(DATA_ENTITY_INDEX)
+    if index is None:
+        index = hass.data[DATA_ENTITY_INDEX] = EntityOptionIndex(hass)
+        index.async_start()
+    return index
+
+
+@callback
+def async_release_entity_index(hass: HomeAssistant) -> None:
+    """Descarta o índice (quando a última entry é descarregada)."""
+    index = hass.data.pop(DATA_ENTITY_INDEX, None)
+    if index is not None:
+        index.async_stop()
@@ -0,0 +1,132 @@
+"""
+Filtros de amostragem do Easy Smart Monitor.
+
+Responsabilidades:
+- Descartar amostras repetidas de uma fonte que não atualizou
+- Descartar leituras que não mudaram de forma relevante (deadband)
+- Garantir um envio periódico mesmo sem mudança (heartbeat)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import State
+
+from .const import (
+    DEADBAND_MODE_PERCENT,
+    DEFAULT_DEADBAND,
+    DEFAULT_HEARTBEAT_SECONDS,
+)
+
+
+def sample_timestamp(state: State) -> datetime:
+    """
+    Momento em que a fonte produziu a leitura atual.
+
+    `last_reported` avança mesmo quando o valor se repete (HA 2024.4+);
+    em versões anteriores, usa `last_updated`.
+    """
+    return getattr(state, "last_reported", None) or state.last_updated
+
+
+class SourceFreshnessTracker:
+    """
+    Registra o timestamp da última amostra usada de cada binding.
+
+    Evita reenviar a mesma leitura de uma fonte parada (ex.: sensor
+    Zigbee sem bateria) como se fosse nova a cada ciclo.
+    """
+
+    def __init__(self) -> None:
+        self._sampled: dict[tuple[str, str], tuple[str, datetime]] = {}
+
+    def is_new(
+        self,
+        key: tuple[str, str],
+        source: str,
+        sampled_at: datetime,
+    ) -> bool:
+        """Retorna True (e registra) se a amostra ainda não foi usada."""
+        if self._sampled.get(key) == (source, sampled_at):
+            return False
+
+        self._sampled[key] = (source, sampled_at)
+        return True
+
+    def reset(self, equipment_id: str | None = None) -> None:
+        """Esquece o histórico (de um equipamento ou de todos)."""
+        if equipment_id is None:
+            self._sampled.clear()
+            return
+
+        for key in [k for k in self._sampled if k[0] == equipment_id]:
+            del self._sampled[key]
+
+
+@dataclass
+class _LastSent:
+    """Último valor enfileirado de um binding."""
+
+    source: str
+    value: float
+    timestamp: datetime
+
+
+class ChangeOfValueFilter:
+    """
+    Filtro por mudança de valor, por binding (equipamento, tipo de sensor).
+
+    Uma leitura é aceita quando:
+    - É a primeira do binding (ou a entidade de origem mudou)
+    - Sai da banda morta em relação ao último valor enviado
+    - O último envio é mais antigo que o heartbeat
+    """
+
+    def __init__(self) -> None:
+        self._last: dict[tuple[str, str], _LastSent] = {}
+
+    def accept(
+        self,
+        key: tuple[str, str],
+        source: str,
+        value: float,
+        timestamp: datetime,
+        config: dict[str, Any],
+    ) -> bool:
+        """Avalia a leitura e, se aceita, registra como último envio."""
+        last = self._last.get(key)
+
+        if (
+            last is None
+            or last.source != source
+            or self._outside_deadband(last.value, value, config)
+            or (timestamp - last.timestamp).total_seconds()
+            >= config.get("heartbeat", DEFAULT_HEARTBEAT_SECONDS)
+        ):
+            self._last[key] = _LastSent(source, value, timestamp)
+            return True
+
+        return False
+
+    def reset(self, equipment_id: str | None = None) -> None:
+        """Esquece o histórico (de um equipamento ou de todos)."""
+        if equipment_id is None:
+            self._last.clear()
+            return
+
+        for key in [k for k in self._last if k[0] == equipment_id]:
+            del self._last[key]
+
+    @staticmethod
+    def _outside_deadband(
+        last: float, value: float, config: dict[str, Any]
+    ) -> bool:
+        deadband = config.get("deadband", DEFAULT_DEADBAND)
+
+        if config.get("deadband_mode") == DEADBAND_MODE_PERCENT:
+            deadband = abs(last) * deadband / 100
+
+        return abs(value - last) > deadband
@@ -0,0 +1,209 @@
+"""
+Formatos de importação / exportação da frota de equipamentos.
+
+Responsabilidades:
+- Converter os registros do storage (`export_equipments`) em JSON ou
+  CSV (uma linha por equipamento, uma coluna por tipo de sensor, uma
+  por campo de filtro, ex.: `temperature_deadband`, e as do modo de
+  telemetria, `telemetry_mode` / `telemetry_window`)
+- Ler JSON ou CSV de volta em registros de importação, linha a linha
+
+Regras de negócio (limites, ids repetidos, domínios das entidades)
+ficam no storage; aqui só há formato.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import voluptuous as vol
+
+import homeassistant.helpers.config_validation as cv
+
+from .const import SOURCE_ENTITY_FILTERS, TELEMETRY_SENSOR_TYPES
+
+FLEET_FORMAT_JSON = "json"
+FLEET_FORMAT_CSV = "csv"
+FLEET_FORMATS = (FLEET_FORMAT_JSON, FLEET_FORMAT_CSV)
+
+SENSOR_COLUMNS = tuple(SOURCE_ENTITY_FILTERS)
+
+# Filtro por sensor: coluna `<tipo>_<campo>` → (tipo, campo)
+FILTER_COLUMNS = {
+    f"{sensor_type}_{field}": (sensor_type, field)
+    for sensor_type in TELEMETRY_SENSOR_TYPES
+    for field in ("deadband", "deadband_mode", "heartbeat")
+}
+
+# Modo de telemetria: coluna → campo
+TELEMETRY_COLUMNS = {
+    "telemetry_mode": "mode",
+    "telemetry_window": "window",
+}
+
+CSV_COLUMNS = (
+    "id",
+    "name",
+    "location",
+    "enabled",
+    "collect_interval",
+    "enable_siren",
+    "open_timeout",
+    *SENSOR_COLUMNS,
+    *FILTER_COLUMNS,
+    *TELEMETRY_COLUMNS,
+)
+
+_BOOL_COLUMNS = ("enabled", "enable_siren")
+_INT_COLUMNS = ("collect_interval", "open_timeout")
+_FILTER_CONVERTERS = {"deadband": float, "heartbeat": int}
+
+
+# =========================================================
+# EXPORTAÇÃO
+# =========================================================
+
+def dump_equipments(
+    records: Iterable[dict[str, Any]], fmt: str
+) -> str:
+    """Registros de exportação no formato pedido."""
+    if fmt == FLEET_FORMAT_JSON:
+        return json.dumps(
+            {"equipments": list(records)}, ensure_ascii=False, indent=2
+        )
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for record in records:
+        sensors = record.get("sensors", {})
+        filters = record.get("filters", {})
+        telemetry = record.get("telemetry", {})
+        writer.writerow(
+            {
+                **{
+                    column: record.get(column)
+                    for column in CSV_COLUMNS
+                    if column not in SENSOR_COLUMNS
+                    and column not in FILTER_COLUMNS
+                    and column not in TELEMETRY_COLUMNS
+                },
+                **{
+                    column: sensors.get(column) or ""
+                    for column in SENSOR_COLUMNS
+                },
+                **{
+                    column: filters.get(sensor_type, {}).get(field, "")
+                    for column, (sensor_type, field) in (
+                        FILTER_COLUMNS.items()
+                    )
+                },
+                **{
+                    column: telemetry.get(field, "")
+                    for column, field in TELEMETRY_COLUMNS.items()
+                },
+            }
+        )
+    return buffer.getvalue()
+
+
+# =========================================================
+# IMPORTAÇÃO
+# =========================================================
+
+def iter_import_records(text: str, fmt: str) -> Iterator[Any]:
+    """
+    Registros de importação, um por item / linha, sem validação.
+
+    Células com conversão impossível seguem como texto e são apontadas
+    pela validação do storage, no relatório, junto com os demais erros
+    da linha. Erro no documento inteiro (JSON inválido, CSV sem
+    cabeçalho) gera ValueError.
+    """
+    if fmt == FLEET_FORMAT_JSON:
+        return _iter_json(text)
+    return _iter_csv(text)
+
+
+def _iter_json(text: str) -> Iterator[Any]:
+    try:
+        document = json.loads(text)
+    except ValueError as err:
+        raise ValueError(f"JSON inválido: {err}") from err
+
+    if isinstance(document, dict):
+        document = document.get("equipments")
+    if not isinstance(document, list):
+        raise ValueError("JSON deve ser uma lista de equipamentos")
+
+    return iter(document)
+
+
+def _iter_csv(text: str) -> Iterator[dict[str, Any]]:
+    reader = csv.DictReader(
+        io.StringIO(text), restkey="extra", restval=""
+    )
+    if not reader.fieldnames or "id" not in reader.fieldnames:
+        raise ValueError("CSV sem cabeçalho com a coluna id")
+
+    return map(_csv_record, reader)
+
+
+def _csv_record(row: dict[str, Any]) -> dict[str, Any]:
+    """Converte uma linha do CSV (células vazias = não informado)."""
+    record: dict[str, Any] = {}
+    sensors: dict[str, str | None] = {}
+    filters: dict[str, dict[str, Any]] = {}
+    telemetry: dict[str, Any] = {}
+
+    for column, cell in row.items():
+        if not isinstance(cell, str):
+            # Colunas a mais na linha (`extra`)
+            record[column] = cell
+            continue
+
+        cell = cell.strip()
+        if column in SENSOR_COLUMNS:
+            # Coluna presente e vazia = sem associação
+            sensors[column] = cell or None
+        elif not cell:
+            continue
+        elif column in FILTER_COLUMNS:
+            sensor_type, field = FILTER_COLUMNS[column]
+            converter = _FILTER_CONVERTERS.get(field, str)
+            try:
+                value = converter(cell)
+            except ValueError:
+                value = cell
+            filters.setdefault(sensor_type, {})[field] = value
+        elif column in TELEMETRY_COLUMNS:
+            field = TELEMETRY_COLUMNS[column]
+            try:
+                value = int(cell) if field == "window" else cell
+            except ValueError:
+                value = cell
+            telemetry[field] = value
+        elif column in _BOOL_COLUMNS:
+            try:
+                record[column] = cv.boolean(cell)
+            except vol.Invalid:
+                record[column] = cell
+        elif column in _INT_COLUMNS:
+            try:
+                record[column] = int(cell)
+            except ValueError:
+                record[column] = cell
+        else:
+            record[column] = cell
+
+    if sensors:
+        record["sensors"] = sensors
+    if filters:
+        record["filters"] = filters
+    if telemetry:
+        record["telemetry"] = telemetry
+    return record
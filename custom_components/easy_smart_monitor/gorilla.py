@@ -0,0 +1,342 @@
+"""
+Compressão de telemetria no estilo Gorilla.
+
+Responsabilidades:
+- Timestamps codificados por delta-of-delta
+- Valores float codificados por XOR com o valor anterior
+- Blocos de eventos: uma série por (equipamento, tipo) + eventos
+  não numéricos (alarmes, agregados) em JSON
+
+Timestamps são guardados com resolução de milissegundos.
+"""
+
+from __future__ import annotations
+
+import heapq
+import struct
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import TELEMETRY_SENSOR_TYPES
+
+BLOCK_MAGIC = b"ESMG"
+BLOCK_VERSION = 1
+
+_RAW_KEYS = frozenset(("equipment_id", "type", "value", "timestamp"))
+
+# (prefixo, bits do prefixo, bits do valor) para delta-of-delta
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+    (0b11110, 5, 32),
+    (0b11111, 5, 64),
+)
+_DOD_WIDTHS = (7, 9, 12, 32)
+
+
+# ============================================================
+# BITS
+# ============================================================
+
+class BitWriter:
+    """Escrita sequencial de bits (MSB primeiro)."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    def write(self, value: int, nbits: int) -> None:
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._bits += nbits
+
+        while self._bits >= 8:
+            self._bits -= 8
+            self._buffer.append((self._acc >> self._bits) & 0xFF)
+
+        self._acc &= (1 << self._bits) - 1
+
+    def getvalue(self) -> bytes:
+        if not self._bits:
+            return bytes(self._buffer)
+        return bytes(self._buffer) + bytes(
+            [(self._acc << (8 - self._bits)) & 0xFF]
+        )
+
+
+class BitReader:
+    """Leitura sequencial de bits (MSB primeiro)."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+        self._acc = 0
+        self._bits = 0
+
+    def read(self, nbits: int) -> int:
+        while self._bits < nbits:
+            self._acc = (self._acc << 8) | self._data[self._pos]
+            self._pos += 1
+            self._bits += 8
+
+        self._bits -= nbits
+        value = self._acc >> self._bits
+        self._acc &= (1 << self._bits) - 1
+        return value
+
+
+def _signed(value: int, nbits: int) -> int:
+    if value >= 1 << (nbits - 1):
+        return value - (1 << nbits)
+    return value
+
+
+def _read_dod_width(reader: BitReader) -> int:
+    """Lê o prefixo unário do delta-of-delta e retorna sua largura."""
+    for width in _DOD_WIDTHS:
+        if not reader.read(1):
+            return width
+    return 64
+
+
+def _float_bits(value: float) -> int:
+    return struct.unpack(">Q", struct.pack(">d", value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    return struct.unpack(">d", struct.pack(">Q", bits))[0]
+
+
+# ============================================================
+# SÉRIE (TIMESTAMP, VALOR)
+# ============================================================
+
+def encode_series(points: Iterable[tuple[int, float]]) -> bytes:
+    """Codifica pontos (timestamp em ms, valor) de uma série."""
+    writer = BitWriter()
+    prev_ts = prev_delta = 0
+    prev_bits = 0
+    prev_leading = prev_trailing = -1
+    first = True
+
+    for ts, value in points:
+        bits = _float_bits(value)
+
+        if first:
+            writer.write(ts, 64)
+            writer.write(bits, 64)
+            prev_ts, prev_bits, first = ts, bits, False
+            continue
+
+        # --- timestamp: delta-of-delta ---
+        delta = ts - prev_ts
+        dod = delta - prev_delta
+        prev_ts, prev_delta = ts, delta
+
+        if dod == 0:
+            writer.write(0, 1)
+        else:
+            for prefix, prefix_bits, value_bits in _DOD_BUCKETS:
+                limit = 1 << (value_bits - 1)
+                if -limit <= dod < limit:
+                    writer.write(prefix, prefix_bits)
+                    writer.write(dod, value_bits)
+                    break
+
+        # --- valor: XOR com o anterior ---
+        xor = bits ^ prev_bits
+        prev_bits = bits
+
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+
+        if (
+            prev_leading >= 0
+            and leading >= prev_leading
+            and trailing >= prev_trailing
+        ):
+            meaningful = 64 - prev_leading - prev_trailing
+            writer.write(0b10, 2)
+            writer.write(xor >> prev_trailing, meaningful)
+            continue
+
+        meaningful = 64 - leading - trailing
+        writer.write(0b11, 2)
+        writer.write(leading, 5)
+        writer.write(meaningful - 1, 6)
+        writer.write(xor >> trailing, meaningful)
+        prev_leading, prev_trailing = leading, trailing
+
+    return writer.getvalue()
+
+
+def decode_series(data: bytes, count: int) -> Iterator[tuple[int, float]]:
+    """Decodifica `count` pontos de uma série, sob demanda."""
+    if count <= 0:
+        return
+
+    reader = BitReader(data)
+    ts = reader.read(64)
+    bits = reader.read(64)
+    delta = 0
+    leading = trailing = 0
+
+    yield ts, _bits_float(bits)
+
+    for _ in range(count - 1):
+        # --- timestamp ---
+        if reader.read(1):
+            width = _read_dod_width(reader)
+            delta += _signed(reader.read(width), width)
+        ts += delta
+
+        # --- valor ---
+        if reader.read(1):
+            if reader.read(1):
+                leading = reader.read(5)
+                meaningful = reader.read(6) + 1
+                trailing = 64 - leading - meaningful
+            else:
+                meaningful = 64 - leading - trailing
+            bits ^= reader.read(meaningful) << trailing
+
+        yield ts, _bits_float(bits)
+
+
+# ============================================================
+# BLOCO DE EVENTOS
+# ============================================================
+
+def is_raw_telemetry(event: dict[str, Any]) -> bool:
+    """Leitura numérica simples, sem campos extras."""
+    return (
+        event.keys() == _RAW_KEYS
+        and event["type"] in TELEMETRY_SENSOR_TYPES
+        and isinstance(event["value"], (int, float))
+        and not isinstance(event["value"], bool)
+    )
+
+
+def timestamp_ms(timestamp: str) -> int:
+    """Timestamp ISO 8601 -> milissegundos desde a época."""
+    return round(dt_util.parse_datetime(timestamp).timestamp() * 1000)
+
+
+def ms_timestamp(ms: int) -> str:
+    """Milissegundos desde a época -> timestamp ISO 8601 (UTC)."""
+    return dt_util.utc_from_timestamp(ms / 1000).isoformat()
+
+
+def encode_block(events: Iterable[dict[str, Any]]) -> bytes:
+    """
+    Codifica um lote de eventos.
+
+    Layout: MAGIC | versão (u8) | tamanho do cabeçalho (u32) |
+    cabeçalho JSON | séries Gorilla | eventos extras em JSON.
+    """
+    series: dict[tuple[Any, str], list[tuple[int, float]]] = {}
+    extras: list[dict[str, Any]] = []
+    min_ts: int | None = None
+
+    for event in events:
+        ts = timestamp_ms(event["timestamp"])
+        min_ts = ts if min_ts is None else min(min_ts, ts)
+
+        if not is_raw_telemetry(event):
+            extras.append(event)
+            continue
+
+        series.setdefault(
+            (event["equipment_id"], event["type"]), []
+        ).append((ts, float(event["value"])))
+
+    blobs: list[bytes] = []
+    series_header: list[list[Any]] = []
+
+    for (equipment_id, sensor_type), points in series.items():
+        points.sort(key=lambda point: point[0])
+        blob = encode_series(points)
+        blobs.append(blob)
+        series_header.append(
+            [equipment_id, sensor_type, len(points), len(blob)]
+        )
+
+    extras_blob = json_bytes(extras) if extras else b""
+    header = json_bytes(
+        {
+            "count": sum(len(p) for p in series.values()) + len(extras),
+            "min_ts": min_ts,
+            "series": series_header,
+            "extras": len(extras_blob),
+        }
+    )
+
+    return b"".join(
+        (
+            BLOCK_MAGIC,
+            struct.pack(">BI", BLOCK_VERSION, len(header)),
+            header,
+            *blobs,
+            extras_blob,
+        )
+    )
+
+
+def read_block_header(data: bytes) -> tuple[dict[str, Any], int]:
+    """Retorna (cabeçalho, offset do primeiro blob) de um bloco."""
+    if data[:4] != BLOCK_MAGIC:
+        raise ValueError("Bloco de telemetria inválido")
+
+    version, header_len = struct.unpack_from(">BI", data, 4)
+    if version != BLOCK_VERSION:
+        raise ValueError(f"Versão de bloco não suportada: {version}")
+
+    start = 4 + struct.calcsize(">BI")
+    header = json_loads(data[start:start + header_len])
+    return header, start + header_len
+
+
+def decode_block(data: bytes) -> Iterator[dict[str, Any]]:
+    """
+    Decodifica um bloco sob demanda, em ordem cronológica.
+
+    As séries são intercaladas por timestamp (heapq.merge), sem
+    materializar o bloco inteiro.
+    """
+    header, offset = read_block_header(data)
+    streams: list[Iterator[tuple[int, int, dict[str, Any] | None]]] = []
+
+    def _series_stream(equipment_id, sensor_type, count, blob):
+        for ts, value in decode_series(blob, count):
+            yield ts, 0, {
+                "equipment_id": equipment_id,
+                "type": sensor_type,
+                "value": value,
+                "timestamp": ms_timestamp(ts),
+            }
+
+    for equipment_id, sensor_type, count, size in header["series"]:
+        blob = data[offset:offset + size]
+        offset += size
+        streams.append(_series_stream(equipment_id, sensor_type, count, blob))
+
+    if header["extras"]:
+        extras = json_loads(data[offset:offset + header["extras"]])
+        streams.append(
+            (timestamp_ms(event["timestamp"]), 1, event)
+            for event in extras
+        )
+
+    for _ts, _order, event in heapq.merge(
+        *streams, key=lambda item: (item[0], item[1])
+    ):
+        yield event
@@ -0,0 +1,201 @@
+"""
+Group commit do backlog em disco.
+
+Responsabilidades:
+- Acumular em memória os eventos coletados de todos os equipamentos
+- Gravar os pendentes como um único registro (um fsync por grupo)
+- Disparar o commit por tempo (janela de durabilidade) ou por volume
+- Aplicar o orçamento de disco após cada commit e avisar
+  (`on_commit`) quem mostra o estado do backlog
+
+Um evento coletado fica, no máximo, `interval` segundos só em memória.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .backlog import SegmentBacklog
+from .const import DEFAULT_COMMIT_BYTES, DEFAULT_DURABILITY_WINDOW
+from .retention import RetentionManager
+from .sqlite_backlog import SqliteBacklog
+
+_LOGGER = logging.getLogger(__name__)
+
+# Tamanho médio de um evento serializado em JSON (estimativa barata)
+_EVENT_BYTES_ESTIMATE = 96
+
+
+class GroupCommitWriter:
+    """
+    Escritor do backlog com commit em grupo.
+
+    `pending` é a fila em memória: eventos ainda não duráveis. Podem ser
+    enviados direto para a API (`take` / `restore`) ou gravados no
+    backlog (`async_commit`).
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        backlog: SegmentBacklog | SqliteBacklog,
+        *,
+        interval: float = DEFAULT_DURABILITY_WINDOW,
+        max_bytes: int = DEFAULT_COMMIT_BYTES,
+        on_commit_failed: Callable[[], Awaitable[None]] | None = None,
+        on_commit: Callable[[], None] | None = None,
+        retention: RetentionManager | None = None,
+    ) -> None:
+        self.hass = hass
+        self.backlog = backlog
+        self.retention = retention
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._on_commit_failed = on_commit_failed
+        self._on_commit = on_commit
+
+        self.pending: list[dict[str, Any]] = []
+        self.lock = asyncio.Lock()
+
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._commit_scheduled = False
+        self._disk_failed = False
+
+    # =========================================================
+    # FILA EM MEMÓRIA
+    # =========================================================
+
+    @callback
+    def add(self, event: dict[str, Any]) -> None:
+        """Enfileira um evento e agenda o commit do grupo."""
+        self.pending.append(event)
+        self._schedule()
+
+    @callback
+    def take(self) -> list[dict[str, Any]]:
+        """Retira todos os eventos pendentes (ex.: para envio direto)."""
+        events = list(self.pending)
+        self.pending.clear()
+        self._cancel_timer()
+        return events
+
+    @callback
+    def restore(self, events: list[dict[str, Any]]) -> None:
+        """Devolve eventos ao início da fila, mantendo a ordem."""
+        if not events:
+            return
+
+        self.pending[:0] = events
+        self._schedule()
+
+    # =========================================================
+    # COMMIT
+    # =========================================================
+
+    async def async_commit(self) -> bool:
+        """
+        Grava os pendentes como um único registro do backlog.
+
+        Retorna False se o disco falhar; nesse caso os eventos continuam
+        em memória e `on_commit_failed` é chamado. Gravado o grupo (e
+        aplicada a retenção), `on_commit` é chamado.
+
+        Se a task for cancelada, a gravação segue no executor; caso ela
+        não aconteça, os eventos voltam para a fila.
+        """
+        async with self.lock:
+            self._commit_scheduled = False
+
+            if not self.pending:
+                self._cancel_timer()
+                return True
+
+            events = self.take()
+            job = asyncio.ensure_future(
+                self.hass.async_add_executor_job(self._append, events)
+            )
+
+            try:
+                await asyncio.shield(job)
+            except asyncio.CancelledError:
+                job.add_done_callback(partial(self._restore_if_failed, events))
+                raise
+            except OSError as err:
+                _LOGGER.error("Erro ao gravar backlog em disco: %s", err)
+                # Nova tentativa só na próxima janela, mesmo acima do volume
+                self._disk_failed = True
+                self.restore(events)
+                committed = False
+            else:
+                self._disk_failed = False
+                committed = True
+
+        if committed and self._on_commit is not None:
+            self._on_commit()
+        if not committed and self._on_commit_failed is not None:
+            await self._on_commit_failed()
+
+        return committed
+
+    @callback
+    def _restore_if_failed(
+        self, events: list[dict[str, Any]], job: asyncio.Future
+    ) -> None:
+        if job.cancelled() or job.exception() is not None:
+            self.restore(events)
+
+    def _append(self, events: list[dict[str, Any]]) -> None:
+        """Grava o grupo e aplica watermark e retenção (executor)."""
+        self.backlog.append(events)
+
+        if self.retention is not None:
+            self.retention.compact_to_watermark()
+            self.retention.enforce()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancela o commit agendado (ex.: ao descarregar a entry)."""
+        self._cancel_timer()
+
+    # =========================================================
+    # AGENDAMENTO
+    # =========================================================
+
+    @callback
+    def _schedule(self) -> None:
+        if not self._disk_failed and self.pending_bytes >= self.max_bytes:
+            if not self._commit_scheduled:
+                self._commit_scheduled = True
+                self._cancel_timer()
+                self.hass.async_create_task(self.async_commit())
+            return
+
+        if self._unsub_timer is None and not self._commit_scheduled:
+            self._unsub_timer = async_call_later(
+                self.hass, self.interval, self._handle_timer
+            )
+
+    @callback
+    def _handle_timer(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        self._commit_scheduled = True
+        self.hass.async_create_task(self.async_commit())
+
+    @callback
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @property
+    def pending_bytes(self) -> int:
+        """Volume estimado dos eventos pendentes."""
+        return len(self.pending) * _EVENT_BYTES_ESTIMATE
@@ -2,15 +2,18 @@ from __future__ import annotations
 
 from homeassistant.components.number import NumberEntity
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    COLLECT_INTERVAL_RANGE,
     DOMAIN,
-    MANUFACTURER,
-    MODEL_VIRTUAL,
+    DOOR_OPEN_TIMEOUT_RANGE,
 )
 from .storage import EasySmartMonitorStorage
 from .coordinator import EasySmartMonitorCoordinator
+from .entity import (
+    EasySmartMonitorEquipmentEntity,
+    async_setup_equipment_entities,
+)
 
 
 # ============================================================
@@ -23,35 +26,25 @@ async def async_setup_entry(hass, entry, async_add_entities):
     ]
     storage: EasySmartMonitorStorage = coordinator.storage
 
-    entities: list[NumberEntity] = []
-
-    for equipment_id, equipment in storage.get_equipments().items():
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, equipment_id)},
-            name=equipment["name"],
-            manufacturer=MANUFACTURER,
-            model=MODEL_VIRTUAL,
-            suggested_area=equipment.get("location"),
-        )
-
-        entities.extend(
-            [
-                EasySmartMonitorCollectIntervalNumber(
-                    coordinator,
-                    storage,
-                    equipment_id,
-                    device_info,
-                ),
-                EasySmartMonitorDoorTimeoutNumber(
-                    coordinator,
-                    storage,
-                    equipment_id,
-                    device_info,
-                ),
-            ]
-        )
-
-    async_add_entities(entities)
+    def _equipment_entities(equipment_id, equipment, device_info):
+        return [
+            EasySmartMonitorCollectIntervalNumber(
+                coordinator,
+                storage,
+                equipment_id,
+                device_info,
+            ),
+            EasySmartMonitorDoorTimeoutNumber(
+                coordinator,
+                storage,
+                equipment_id,
+                device_info,
+            ),
+        ]
+
+    async_setup_equipment_entities(
+        coordinator, entry, async_add_entities, _equipment_entities
+    )
 
 
 # ============================================================
@@ -59,14 +52,12 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # ============================================================
 
 class EasySmartMonitorCollectIntervalNumber(
-    CoordinatorEntity, NumberEntity
+    EasySmartMonitorEquipmentEntity, NumberEntity
 ):
     """Intervalo de coleta do equipamento (segundos)."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:timer-outline"
-    _attr_native_min_value = 10
-    _attr_native_max_value = 3600
+    _attr_native_min_value, _attr_native_max_value = COLLECT_INTERVAL_RANGE
     _attr_native_step = 10
     _attr_native_unit_of_measurement = "s"
 
@@ -77,13 +68,11 @@ class EasySmartMonitorCollectIntervalNumber(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, equipment_id, device_info)
         self.storage = storage
-        self.equipment_id = equipment_id
 
         self._attr_name = "Intervalo de Coleta"
         self._attr_unique_id = f"{equipment_id}_collect_interval"
-        self._attr_device_info = device_info
 
     @property
     def native_value(self):
@@ -94,7 +83,7 @@ class EasySmartMonitorCollectIntervalNumber(
         await self.storage.set_collect_interval(
             self.equipment_id, int(value)
         )
-        self.coordinator.async_set_updated_data({})
+        self.coordinator.async_update_equipment(self.equipment_id)
 
 
 # ============================================================
@@ -102,14 +91,14 @@ class EasySmartMonitorCollectIntervalNumber(
 # ============================================================
 
 class EasySmartMonitorDoorTimeoutNumber(
-    CoordinatorEntity, NumberEntity
+    EasySmartMonitorEquipmentEntity, NumberEntity
 ):
     """Tempo máximo de porta aberta (segundos)."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:door-open"
-    _attr_native_min_value = 10
-    _attr_native_max_value = 900
+    _attr_native_min_value, _attr_native_max_value = (
+        DOOR_OPEN_TIMEOUT_RANGE
+    )
     _attr_native_step = 10
     _attr_native_unit_of_measurement = "s"
 
@@ -120,13 +109,11 @@ class EasySmartMonitorDoorTimeoutNumber(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, equipment_id, device_info)
         self.storage = storage
-        self.equipment_id = equipment_id
 
         self._attr_name = "Tempo Porta Aberta"
         self._attr_unique_id = f"{equipment_id}_door_timeout"
-        self._attr_device_info = device_info
 
     @property
     def native_value(self):
@@ -138,4 +125,4 @@ class EasySmartMonitorDoorTimeoutNumber(
             self.equipment_id,
             open_timeout=int(value),
         )
-        self.coordinator.async_set_updated_data({})
\ No newline at end of file
+        self.coordinator.async_update_equipment(self.equipment_id)
\ No newline at end of file
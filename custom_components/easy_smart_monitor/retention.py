@@ -0,0 +1,182 @@
+"""
+Retenção do backlog em disco.
+
+Responsabilidades:
+- Manter o backlog de cada config entry dentro do orçamento de disco
+- Compactar os segmentos mais antigos quando a fila durável passa do
+  watermark (API fora do ar)
+- Compactar primeiro a telemetria dos segmentos mais antigos
+- Descartar telemetria antes de alarmes
+- Contabilizar os bytes liberados
+
+Todos os métodos fazem I/O bloqueante e devem rodar no executor.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from .aggregation import compact_events, is_compactable
+from .backlog import SegmentBacklog
+from .const import (
+    COMPACTION_WINDOWS,
+    DEFAULT_DISK_BUDGET_MB,
+    DEFAULT_QUEUE_WATERMARK,
+    RETENTION_COMPACTION_WINDOW,
+)
+from .sqlite_backlog import SqliteBacklog
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RetentionManager:
+    """
+    Aplica o orçamento de disco ao backlog, do segmento mais antigo ao
+    mais novo, em etapas cada vez mais destrutivas:
+
+    0. Descarta o histórico local de eventos já enviados (SQLite)
+    1. Compacta a telemetria em agregados de `window` segundos
+    2. Descarta a telemetria, mantendo os alarmes
+    3. Descarta segmentos inteiros (alarmes inclusive)
+
+    Independente do disco, `compact_to_watermark` mantém o número de
+    eventos pendentes perto de `watermark`, compactando os segmentos
+    mais antigos em janelas progressivamente maiores (`windows`).
+    """
+
+    def __init__(
+        self,
+        backlog: SegmentBacklog | SqliteBacklog,
+        *,
+        budget_bytes: int = DEFAULT_DISK_BUDGET_MB * 1024 * 1024,
+        window: int = RETENTION_COMPACTION_WINDOW,
+        watermark: int = DEFAULT_QUEUE_WATERMARK,
+        windows: tuple[int, ...] = COMPACTION_WINDOWS,
+    ) -> None:
+        self.backlog = backlog
+        self.budget_bytes = budget_bytes
+        self.window = window
+        self.watermark = watermark
+        self.windows = windows
+        self.evicted_bytes = 0
+        self._compacted: set[int] = set()
+        # Segmento → índice da última janela de `windows` aplicada
+        self._levels: dict[int, int] = {}
+
+    def over_budget(self) -> bool:
+        return self.backlog.size_bytes > self.budget_bytes
+
+    def over_watermark(self) -> bool:
+        return self.backlog.event_count > self.watermark
+
+    def compact_to_watermark(self) -> int:
+        """
+        Compacta os segmentos mais antigos enquanto a fila estiver acima
+        do watermark; retorna quantos eventos a fila perdeu.
+
+        Cada segmento é compactado uma vez por janela: com todos na
+        janela mais grossa, nada mais é feito até a fila ser enviada.
+        """
+        if not self.over_watermark():
+            return 0
+
+        before = self.backlog.event_count
+
+        try:
+            seqs = self.backlog.sealed_segments()
+            self._levels = {
+                seq: level
+                for seq, level in self._levels.items()
+                if seq in seqs
+            }
+
+            for level, window in enumerate(self.windows):
+                for seq in seqs:
+                    if not self.over_watermark():
+                        break
+                    if self._levels.get(seq, -1) >= level:
+                        continue
+
+                    events = self.backlog.read_segment(seq)
+                    self.backlog.rewrite_segment(
+                        seq, compact_events(events, window)
+                    )
+                    self._levels[seq] = level
+
+                if not self.over_watermark():
+                    break
+        except OSError as err:
+            _LOGGER.error("Erro ao compactar backlog: %s", err)
+
+        reduced = before - self.backlog.event_count
+        if reduced:
+            _LOGGER.warning(
+                "Backlog compactado de %s para %s eventos",
+                before,
+                self.backlog.event_count,
+            )
+        return reduced
+
+    def enforce(self) -> int:
+        """Aplica o orçamento; retorna os bytes liberados."""
+        if not self.over_budget():
+            return 0
+
+        before = self.backlog.size_bytes
+        dropped_events = 0
+
+        try:
+            self.backlog.discard_history()
+
+            for step in (self._compact, self._drop_telemetry, self._drop_all):
+                for seq in self.backlog.sealed_segments():
+                    if not self.over_budget():
+                        break
+                    dropped_events += step(seq)
+
+                if not self.over_budget():
+                    break
+        except OSError as err:
+            _LOGGER.error("Erro ao aplicar retenção do backlog: %s", err)
+
+        freed = max(before - self.backlog.size_bytes, 0)
+        self.evicted_bytes += freed
+
+        _LOGGER.warning(
+            "Backlog acima do orçamento de disco (%s bytes): %s bytes "
+            "liberados, %s eventos descartados",
+            self.budget_bytes,
+            freed,
+            dropped_events,
+        )
+        return freed
+
+    # =========================================================
+    # ETAPAS (retornam eventos descartados)
+    # =========================================================
+
+    def _compact(self, seq: int) -> int:
+        if seq in self._compacted:
+            return 0
+
+        events = self.backlog.read_segment(seq)
+        self.backlog.rewrite_segment(seq, compact_events(events, self.window))
+        self._compacted.add(seq)
+        return 0
+
+    def _drop_telemetry(self, seq: int) -> int:
+        events = self.backlog.read_segment(seq)
+        alarms = [event for event in events if not is_compactable(event)]
+
+        if len(alarms) < len(events):
+            self.backlog.rewrite_segment(seq, alarms)
+
+        return len(events) - len(alarms)
+
+    def _drop_all(self, seq: int) -> int:
+        count = sum(
+            info.count for info in self.backlog.records if info.seq == seq
+        )
+        self.backlog.drop_segment(seq)
+        self._compacted.discard(seq)
+        return count
@@ -0,0 +1,130 @@
+"""
+Agendamento da coleta por equipamento do Easy Smart Monitor.
+
+Responsabilidades:
+- Um timer por intervalo de coleta distinto (não um por equipamento):
+  equipamentos com o mesmo `collect_interval` são coletados juntos
+- Mover um equipamento de grupo quando o intervalo muda, sem mexer
+  nos timers dos demais
+- Pausar / retomar cancelando e recriando os timers
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+
+
+class CollectionScheduler:
+    """
+    Timers de coleta agrupados por intervalo.
+
+    `collect` recebe os equipment_id do grupo a cada disparo. Enquanto
+    parado, o agrupamento é mantido, mas nenhum timer existe.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        collect: Callable[[list[str]], Awaitable[None]],
+    ) -> None:
+        self.hass = hass
+        self._collect = collect
+
+        self._intervals: dict[str, int] = {}
+        # Intervalo → equipamentos (dict para manter a ordem)
+        self._groups: dict[int, dict[str, None]] = {}
+        self._timers: dict[int, CALLBACK_TYPE] = {}
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def timer_count(self) -> int:
+        """Timers ativos (um por intervalo distinto)."""
+        return len(self._timers)
+
+    def interval(self, equipment_id: str) -> int | None:
+        """Intervalo agendado do equipamento (None se não coleta)."""
+        return self._intervals.get(equipment_id)
+
+    # =========================================================
+    # EQUIPAMENTOS
+    # =========================================================
+
+    @callback
+    def async_set(self, equipment_id: str, interval: int | None) -> None:
+        """Agenda o equipamento no intervalo (None = não coletar)."""
+        current = self._intervals.get(equipment_id)
+        if current == interval:
+            return
+
+        if current is not None:
+            del self._intervals[equipment_id]
+            group = self._groups[current]
+            del group[equipment_id]
+            if not group:
+                del self._groups[current]
+                self._cancel(current)
+
+        if interval is None:
+            return
+
+        self._intervals[equipment_id] = interval
+        self._groups.setdefault(interval, {})[equipment_id] = None
+        if self._running and interval not in self._timers:
+            self._schedule(interval)
+
+    @callback
+    def async_remove(self, equipment_id: str) -> None:
+        self.async_set(equipment_id, None)
+
+    # =========================================================
+    # PAUSA / RETOMADA
+    # =========================================================
+
+    @callback
+    def async_start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        for interval in self._groups:
+            self._schedule(interval)
+
+    @callback
+    def async_stop(self) -> None:
+        self._running = False
+        for unsub in self._timers.values():
+            unsub()
+        self._timers.clear()
+
+    # =========================================================
+    # TIMERS
+    # =========================================================
+
+    @callback
+    def _schedule(self, interval: int) -> None:
+        async def _async_tick(_now: datetime) -> None:
+            group = self._groups.get(interval)
+            if group:
+                await self._collect(list(group))
+
+        self._timers[interval] = async_track_time_interval(
+            self.hass,
+            _async_tick,
+            timedelta(seconds=interval),
+            name=f"{DOMAIN} coleta {interval}s",
+        )
+
+    @callback
+    def _cancel(self, interval: int) -> None:
+        unsub = self._timers.pop(interval, None)
+        if unsub is not None:
+            unsub()
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 from homeassistant.components.select import SelectEntity
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 
 from .const import (
+    ATTR_INCOMPATIBLE_SOURCE,
     DOMAIN,
-    MANUFACTURER,
-    MODEL_VIRTUAL,
+    SOURCE_OPTION_NONE,
 )
 from .storage import EasySmartMonitorStorage
 from .coordinator import EasySmartMonitorCoordinator
+from .entity import (
+    EasySmartMonitorEquipmentEntity,
+    async_setup_equipment_entities,
+)
+from .entity_index import EntityOptionIndex, async_get_entity_index
 
 
 # ============================================================
@@ -21,35 +25,19 @@ from .coordinator import EasySmartMonitorCoordinator
 SENSOR_TYPES = {
     "temperature": {
         "name": "Sensor de Temperatura",
-        "domain": "sensor",
     },
     "humidity": {
         "name": "Sensor de Umidade",
-        "domain": "sensor",
     },
     "energy": {
         "name": "Sensor de Energia",
-        "domain": "sensor",
     },
     "door": {
         "name": "Sensor de Porta",
-        "domain": "binary_sensor",
     },
 }
 
 
-def _get_entity_options(hass, domain: str) -> list[str]:
-    """Lista entidades disponíveis de um domínio."""
-    registry = async_get_entity_registry(hass)
-    entities = [
-        e.entity_id
-        for e in registry.entities.values()
-        if e.entity_id.startswith(f"{domain}.") and not e.disabled
-    ]
-    entities.sort()
-    return ["Nenhum"] + entities
-
-
 # ============================================================
 # SETUP DA PLATAFORMA
 # ============================================================
@@ -59,32 +47,25 @@ async def async_setup_entry(hass, entry, async_add_entities):
         entry.entry_id
     ]
     storage: EasySmartMonitorStorage = coordinator.storage
-
-    entities: list[SelectEntity] = []
-
-    for equipment_id, equipment in storage.get_equipments().items():
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, equipment_id)},
-            name=equipment["name"],
-            manufacturer=MANUFACTURER,
-            model=MODEL_VIRTUAL,
-            suggested_area=equipment.get("location"),
-        )
-
-        for sensor_type, cfg in SENSOR_TYPES.items():
-            entities.append(
-                EasySmartMonitorSensorSourceSelect(
-                    coordinator,
-                    storage,
-                    equipment_id,
-                    sensor_type,
-                    cfg["name"],
-                    cfg["domain"],
-                    device_info,
-                )
+    index = async_get_entity_index(hass)
+
+    def _equipment_entities(equipment_id, equipment, device_info):
+        return [
+            EasySmartMonitorSensorSourceSelect(
+                coordinator,
+                storage,
+                equipment_id,
+                sensor_type,
+                cfg["name"],
+                device_info,
+                index,
             )
+            for sensor_type, cfg in SENSOR_TYPES.items()
+        ]
 
-    async_add_entities(entities)
+    async_setup_equipment_entities(
+        coordinator, entry, async_add_entities, _equipment_entities
+    )
 
 
 # ============================================================
@@ -92,11 +73,10 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # ============================================================
 
 class EasySmartMonitorSensorSourceSelect(
-    CoordinatorEntity, SelectEntity
+    EasySmartMonitorEquipmentEntity, SelectEntity
 ):
     """Seleciona a entidade HA usada como fonte de sensor."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:tune"
 
     def __init__(
@@ -106,42 +86,66 @@ class EasySmartMonitorSensorSourceSelect(
         equipment_id: str,
         sensor_type: str,
         name: str,
-        domain: str,
         device_info: DeviceInfo,
+        index: EntityOptionIndex,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, equipment_id, device_info)
         self.storage = storage
         self.hass = coordinator.hass
-        self.equipment_id = equipment_id
         self.sensor_type = sensor_type
-        self.domain = domain
 
         self._attr_name = name
         self._attr_unique_id = (
             f"{equipment_id}_{sensor_type}_source"
         )
-        self._attr_device_info = device_info
+        self._index = index
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # Entidade compatível criada / removida: reescreve as opções
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._index.options_signal(self.sensor_type),
+                self.async_write_ha_state,
+            )
+        )
+
+    def _source(self) -> str | None:
+        return self.storage.get_sensor_source(
+            self.equipment_id, self.sensor_type
+        )
 
-        self._options = _get_entity_options(
-            coordinator.hass, domain
+    def _is_incompatible(self, source: str | None) -> bool:
+        return source is not None and not self._index.accepts(
+            self.sensor_type, source
         )
 
     @property
     def options(self) -> list[str]:
-        return self._options
+        options = self._index.options(self.sensor_type)
+        source = self._source()
+        if self._is_incompatible(source):
+            # Associação anterior à validação (ou entidade desabilitada /
+            # removida): continua visível, marcada, até ser trocada
+            return [*options, source]
+        return options
 
     @property
     def current_option(self) -> str:
-        entity_id = self.storage.get_sensor_source(
-            self.equipment_id, self.sensor_type
-        )
-        return entity_id or "Nenhum"
+        return self._source() or SOURCE_OPTION_NONE
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            ATTR_INCOMPATIBLE_SOURCE: self._is_incompatible(self._source())
+        }
 
     async def async_select_option(self, option: str) -> None:
-        value = None if option == "Nenhum" else option
+        value = None if option == SOURCE_OPTION_NONE else option
         await self.storage.set_sensor_source(
             self.equipment_id,
             self.sensor_type,
             value,
         )
-        self.coordinator.async_set_updated_data({})
\ No newline at end of file
+        self.coordinator.async_update_equipment(self.equipment_id)
\ No newline at end of file
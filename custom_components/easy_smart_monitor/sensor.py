@@ -3,12 +3,25 @@ from __future__ import annotations
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
+    SensorStateClass,
 )
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, MANUFACTURER, MODEL_VIRTUAL
+from .const import (
+    DOMAIN,
+    SENSOR_TYPE_ENERGY,
+    SENSOR_TYPE_HUMIDITY,
+    SENSOR_TYPE_TEMPERATURE,
+)
 from .coordinator import EasySmartMonitorCoordinator
+from .entity import (
+    EasySmartMonitorSourceEntity,
+    async_setup_equipment_entities,
+)
 
 
 # ============================================================
@@ -20,45 +33,34 @@ async def async_setup_entry(hass, entry, async_add_entities):
         entry.entry_id
     ]
 
-    entities: list[SensorEntity] = []
-
-    # ----------------------------
-    # SENSOR GLOBAL — STATUS
-    # ----------------------------
-    entities.append(
-        EasySmartMonitorIntegrationStatusSensor(coordinator)
+    def _equipment_entities(equipment_id, equipment, device_info):
+        return [
+            EasySmartMonitorTemperatureSensor(
+                coordinator, equipment_id, device_info
+            ),
+            EasySmartMonitorHumiditySensor(
+                coordinator, equipment_id, device_info
+            ),
+            EasySmartMonitorEnergySensor(
+                coordinator, equipment_id, device_info
+            ),
+        ]
+
+    async_setup_equipment_entities(
+        coordinator,
+        entry,
+        async_add_entities,
+        _equipment_entities,
+        [
+            # Status da integração
+            EasySmartMonitorIntegrationStatusSensor(coordinator),
+            # Backlog em disco
+            EasySmartMonitorBacklogDiskUsageSensor(coordinator),
+            EasySmartMonitorOldestBufferedEventSensor(coordinator),
+            EasySmartMonitorBacklogEvictedSensor(coordinator),
+        ],
     )
 
-    # ----------------------------
-    # SENSORES POR EQUIPAMENTO
-    # ----------------------------
-    for equipment_id, equipment in (
-        coordinator.storage.get_equipments().items()
-    ):
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, equipment_id)},
-            name=equipment["name"],
-            manufacturer=MANUFACTURER,
-            model=MODEL_VIRTUAL,
-            suggested_area=equipment.get("location"),
-        )
-
-        entities.extend(
-            [
-                EasySmartMonitorTemperatureSensor(
-                    coordinator, equipment_id, device_info
-                ),
-                EasySmartMonitorHumiditySensor(
-                    coordinator, equipment_id, device_info
-                ),
-                EasySmartMonitorEnergySensor(
-                    coordinator, equipment_id, device_info
-                ),
-            ]
-        )
-
-    async_add_entities(entities)
-
 
 # ============================================================
 # SENSOR GLOBAL — STATUS DA INTEGRAÇÃO
@@ -91,16 +93,109 @@ class EasySmartMonitorIntegrationStatusSensor(
         }
 
 
+# ============================================================
+# SENSORES GLOBAIS — BACKLOG EM DISCO
+# ============================================================
+
+class EasySmartMonitorBacklogSensor(CoordinatorEntity, SensorEntity):
+    """
+    Base dos sensores do backlog: além do ciclo do coordinator, reescreve
+    o estado a cada commit, retenção e confirmação de envio.
+    """
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self.coordinator.backlog_signal,
+                self.async_write_ha_state,
+            )
+        )
+
+
+class EasySmartMonitorBacklogDiskUsageSensor(EasySmartMonitorBacklogSensor):
+    """Espaço em disco ocupado pelos eventos não enviados."""
+
+    _attr_name = "Backlog em disco"
+    _attr_icon = "mdi:harddisk"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_suggested_unit_of_measurement = UnitOfInformation.MEBIBYTES
+
+    def __init__(self, coordinator: EasySmartMonitorCoordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = (
+            f"{DOMAIN}_{coordinator.entry.entry_id}_backlog_disk_usage"
+        )
+
+    @property
+    def native_value(self):
+        return self.coordinator.backlog_size_bytes
+
+    @property
+    def extra_state_attributes(self):
+        return {"budget_bytes": self.coordinator.disk_budget_bytes}
+
+
+class EasySmartMonitorOldestBufferedEventSensor(
+    EasySmartMonitorBacklogSensor
+):
+    """Idade do evento mais antigo ainda não enviado."""
+
+    _attr_name = "Evento mais antigo no buffer"
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    def __init__(self, coordinator: EasySmartMonitorCoordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = (
+            f"{DOMAIN}_{coordinator.entry.entry_id}_oldest_buffered_event"
+        )
+
+    @property
+    def native_value(self):
+        oldest = self.coordinator.oldest_buffered_event
+        if oldest is None:
+            return 0
+        return max(int((dt_util.utcnow() - oldest).total_seconds()), 0)
+
+
+class EasySmartMonitorBacklogEvictedSensor(EasySmartMonitorBacklogSensor):
+    """Bytes liberados pela retenção (compactação e descarte)."""
+
+    _attr_name = "Backlog descartado"
+    _attr_icon = "mdi:delete-sweep"
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+
+    def __init__(self, coordinator: EasySmartMonitorCoordinator):
+        super().__init__(coordinator)
+        self._attr_unique_id = (
+            f"{DOMAIN}_{coordinator.entry.entry_id}_backlog_evicted"
+        )
+
+    @property
+    def native_value(self):
+        return self.coordinator.evicted_bytes
+
+
 # ============================================================
 # SENSOR — TEMPERATURA
 # ============================================================
 
 class EasySmartMonitorTemperatureSensor(
-    CoordinatorEntity, SensorEntity
+    EasySmartMonitorSourceEntity, SensorEntity
 ):
     """Temperatura do equipamento."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_native_unit_of_measurement = "°C"
 
@@ -110,28 +205,15 @@ class EasySmartMonitorTemperatureSensor(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
-        self.equipment_id = equipment_id
+        super().__init__(
+            coordinator, equipment_id, device_info, SENSOR_TYPE_TEMPERATURE
+        )
         self._attr_name = "Temperatura"
         self._attr_unique_id = f"{equipment_id}_temperature"
-        self._attr_device_info = device_info
 
     @property
     def native_value(self):
-        source = self.coordinator.storage.get_sensor_source(
-            self.equipment_id, "temperature"
-        )
-        if not source:
-            return None
-
-        state = self.coordinator.hass.states.get(source)
-        if not state or state.state in ("unknown", "unavailable"):
-            return None
-
-        try:
-            return float(state.state)
-        except ValueError:
-            return None
+        return self.source_value
 
 
 # ============================================================
@@ -139,11 +221,10 @@ class EasySmartMonitorTemperatureSensor(
 # ============================================================
 
 class EasySmartMonitorHumiditySensor(
-    CoordinatorEntity, SensorEntity
+    EasySmartMonitorSourceEntity, SensorEntity
 ):
     """Umidade do equipamento."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SensorDeviceClass.HUMIDITY
     _attr_native_unit_of_measurement = "%"
 
@@ -153,28 +234,15 @@ class EasySmartMonitorHumiditySensor(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
-        self.equipment_id = equipment_id
+        super().__init__(
+            coordinator, equipment_id, device_info, SENSOR_TYPE_HUMIDITY
+        )
         self._attr_name = "Umidade"
         self._attr_unique_id = f"{equipment_id}_humidity"
-        self._attr_device_info = device_info
 
     @property
     def native_value(self):
-        source = self.coordinator.storage.get_sensor_source(
-            self.equipment_id, "humidity"
-        )
-        if not source:
-            return None
-
-        state = self.coordinator.hass.states.get(source)
-        if not state or state.state in ("unknown", "unavailable"):
-            return None
-
-        try:
-            return float(state.state)
-        except ValueError:
-            return None
+        return self.source_value
 
 
 # ============================================================
@@ -182,11 +250,10 @@ class EasySmartMonitorHumiditySensor(
 # ============================================================
 
 class EasySmartMonitorEnergySensor(
-    CoordinatorEntity, SensorEntity
+    EasySmartMonitorSourceEntity, SensorEntity
 ):
     """Energia do equipamento."""
 
-    _attr_has_entity_name = True
     _attr_device_class = SensorDeviceClass.ENERGY
 
     def __init__(
@@ -195,25 +262,12 @@ class EasySmartMonitorEnergySensor(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
-        self.equipment_id = equipment_id
+        super().__init__(
+            coordinator, equipment_id, device_info, SENSOR_TYPE_ENERGY
+        )
         self._attr_name = "Energia"
         self._attr_unique_id = f"{equipment_id}_energy"
-        self._attr_device_info = device_info
 
     @property
     def native_value(self):
-        source = self.coordinator.storage.get_sensor_source(
-            self.equipment_id, "energy"
-        )
-        if not source:
-            return None
-
-        state = self.coordinator.hass.states.get(source)
-        if not state or state.state in ("unknown", "unavailable"):
-            return None
-
-        try:
-            return float(state.state)
-        except ValueError:
-            return None
\ No newline at end of file
+        return self.source_value
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Serviços do Easy Smart Monitor.
+
+Responsabilidades:
+- `bulk_update`: alterações de configuração de vários equipamentos em
+  uma transação (validação completa, uma gravação, uma atualização por
+  equipamento afetado)
+- `import_equipments` / `export_equipments`: frota de equipamentos e
+  associações de sensores em JSON ou CSV (arquivo ou texto), com
+  relatório de validação
+- `query_history`: eventos recentes de um equipamento lidos do
+  histórico local (backend SQLite), só como resposta
+"""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import DOMAIN, SOURCE_ENTITY_FILTERS
+from .coordinator import EasySmartMonitorCoordinator
+from .fleet import (
+    FLEET_FORMAT_JSON,
+    FLEET_FORMATS,
+    dump_equipments,
+    iter_import_records,
+)
+
+SERVICE_BULK_UPDATE = "bulk_update"
+SERVICE_IMPORT_EQUIPMENTS = "import_equipments"
+SERVICE_EXPORT_EQUIPMENTS = "export_equipments"
+SERVICE_QUERY_HISTORY = "query_history"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_CHANGES = "changes"
+ATTR_FORMAT = "format"
+ATTR_PATH = "path"
+ATTR_DATA = "data"
+ATTR_REPLACE = "replace"
+ATTR_DRY_RUN = "dry_run"
+ATTR_EQUIPMENT_ID = "equipment_id"
+ATTR_DAYS = "days"
+ATTR_SENSOR_TYPE = "sensor_type"
+
+# Só tipos / conversões; regras (limites, alvos) ficam no storage
+CHANGE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("equipment_ids"): vol.All(
+            cv.ensure_list, [cv.string]
+        ),
+        vol.Optional("location"): cv.string,
+        vol.Optional("enabled"): cv.boolean,
+        vol.Optional("collect_interval"): vol.Coerce(int),
+        vol.Optional("enable_siren"): cv.boolean,
+        vol.Optional("open_timeout"): vol.Coerce(int),
+        vol.Optional("sensors"): {
+            cv.string: vol.Any(None, cv.string)
+        },
+        vol.Optional("filters"): {
+            cv.string: {
+                vol.Optional("deadband"): vol.Coerce(float),
+                vol.Optional("deadband_mode"): cv.string,
+                vol.Optional("heartbeat"): vol.Coerce(int),
+            }
+        },
+        vol.Optional("telemetry"): {
+            vol.Optional("mode"): cv.string,
+            vol.Optional("window"): vol.Coerce(int),
+        },
+    }
+)
+
+BULK_UPDATE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_CHANGES): vol.All(
+            cv.ensure_list, [CHANGE_SCHEMA]
+        ),
+    }
+)
+
+
+IMPORT_EQUIPMENTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_ENTRY_ID): cv.string,
+            vol.Optional(ATTR_FORMAT, default=FLEET_FORMAT_JSON): vol.In(
+                FLEET_FORMATS
+            ),
+            vol.Exclusive(ATTR_PATH, "source"): cv.string,
+            vol.Exclusive(ATTR_DATA, "source"): cv.string,
+            vol.Optional(ATTR_REPLACE, default=False): cv.boolean,
+            vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_PATH, ATTR_DATA),
+)
+
+EXPORT_EQUIPMENTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FORMAT, default=FLEET_FORMAT_JSON): vol.In(
+            FLEET_FORMATS
+        ),
+        vol.Optional(ATTR_PATH): cv.string,
+    }
+)
+
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Required(ATTR_EQUIPMENT_ID): cv.string,
+        vol.Optional(ATTR_DAYS, default=1): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+        vol.Optional(ATTR_SENSOR_TYPE): vol.In(
+            list(SOURCE_ENTITY_FILTERS)
+        ),
+    }
+)
+
+
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8-sig") as file:
+        return file.read()
+
+
+def _write_file(path: str, content: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+def _check_path(hass: HomeAssistant, path: str) -> None:
+    if not hass.config.is_allowed_path(path):
+        raise ServiceValidationError(
+            f"Caminho fora de allowlist_external_dirs: {path}"
+        )
+
+
+def _get_coordinator(
+    hass: HomeAssistant, call: ServiceCall
+) -> EasySmartMonitorCoordinator:
+    """Coordinator da entry alvo (opcional se houver só uma)."""
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_ENTRY_ID)
+
+    if entry_id is None and len(coordinators) == 1:
+        return next(iter(coordinators.values()))
+    if entry_id in coordinators:
+        return coordinators[entry_id]
+
+    raise ServiceValidationError(
+        f"Informe um entry_id válido ({', '.join(coordinators)})"
+    )
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Registra os serviços da integração (uma vez)."""
+    if hass.services.has_service(DOMAIN, SERVICE_BULK_UPDATE):
+        return
+
+    async def _async_bulk_update(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+
+        try:
+            updated = await coordinator.async_bulk_update(
+                call.data[ATTR_CHANGES]
+            )
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+
+        return {"updated": updated}
+
+    async def _async_import_equipments(
+        call: ServiceCall,
+    ) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+
+        text = call.data.get(ATTR_DATA)
+        if text is None:
+            _check_path(hass, call.data[ATTR_PATH])
+            try:
+                text = await hass.async_add_executor_job(
+                    _read_file, call.data[ATTR_PATH]
+                )
+            except OSError as err:
+                raise ServiceValidationError(
+                    f"Não foi possível ler o arquivo: {err}"
+                ) from err
+
+        try:
+            records = iter_import_records(text, call.data[ATTR_FORMAT])
+            return await coordinator.async_import_equipments(
+                records,
+                replace=call.data[ATTR_REPLACE],
+                dry_run=call.data[ATTR_DRY_RUN],
+            )
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+
+    async def _async_export_equipments(
+        call: ServiceCall,
+    ) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        records = coordinator.storage.export_equipments()
+        content = dump_equipments(records, call.data[ATTR_FORMAT])
+
+        path = call.data.get(ATTR_PATH)
+        if path is None:
+            return {"count": len(records), "data": content}
+
+        _check_path(hass, path)
+        await hass.async_add_executor_job(_write_file, path, content)
+        return {"count": len(records), "path": path}
+
+    async def _async_query_history(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call)
+        equipment_id = call.data[ATTR_EQUIPMENT_ID]
+
+        if coordinator.storage.get_equipment(equipment_id) is None:
+            raise ServiceValidationError(
+                f"Equipamento inexistente: {equipment_id}"
+            )
+
+        try:
+            events = await coordinator.async_query_history(
+                equipment_id,
+                days=call.data[ATTR_DAYS],
+                sensor_type=call.data.get(ATTR_SENSOR_TYPE),
+            )
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+
+        return {"events": events}
+
+    for service, handler, schema in (
+        (SERVICE_BULK_UPDATE, _async_bulk_update, BULK_UPDATE_SCHEMA),
+        (
+            SERVICE_IMPORT_EQUIPMENTS,
+            _async_import_equipments,
+            IMPORT_EQUIPMENTS_SCHEMA,
+        ),
+        (
+            SERVICE_EXPORT_EQUIPMENTS,
+            _async_export_equipments,
+            EXPORT_EQUIPMENTS_SCHEMA,
+        ),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            handler,
+            schema=schema,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    # Só consulta: sem resposta não há o que fazer
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
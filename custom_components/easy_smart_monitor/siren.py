@@ -1,28 +1,14 @@
 from __future__ import annotations
 
 from homeassistant.components.siren import SirenEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import (
-    DOMAIN,
-    MANUFACTURER,
-    MODEL_VIRTUAL,
-)
+from .const import DOMAIN
 from .coordinator import EasySmartMonitorCoordinator
-
-
-# ============================================================
-# HELPERS
-# ============================================================
-
-def _get_equipments(entry) -> list[dict]:
-    """Retorna equipamentos de options ou data."""
-    return (
-        entry.options.get("equipments")
-        or entry.data.get("equipments")
-        or []
-    )
+from .entity import (
+    EasySmartMonitorEquipmentEntity,
+    async_setup_equipment_entities,
+)
 
 
 # ============================================================
@@ -35,24 +21,16 @@ async def async_setup_entry(hass, entry, async_add_entities):
         entry.entry_id
     ]
 
-    entities: list[SirenEntity] = []
-
-    for equipment in _get_equipments(entry):
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, equipment["uuid"])},
-            name=equipment["name"],
-            manufacturer=MANUFACTURER,
-            model=MODEL_VIRTUAL,
-            suggested_area=equipment.get("location"),
-        )
-
-        entities.append(
+    def _equipment_entities(equipment_id, equipment, device_info):
+        return [
             EasySmartMonitorSiren(
-                coordinator, equipment, device_info
+                coordinator, equipment_id, equipment["uuid"], device_info
             )
-        )
+        ]
 
-    async_add_entities(entities)
+    async_setup_equipment_entities(
+        coordinator, entry, async_add_entities, _equipment_entities
+    )
 
 
 # ============================================================
@@ -60,43 +38,35 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # ============================================================
 
 class EasySmartMonitorSiren(
-    CoordinatorEntity, SirenEntity
+    EasySmartMonitorEquipmentEntity, SirenEntity
 ):
     """Sirene do equipamento monitorado."""
 
-    _attr_has_entity_name = True
     _attr_supported_features = 0
 
     def __init__(
         self,
         coordinator: EasySmartMonitorCoordinator,
-        equipment: dict,
+        equipment_id: str,
+        equipment_uuid: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
-        self.equipment = equipment
+        super().__init__(coordinator, equipment_id, device_info)
         self._attr_name = "Alarme"
-        self._attr_unique_id = f"{equipment['uuid']}_siren"
-        self._attr_device_info = device_info
+        self._attr_unique_id = f"{equipment_uuid}_siren"
 
     @property
-    def is_on(self):
-        return self.coordinator.siren_state.get(
-            self.equipment["id"], False
-        )
+    def is_on(self) -> bool:
+        snapshot = self.snapshot
+        return bool(snapshot and snapshot.alarm_active)
 
     async def async_turn_on(self, **kwargs):
-        await self.coordinator.async_trigger_siren(
-            self.equipment["id"]
-        )
+        await self.coordinator.async_trigger_siren(self.equipment_id)
 
     async def async_turn_off(self, **kwargs):
-        await self.coordinator.async_silence_siren(
-            self.equipment["id"]
-        )
+        await self.coordinator.async_silence_siren(self.equipment_id)
 
     @property
     def extra_state_attributes(self):
-        return self.coordinator.siren_attributes.get(
-            self.equipment["id"], {}
-        )
\ No newline at end of file
+        snapshot = self.snapshot
+        return snapshot.alarm_attributes if snapshot else {}
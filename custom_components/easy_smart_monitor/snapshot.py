@@ -0,0 +1,102 @@
+"""
+Snapshot do estado dos equipamentos do Easy Smart Monitor.
+
+Responsabilidades:
+- Guardar, por equipamento, as leituras já convertidas, o estado da
+  porta e o estado do alarme de um ciclo de processamento
+- Servir de `coordinator.data`: as entidades só indexam o snapshot,
+  sem consultar storage / `hass.states` nem converter valores
+
+Snapshots são imutáveis. Um equipamento que não mudou mantém o mesmo
+objeto entre ciclos, e as entidades comparam por identidade.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+
+from homeassistant.core import State
+
+from .const import ATTR_OPEN_SINCE, ATTR_REASON, ATTR_TRIGGERED_AT
+
+_EMPTY: Mapping = MappingProxyType({})
+
+
+def _empty() -> Mapping:
+    return _EMPTY
+
+
+ALARM_REASON_DOOR = "door_open"
+ALARM_REASON_MANUAL = "manual"
+
+
+@dataclass(frozen=True, slots=True)
+class EquipmentSnapshot:
+    """Estado de um equipamento em um ciclo de processamento."""
+
+    equipment_id: str
+    enabled: bool = True
+
+    # Leituras numéricas válidas (temperatura, umidade, energia)
+    values: Mapping[str, float] = field(default_factory=_empty)
+    # Momento em que cada fonte produziu a leitura
+    sampled_at: Mapping[str, datetime] = field(default_factory=_empty)
+
+    # None = sem sensor de porta ou fonte indisponível
+    door_open: bool | None = None
+    door_open_since: datetime | None = None
+
+    alarm_reason: str | None = None
+    alarm_triggered_at: datetime | None = None
+
+    @property
+    def alarm_active(self) -> bool:
+        return self.alarm_reason is not None
+
+    @property
+    def alarm_attributes(self) -> dict[str, str | None]:
+        """Atributos de estado da sirene."""
+        return {
+            ATTR_REASON: self.alarm_reason,
+            ATTR_TRIGGERED_AT: (
+                self.alarm_triggered_at.isoformat()
+                if self.alarm_triggered_at
+                else None
+            ),
+            ATTR_OPEN_SINCE: (
+                self.door_open_since.isoformat()
+                if self.door_open_since
+                else None
+            ),
+        }
+
+
+def numeric_reading(state: State | None) -> float | None:
+    """Valor numérico de uma fonte (None se indisponível ou inválido)."""
+    if not state or state.state in ("unknown", "unavailable"):
+        return None
+
+    try:
+        return float(state.state)
+    except ValueError:
+        return None
+
+
+def door_reading(state: State | None) -> bool | None:
+    """Porta aberta? (None sem estado da fonte)."""
+    if not state:
+        return None
+    return state.state == "on"
+
+
+def freeze(
+    values: dict[str, float], sampled_at: dict[str, datetime]
+) -> tuple[Mapping[str, float], Mapping[str, datetime]]:
+    """Versões somente leitura dos dicionários de leitura."""
+    return (
+        MappingProxyType(values) if values else _EMPTY,
+        MappingProxyType(sampled_at) if sampled_at else _EMPTY,
+    )
@@ -0,0 +1,461 @@
+"""
+Backlog em SQLite (modo WAL) do Easy Smart Monitor.
+
+Alternativa opcional ao backlog em segmentos (ver backlog.py), com a
+mesma interface usada pelo coordinator, pelo group commit e pela
+retenção.
+
+Responsabilidades:
+- Uma tabela de eventos indexada por (equipment_id, ts)
+- Inserção em lote, uma transação por grupo (group commit)
+- Leitura por faixa de rowid para o envio
+- Guardar os eventos enviados por alguns dias (contados a partir do
+  envio) para consultas locais
+
+Todos os métodos fazem I/O bloqueante e devem rodar no executor.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .const import DEFAULT_LOCAL_HISTORY_DAYS, SQLITE_BATCH_ROWS
+from .gorilla import is_raw_telemetry, ms_timestamp, timestamp_ms
+
+_LOGGER = logging.getLogger(__name__)
+
+DATABASE_FILE = "backlog.db"
+
+# Intervalo mínimo entre limpezas do histórico local (segundos)
+_PURGE_INTERVAL = 3600
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY,
+        equipment_id,
+        type TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        value REAL,
+        payload BLOB,
+        sent INTEGER NOT NULL DEFAULT 0,
+        sent_at INTEGER
+    )
+    """,
+)
+
+# Criados após a migração das colunas (ver `_migrate_schema`)
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS events_equipment_ts "
+    "ON events (equipment_id, ts)",
+    "CREATE INDEX IF NOT EXISTS events_pending ON events (sent, id)",
+    "CREATE INDEX IF NOT EXISTS events_sent_at ON events (sent_at)",
+)
+
+
+@dataclass
+class RowRange:
+    """
+    Grupo de eventos pendentes: rowids de `seq` até `last_id`.
+
+    `seq` identifica o grupo (equivale ao segmento do backlog em
+    arquivos).
+    """
+
+    seq: int
+    last_id: int
+    count: int
+    min_ts: int | None
+
+
+def _row(event: dict[str, Any]) -> tuple[Any, ...]:
+    """Leituras simples ficam só nas colunas; o resto, em JSON."""
+    raw = is_raw_telemetry(event)
+    return (
+        event.get("equipment_id"),
+        event.get("type", ""),
+        timestamp_ms(event["timestamp"]),
+        event["value"] if raw else None,
+        None if raw else json_bytes(event),
+    )
+
+
+def _event(row: tuple[Any, ...]) -> dict[str, Any]:
+    equipment_id, sensor_type, ts, value, payload = row
+
+    if payload is not None:
+        return json_loads(payload)
+
+    return {
+        "equipment_id": equipment_id,
+        "type": sensor_type,
+        "value": value,
+        "timestamp": ms_timestamp(ts),
+    }
+
+
+class SqliteBacklog:
+    """
+    Backlog em um banco SQLite por config entry, em modo WAL.
+
+    `clock` (relógio de parede, segundos) marca o envio e define o corte
+    do histórico local; `monotonic` espaça as limpezas. Ambos podem ser
+    injetados nos testes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        history_days: int = DEFAULT_LOCAL_HISTORY_DAYS,
+        batch_rows: int = SQLITE_BATCH_ROWS,
+        clock: Callable[[], float] = time.time,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, DATABASE_FILE)
+        self.history_days = history_days
+        self.batch_rows = batch_rows
+        self._clock = clock
+        self._monotonic = monotonic
+
+        self._conn: sqlite3.Connection | None = None
+        self._records: deque[RowRange] = deque()
+        self._size = 0
+        self._last_purge = 0.0
+        self._io_lock = threading.Lock()
+
+    # =========================================================
+    # LOAD / CONEXÃO
+    # =========================================================
+
+    def load(self) -> None:
+        """Abre (ou cria) o banco e indexa os eventos pendentes."""
+        with self._io_lock:
+            os.makedirs(self.directory, exist_ok=True)
+
+            if self._conn is None:
+                self._conn = sqlite3.connect(
+                    self.path, check_same_thread=False, isolation_level=None
+                )
+                self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+                self._migrate_schema()
+                for statement in _INDEXES:
+                    self._conn.execute(statement)
+                # Primeira limpeza só após um intervalo completo
+                self._last_purge = self._monotonic()
+
+            self._records.clear()
+            batch: list[tuple[int, int]] = []
+
+            for row in self._conn.execute(
+                "SELECT id, ts FROM events WHERE sent = 0 ORDER BY id"
+            ):
+                batch.append(row)
+                if len(batch) >= self.batch_rows:
+                    self._records.append(self._range(batch))
+                    batch = []
+
+            if batch:
+                self._records.append(self._range(batch))
+
+            self._update_size()
+
+            if self._records:
+                _LOGGER.info(
+                    "Backlog SQLite carregado: %s eventos pendentes",
+                    self.event_count,
+                )
+
+    def close(self) -> None:
+        """Fecha a conexão (checkpoint do WAL)."""
+        with self._io_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _range(rows: list[tuple[int, int]]) -> RowRange:
+        return RowRange(
+            rows[0][0], rows[-1][0], len(rows), min(ts for _id, ts in rows)
+        )
+
+    # =========================================================
+    # ESCRITA / LEITURA
+    # =========================================================
+
+    def append(
+        self,
+        events: Iterable[dict[str, Any]],
+        *,
+        fsync: bool = True,
+    ) -> RowRange:
+        """Insere os eventos em uma única transação (um fsync)."""
+        rows = [_row(event) for event in events]
+
+        with self._io_lock:
+            conn = self._connection()
+            conn.execute(
+                f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}"
+            )
+            conn.execute("BEGIN")
+            try:
+                # Rowids do SQLite: consecutivos dentro da transação (um
+                # único escritor, sob o lock)
+                conn.executemany(
+                    "INSERT INTO events "
+                    "(equipment_id, type, ts, value, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                last_id = conn.execute(
+                    "SELECT last_insert_rowid()"
+                ).fetchone()[0]
+                conn.execute("COMMIT")
+            except sqlite3.Error as err:
+                conn.execute("ROLLBACK")
+                raise OSError(f"Erro no backlog SQLite: {err}") from err
+
+            info = RowRange(
+                last_id - len(rows) + 1,
+                last_id,
+                len(rows),
+                min((row[2] for row in rows), default=None),
+            )
+            self._records.append(info)
+            self._update_size()
+            return info
+
+    def read_record(self, info: RowRange) -> Iterator[dict[str, Any]]:
+        """Eventos pendentes de um grupo (seleção por faixa de rowid)."""
+        with self._io_lock:
+            if info not in self._records:
+                raise KeyError(info.seq)
+
+            rows = self._connection().execute(
+                "SELECT equipment_id, type, ts, value, payload FROM events "
+                "WHERE id BETWEEN ? AND ? AND sent = 0 ORDER BY id",
+                (info.seq, info.last_id),
+            ).fetchall()
+
+        return (_event(row) for row in rows)
+
+    def ack(self, info: RowRange) -> None:
+        """Marca o grupo como enviado; fica no histórico local."""
+        with self._io_lock:
+            try:
+                self._records.remove(info)
+            except ValueError:
+                return
+
+            conn = self._connection()
+            now_ms = int(self._clock() * 1000)
+            conn.execute(
+                "UPDATE events SET sent = 1, sent_at = ? "
+                "WHERE id BETWEEN ? AND ?",
+                (now_ms, info.seq, info.last_id),
+            )
+
+            # O histórico conta a partir do envio, não do evento: o que
+            # sai após uma longa queda da API continua consultável
+            if self._monotonic() - self._last_purge >= _PURGE_INTERVAL:
+                self._last_purge = self._monotonic()
+                conn.execute(
+                    "DELETE FROM events WHERE sent = 1 AND sent_at < ?",
+                    (now_ms - self.history_days * 86400 * 1000,),
+                )
+                conn.execute("PRAGMA incremental_vacuum")
+
+            self._update_size()
+
+    # =========================================================
+    # CONSULTA LOCAL
+    # =========================================================
+
+    def query(
+        self,
+        equipment_id: Any,
+        *,
+        since_ms: int,
+        until_ms: int | None = None,
+        sensor_type: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Eventos (enviados ou não) de um equipamento em um período."""
+        sql = (
+            "SELECT equipment_id, type, ts, value, payload FROM events "
+            "WHERE equipment_id = ? AND ts >= ?"
+        )
+        params: list[Any] = [equipment_id, since_ms]
+
+        if until_ms is not None:
+            sql += " AND ts < ?"
+            params.append(until_ms)
+
+        if sensor_type is not None:
+            sql += " AND type = ?"
+            params.append(sensor_type)
+
+        with self._io_lock:
+            rows = self._connection().execute(
+                sql + " ORDER BY ts", params
+            ).fetchall()
+
+        return [_event(row) for row in rows]
+
+    # =========================================================
+    # RETENÇÃO
+    # =========================================================
+
+    def discard_history(self) -> None:
+        """Apaga o histórico local (eventos já enviados)."""
+        with self._io_lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM events WHERE sent = 1")
+            conn.execute("PRAGMA incremental_vacuum")
+            self._update_size()
+
+    def sealed_segments(self) -> list[int]:
+        """Grupos pendentes, do mais antigo ao mais novo."""
+        return [info.seq for info in self.records]
+
+    def read_segment(self, seq: int) -> list[dict[str, Any]]:
+        """Todos os eventos pendentes de um grupo."""
+        for info in self.records:
+            if info.seq == seq:
+                try:
+                    return list(self.read_record(info))
+                except KeyError:
+                    break
+        return []
+
+    def rewrite_segment(
+        self, seq: int, events: list[dict[str, Any]]
+    ) -> None:
+        """
+        Substitui um grupo por uma versão menor (ex.: compactada).
+
+        Os novos eventos reutilizam os primeiros rowids do grupo, o que
+        mantém a ordem de envio.
+        """
+        with self._io_lock:
+            info = next((r for r in self._records if r.seq == seq), None)
+            if info is None:
+                return
+
+            rows = [_row(event) for event in events]
+            if len(rows) > info.last_id - info.seq + 1:
+                raise ValueError("Grupo reescrito maior que o original")
+
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "DELETE FROM events WHERE id BETWEEN ? AND ?",
+                    (info.seq, info.last_id),
+                )
+                conn.executemany(
+                    "INSERT INTO events "
+                    "(id, equipment_id, type, ts, value, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (seq + index, *row)
+                        for index, row in enumerate(rows)
+                    ),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error as err:
+                conn.execute("ROLLBACK")
+                raise OSError(f"Erro no backlog SQLite: {err}") from err
+
+            conn.execute("PRAGMA incremental_vacuum")
+
+            index = self._records.index(info)
+            if rows:
+                self._records[index] = RowRange(
+                    seq,
+                    seq + len(rows) - 1,
+                    len(rows),
+                    min(row[2] for row in rows),
+                )
+            else:
+                del self._records[index]
+
+            self._update_size()
+
+    def drop_segment(self, seq: int) -> None:
+        """Descarta um grupo pendente."""
+        self.rewrite_segment(seq, [])
+
+    # =========================================================
+    # INTERNOS
+    # =========================================================
+
+    def _migrate_schema(self) -> None:
+        """
+        Bancos anteriores não têm `sent_at`: os eventos já enviados
+        contam como enviados agora.
+        """
+        conn = self._connection()
+        columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(events)")
+        }
+        if "sent_at" in columns:
+            return
+
+        conn.execute("ALTER TABLE events ADD COLUMN sent_at INTEGER")
+        conn.execute(
+            "UPDATE events SET sent_at = ? WHERE sent = 1",
+            (int(self._clock() * 1000),),
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise OSError("Backlog SQLite não carregado")
+        return self._conn
+
+    def _update_size(self) -> None:
+        """Bytes em uso no banco (páginas livres não contam)."""
+        conn = self._connection()
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        self._size = (page_count - free_pages) * page_size
+
+    # =========================================================
+    # INFO
+    # =========================================================
+
+    @property
+    def records(self) -> list[RowRange]:
+        """Grupos pendentes, do mais antigo para o mais novo."""
+        return list(self._records)
+
+    @property
+    def event_count(self) -> int:
+        return sum(info.count for info in self._records)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    @property
+    def oldest_timestamp(self) -> int | None:
+        """Timestamp (ms) do evento pendente mais antigo."""
+        return min(
+            (info.min_ts for info in self._records if info.min_ts is not None),
+            default=None,
+        )
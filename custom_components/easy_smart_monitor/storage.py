@@ -1,37 +1,441 @@
 from __future__ import annotations
 
 import logging
+import time
+import uuid
+from collections.abc import Iterable, Mapping
+from copy import deepcopy
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback, valid_entity_id
 from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN
+from .const import (
+    AGGREGATE_WINDOW_RANGE,
+    COLLECT_INTERVAL_RANGE,
+    DEADBAND_MODE_ABSOLUTE,
+    DEADBAND_MODE_PERCENT,
+    DEFAULT_AGGREGATE_WINDOW,
+    DEFAULT_DEADBAND,
+    DEFAULT_DOOR_OPEN_SECONDS,
+    DEFAULT_HEARTBEAT_SECONDS,
+    DOMAIN,
+    DOOR_OPEN_TIMEOUT_RANGE,
+    HEARTBEAT_RANGE,
+    SOURCE_ENTITY_FILTERS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_SAVE_MAX_DELAY,
+    TELEMETRY_MODE_AGGREGATE,
+    TELEMETRY_MODE_RAW,
+    TELEMETRY_SENSOR_TYPES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-STORAGE_VERSION = 1
+# v1: equipamentos completos. v2: formato compacto (ver `_compact`)
+STORAGE_VERSION = 2
 STORAGE_KEY = f"{DOMAIN}_config"
 
+# Ordem das associações no formato compacto (não alterar: é o formato
+# em disco; tipos novos entram no fim)
+STORAGE_SENSOR_ORDER = ("temperature", "humidity", "energy", "door")
+
+# Campos aceitos em uma alteração em lote
+BULK_TARGET_FIELDS = ("equipment_ids", "location")
+BULK_CHANGE_FIELDS = (
+    "enabled",
+    "collect_interval",
+    "enable_siren",
+    "open_timeout",
+    "sensors",
+    "filters",
+    "telemetry",
+)
+
+# Campos do filtro de um sensor (`filters` de uma alteração)
+FILTER_FIELDS = ("deadband", "deadband_mode", "heartbeat")
+
+# Campos do modo de telemetria (`telemetry` de uma alteração)
+TELEMETRY_FIELDS = ("mode", "window")
+
+
+# Campos de identificação de um equipamento importado
+IMPORT_FIELDS = ("id", "name", "location")
+
+
+def _validate_bulk_change(change: Mapping[str, Any]) -> list[str]:
+    """Problemas de uma alteração em lote (lista vazia = válida)."""
+    errors: list[str] = []
+
+    unknown = set(change) - {*BULK_TARGET_FIELDS, *BULK_CHANGE_FIELDS}
+    if unknown:
+        errors.append(f"campos desconhecidos: {', '.join(sorted(unknown))}")
+    if not any(field in change for field in BULK_CHANGE_FIELDS):
+        errors.append("nenhum campo a alterar")
+
+    return [*errors, *_validate_fields(change)]
+
+
+def _validate_import_record(record: Mapping[str, Any]) -> list[str]:
+    """Problemas de um equipamento importado (lista vazia = válido)."""
+    if not isinstance(record, Mapping):
+        return ["registro deve ser um objeto"]
+
+    errors: list[str] = []
+
+    unknown = set(record) - {*IMPORT_FIELDS, *BULK_CHANGE_FIELDS}
+    if unknown:
+        errors.append(f"campos desconhecidos: {', '.join(sorted(unknown))}")
+
+    for field in ("id", "name"):
+        value = record.get(field)
+        if not isinstance(value, str) or not value.strip():
+            errors.append(f"{field} obrigatório")
+    if not isinstance(record.get("location", ""), str):
+        errors.append("location deve ser texto")
+
+    return [*errors, *_validate_fields(record)]
+
+
+def _validate_fields(change: Mapping[str, Any]) -> list[str]:
+    """Tipos e limites dos campos de configuração presentes."""
+    errors: list[str] = []
+
+    for field in ("enabled", "enable_siren"):
+        if field in change and not isinstance(change[field], bool):
+            errors.append(f"{field} deve ser booleano")
+
+    for field, (low, high) in (
+        ("collect_interval", COLLECT_INTERVAL_RANGE),
+        ("open_timeout", DOOR_OPEN_TIMEOUT_RANGE),
+    ):
+        if field not in change:
+            continue
+        value = change[field]
+        if (
+            not isinstance(value, int)
+            or isinstance(value, bool)
+            or not low <= value <= high
+        ):
+            errors.append(f"{field} deve ser inteiro entre {low} e {high}")
+
+    sensors = change.get("sensors", {})
+    if not isinstance(sensors, Mapping):
+        return [
+            *errors,
+            "sensors deve ser um mapa tipo → entity_id",
+            *_validate_filters(change.get("filters", {})),
+            *_validate_telemetry(change.get("telemetry", {})),
+        ]
+
+    for sensor_type, entity_id in sensors.items():
+        source_filter = SOURCE_ENTITY_FILTERS.get(sensor_type)
+        if source_filter is None:
+            errors.append(f"tipo de sensor inválido: {sensor_type}")
+        elif entity_id is not None and (
+            not isinstance(entity_id, str)
+            or not valid_entity_id(entity_id)
+            or entity_id.split(".", 1)[0] != source_filter[0]
+        ):
+            errors.append(
+                f"entidade inválida para {sensor_type}: {entity_id}"
+            )
+
+    return [
+        *errors,
+        *_validate_filters(change.get("filters", {})),
+        *_validate_telemetry(change.get("telemetry", {})),
+    ]
+
+
+def _validate_filters(filters: Any) -> list[str]:
+    """Problemas de `filters` ({tipo: {deadband, ...}})."""
+    if not isinstance(filters, Mapping):
+        return ["filters deve ser um mapa tipo → filtro"]
+
+    errors: list[str] = []
+    low, high = HEARTBEAT_RANGE
+
+    for sensor_type, filter_cfg in filters.items():
+        if sensor_type not in TELEMETRY_SENSOR_TYPES:
+            errors.append(f"tipo de sensor sem filtro: {sensor_type}")
+            continue
+        if not isinstance(filter_cfg, Mapping):
+            errors.append(f"filtro de {sensor_type} deve ser um mapa")
+            continue
+
+        unknown = set(filter_cfg) - set(FILTER_FIELDS)
+        if unknown:
+            errors.append(
+                f"campos desconhecidos no filtro de {sensor_type}: "
+                f"{', '.join(sorted(unknown))}"
+            )
+
+        deadband = filter_cfg.get("deadband", DEFAULT_DEADBAND)
+        if (
+            not isinstance(deadband, (int, float))
+            or isinstance(deadband, bool)
+            or deadband < 0
+        ):
+            errors.append(
+                f"deadband de {sensor_type} deve ser um número >= 0"
+            )
+
+        if filter_cfg.get("deadband_mode", DEADBAND_MODE_ABSOLUTE) not in (
+            DEADBAND_MODE_ABSOLUTE,
+            DEADBAND_MODE_PERCENT,
+        ):
+            errors.append(
+                f"deadband_mode de {sensor_type} deve ser "
+                f"{DEADBAND_MODE_ABSOLUTE} ou {DEADBAND_MODE_PERCENT}"
+            )
+
+        heartbeat = filter_cfg.get("heartbeat", DEFAULT_HEARTBEAT_SECONDS)
+        if (
+            not isinstance(heartbeat, int)
+            or isinstance(heartbeat, bool)
+            or not low <= heartbeat <= high
+        ):
+            errors.append(
+                f"heartbeat de {sensor_type} deve ser inteiro entre "
+                f"{low} e {high}"
+            )
+
+    return errors
+
+
+def _validate_telemetry(telemetry: Any) -> list[str]:
+    """Problemas de `telemetry` ({mode, window})."""
+    if not isinstance(telemetry, Mapping):
+        return ["telemetry deve ser um mapa com mode e/ou window"]
+
+    errors: list[str] = []
+    low, high = AGGREGATE_WINDOW_RANGE
+
+    unknown = set(telemetry) - set(TELEMETRY_FIELDS)
+    if unknown:
+        errors.append(
+            "campos desconhecidos em telemetry: "
+            f"{', '.join(sorted(unknown))}"
+        )
+
+    if telemetry.get("mode", TELEMETRY_MODE_RAW) not in (
+        TELEMETRY_MODE_RAW,
+        TELEMETRY_MODE_AGGREGATE,
+    ):
+        errors.append(
+            f"mode deve ser {TELEMETRY_MODE_RAW} ou "
+            f"{TELEMETRY_MODE_AGGREGATE}"
+        )
+
+    window = telemetry.get("window", DEFAULT_AGGREGATE_WINDOW)
+    if (
+        not isinstance(window, int)
+        or isinstance(window, bool)
+        or not low <= window <= high
+    ):
+        errors.append(f"window deve ser inteiro entre {low} e {high}")
+
+    return errors
+
+
+def _new_equipment(
+    equipment_id: str,
+    name: str,
+    location: str,
+    equipment_uuid: str | None = None,
+) -> dict[str, Any]:
+    """Equipamento novo com a configuração padrão."""
+    return {
+        "id": equipment_id,
+        # Identidade estável (unique_id das entidades)
+        "uuid": equipment_uuid or uuid.uuid4().hex,
+        "name": name,
+        "location": location,
+        "enabled": True,
+
+        # Configurações
+        "collect_interval": 30,
+        "door": {
+            "enable_siren": True,
+            "open_timeout": DEFAULT_DOOR_OPEN_SECONDS,
+        },
+
+        # Associação de sensores HA
+        "sensors": {
+            "temperature": None,
+            "humidity": None,
+            "energy": None,
+            "door": None,
+        },
+    }
+
+
+def _derived_uuid(equipment_id: str) -> str:
+    """uuid de um equipamento que não tem um (derivado do id)."""
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"{DOMAIN}/{equipment_id}").hex
+
+
+# =========================================================
+# FORMATO EM DISCO (v2)
+# =========================================================
+
+_DEFAULT_EQUIPMENT = _new_equipment("", "", "")
+
+
+def _compact(equipment: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Equipamento no formato em disco: sem `id` (é a chave), sem valores
+    padrão e com as associações como lista na ordem de
+    `STORAGE_SENSOR_ORDER` (sem os None do fim).
+    """
+    compact: dict[str, Any] = {}
+
+    for key, value in equipment.items():
+        if key == "id":
+            continue
+        if key == "uuid" and value == _derived_uuid(equipment["id"]):
+            continue
+
+        if key == "sensors" and set(value) <= set(STORAGE_SENSOR_ORDER):
+            bindings = [value.get(t) for t in STORAGE_SENSOR_ORDER]
+            while bindings and bindings[-1] is None:
+                bindings.pop()
+            if bindings:
+                compact[key] = bindings
+        elif key == "door":
+            door_cfg = {
+                k: v
+                for k, v in value.items()
+                if _DEFAULT_EQUIPMENT["door"].get(k) != v
+            }
+            if door_cfg:
+                compact[key] = door_cfg
+        elif key == "name" or _DEFAULT_EQUIPMENT.get(key) != value:
+            compact[key] = value
+
+    return compact
+
+
+def _expand(equipment_id: str, compact: Mapping[str, Any]) -> dict[str, Any]:
+    """Equipamento completo (memória) a partir do formato em disco."""
+    equipment = _new_equipment(
+        equipment_id,
+        compact.get("name", equipment_id),
+        compact.get("location", ""),
+        compact.get("uuid") or _derived_uuid(equipment_id),
+    )
+
+    for key, value in compact.items():
+        if key == "sensors":
+            if isinstance(value, list):
+                value = dict(zip(STORAGE_SENSOR_ORDER, value))
+            equipment["sensors"].update(value)
+        elif key == "door":
+            equipment["door"].update(value)
+        elif key != "id":
+            equipment[key] = value
+
+    return equipment
+
+
+def _compact_data(data: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        **data,
+        "equipments": {
+            equipment_id: _compact(equipment)
+            for equipment_id, equipment in data.get(
+                "equipments", {}
+            ).items()
+        },
+    }
+
+
+def _expand_data(data: Mapping[str, Any]) -> dict[str, Any]:
+    return {
+        **data,
+        "equipments": {
+            equipment_id: _expand(equipment_id, equipment)
+            for equipment_id, equipment in data.get(
+                "equipments", {}
+            ).items()
+        },
+    }
+
+
+class _ConfigStore(Store[dict[str, Any]]):
+    """Store da configuração, com migração entre versões do formato."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        if old_major_version == 1:
+            # v1 já é o formato completo
+            return _compact_data(old_data)
+        raise ValueError(
+            f"Versão {old_major_version} do storage não suportada"
+        )
+
+
+def _apply_bulk_change(
+    equipment: dict[str, Any], change: Mapping[str, Any]
+) -> None:
+    """Aplica uma alteração (já validada) a um equipamento."""
+    for field in ("enabled", "collect_interval"):
+        if field in change:
+            equipment[field] = change[field]
+
+    door_cfg = equipment.setdefault("door", {})
+    for field in ("enable_siren", "open_timeout"):
+        if field in change:
+            door_cfg[field] = change[field]
+
+    if "sensors" in change:
+        equipment.setdefault("sensors", {}).update(change["sensors"])
+
+    # Só os campos informados; o resto do filtro fica como está
+    for sensor_type, filter_cfg in change.get("filters", {}).items():
+        if filter_cfg:
+            equipment.setdefault("filters", {}).setdefault(
+                sensor_type, {}
+            ).update(filter_cfg)
+
+    if change.get("telemetry"):
+        equipment.setdefault("telemetry", {}).update(change["telemetry"])
+
 
 class EasySmartMonitorStorage:
     """
     Camada de persistência do Easy Smart Monitor.
 
     Responsabilidades:
+    - Registro único dos equipamentos em memória (carregado uma vez no
+      setup), com busca por id e por uuid, usado pelo config flow e
+      por todas as plataformas
     - Armazenar equipamentos
     - Armazenar configuração por equipamento
     - Persistir associações de sensores
+    - Persistir filtros (deadband / heartbeat) por sensor
+    - Agrupar alterações em uma gravação (atraso limitado)
     - Fornecer API simples para o coordinator e entidades
     """
 
     def __init__(self, hass: HomeAssistant) -> None:
-        self._store = Store[dict[str, Any]](
+        self._store = _ConfigStore(
             hass,
             STORAGE_VERSION,
             STORAGE_KEY,
         )
         self._data: dict[str, Any] = {}
+        # Momento (monotônico) da primeira alteração ainda não gravada
+        self._dirty_since: float | None = None
+        # uuid → id do equipamento
+        self._by_uuid: dict[str, str] = {}
+        # Próximo id numérico livre (config flow)
+        self._next_id = 1
 
     # =========================================================
     # LOAD / SAVE
@@ -40,16 +444,68 @@ class EasySmartMonitorStorage:
     async def async_load(self) -> None:
         """Carrega dados persistidos."""
         data = await self._store.async_load()
-        self._data = data or {"equipments": {}}
+        self._data = _expand_data(data or {})
 
         _LOGGER.debug(
-            "Easy Smart Monitor storage carregado: %s", self._data
+            "Easy Smart Monitor storage carregado: %s equipamentos",
+            len(self._data["equipments"]),
+        )
+
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Índice por uuid e próximo id livre."""
+        self._by_uuid.clear()
+
+        for equipment_id, equipment in self.get_equipments().items():
+            self._by_uuid[equipment["uuid"]] = equipment_id
+
+        self._next_id = (
+            max(
+                (int(e) for e in self.get_equipments() if e.isdigit()),
+                default=0,
+            )
+            + 1
         )
 
     async def async_save(self) -> None:
-        """Persiste dados no disco."""
-        await self._store.async_save(self._data)
+        """Persiste dados no disco imediatamente."""
+        self._dirty_since = None
+        await self._store.async_save(_compact_data(self._data))
+        _LOGGER.debug("Easy Smart Monitor storage salvo")
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """
+        Agenda a gravação das alterações.
+
+        Alterações próximas viram uma única gravação, feita no máximo
+        `STORAGE_SAVE_MAX_DELAY` segundos após a primeira delas.
+        """
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+
+        delay = min(
+            STORAGE_SAVE_DELAY,
+            self._dirty_since + STORAGE_SAVE_MAX_DELAY - now,
+        )
+        self._store.async_delay_save(self._data_to_save, max(delay, 0))
+
+    async def async_flush(self) -> None:
+        """Grava já as alterações pendentes (unload / parada do HA)."""
+        if self._dirty_since is not None:
+            await self.async_save()
+
+    @property
+    def has_pending_save(self) -> bool:
+        return self._dirty_since is not None
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._dirty_since = None
         _LOGGER.debug("Easy Smart Monitor storage salvo")
+        return _compact_data(self._data)
 
     # =========================================================
     # EQUIPAMENTOS
@@ -63,47 +519,332 @@ class EasySmartMonitorStorage:
         """Retorna um equipamento específico."""
         return self.get_equipments().get(equipment_id)
 
+    def get_equipment_by_uuid(
+        self, equipment_uuid: str
+    ) -> dict[str, Any] | None:
+        """Retorna um equipamento pelo uuid."""
+        equipment_id = self._by_uuid.get(equipment_uuid)
+        if equipment_id is None:
+            return None
+        return self.get_equipment(equipment_id)
+
+    def next_equipment_id(self) -> str:
+        """Próximo id numérico livre."""
+        equipments = self.get_equipments()
+        while str(self._next_id) in equipments:
+            self._next_id += 1
+        return str(self._next_id)
+
     async def add_equipment(
         self,
         *,
         equipment_id: str,
         name: str,
         location: str,
+        equipment_uuid: str | None = None,
     ) -> None:
         """Adiciona um novo equipamento."""
-        self.get_equipments()[equipment_id] = {
-            "id": equipment_id,
-            "name": name,
-            "location": location,
-            "enabled": True,
-
-            # Configurações
-            "collect_interval": 30,
-            "door": {
-                "enable_siren": True,
-                "open_timeout": 120,
-            },
-
-            # Associação de sensores HA
-            "sensors": {
-                "temperature": None,
-                "humidity": None,
-                "energy": None,
-                "door": None,
-            },
-        }
+        self._put_equipment(
+            _new_equipment(equipment_id, name, location, equipment_uuid)
+        )
 
-        await self.async_save()
+        self.async_schedule_save()
 
     async def remove_equipment(self, equipment_id: str) -> None:
         """Remove um equipamento."""
-        self.get_equipments().pop(equipment_id, None)
-        await self.async_save()
+        self._pop_equipment(equipment_id)
+        self.async_schedule_save()
+
+    def adopt_legacy_equipments(
+        self, legacy_equipments: Iterable[Mapping[str, Any]]
+    ) -> list[str]:
+        """
+        Traz para o registro os equipamentos do formato antigo
+        (`entry.options["equipments"]`: lista, id inteiro + uuid e
+        sensores como lista).
+
+        O uuid é mantido (mesmas entidades de sirene / botão). Retorna
+        os ids adotados; equipamentos já adotados são ignorados.
+        """
+        adopted: list[str] = []
+
+        for legacy in legacy_equipments:
+            legacy_uuid = legacy.get("uuid")
+            if legacy_uuid in self._by_uuid:
+                continue
+
+            equipment_id = str(legacy["id"])
+            if equipment_id in self.get_equipments():
+                equipment_id = self.next_equipment_id()
+
+            equipment = _new_equipment(
+                equipment_id,
+                legacy.get("name", equipment_id),
+                legacy.get("location", ""),
+                legacy_uuid,
+            )
+            equipment["enabled"] = legacy.get("enabled", True)
+            equipment["collect_interval"] = legacy.get(
+                "collect_interval", equipment["collect_interval"]
+            )
+            equipment["door"].update(legacy.get("door", {}))
+            for sensor in legacy.get("sensors", []):
+                if (
+                    sensor.get("enabled", True)
+                    and sensor.get("type") in equipment["sensors"]
+                ):
+                    equipment["sensors"][sensor["type"]] = sensor.get(
+                        "entity_id"
+                    )
+
+            self._put_equipment(equipment)
+            adopted.append(equipment_id)
+
+        if adopted:
+            self.async_schedule_save()
+        return adopted
+
+    def _put_equipment(self, equipment: dict[str, Any]) -> None:
+        """Insere / substitui um equipamento mantendo o índice."""
+        previous = self.get_equipments().get(equipment["id"])
+        if previous is not None:
+            self._by_uuid.pop(previous.get("uuid"), None)
+
+        self.get_equipments()[equipment["id"]] = equipment
+        self._by_uuid[equipment["uuid"]] = equipment["id"]
+
+    def _pop_equipment(self, equipment_id: str) -> None:
+        equipment = self.get_equipments().pop(equipment_id, None)
+        if equipment is not None:
+            self._by_uuid.pop(equipment.get("uuid"), None)
+
+    # =========================================================
+    # ALTERAÇÕES EM LOTE
+    # =========================================================
+
+    async def async_bulk_update(
+        self, changes: Iterable[Mapping[str, Any]]
+    ) -> list[str]:
+        """
+        Aplica várias alterações de configuração como uma transação.
+
+        Cada alteração escolhe os equipamentos por `equipment_ids` e/ou
+        `location` (união dos dois) e traz os campos a mudar:
+        `enabled`, `collect_interval`, `enable_siren`, `open_timeout`,
+        `sensors` ({tipo: entity_id | None}) e `filters` ({tipo:
+        {deadband, deadband_mode, heartbeat}}, só os campos
+        informados) e `telemetry` ({mode, window}). As alterações são
+        aplicadas em ordem; a última vence.
+
+        Tudo é validado antes: com qualquer problema nada muda e um
+        ValueError lista todos eles. Sucesso = uma única gravação.
+
+        Retorna os equipamentos que de fato mudaram.
+        """
+        equipments = self.get_equipments()
+        staged: dict[str, dict[str, Any]] = {}
+        errors: list[str] = []
+
+        for index, change in enumerate(changes):
+            problems = _validate_bulk_change(change)
+            targets = self._bulk_targets(change, problems)
+            if problems:
+                errors.extend(f"alteração {index}: {p}" for p in problems)
+                continue
+
+            for equipment_id in targets:
+                if equipment_id not in staged:
+                    staged[equipment_id] = deepcopy(equipments[equipment_id])
+                _apply_bulk_change(staged[equipment_id], change)
+
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        changed = [
+            equipment_id
+            for equipment_id, equipment in staged.items()
+            if equipment != equipments[equipment_id]
+        ]
+        if changed:
+            for equipment_id in changed:
+                equipments[equipment_id] = staged[equipment_id]
+            await self.async_save()
+
+        return changed
+
+    def _bulk_targets(
+        self, change: Mapping[str, Any], errors: list[str]
+    ) -> list[str]:
+        """Equipamentos alvo de uma alteração (problemas em `errors`)."""
+        equipments = self.get_equipments()
+        targets: dict[str, None] = {}
+
+        for equipment_id in change.get("equipment_ids", ()):
+            if equipment_id in equipments:
+                targets[equipment_id] = None
+            else:
+                errors.append(f"equipamento inexistente: {equipment_id}")
+
+        location = change.get("location")
+        if location is not None:
+            matches = [
+                equipment_id
+                for equipment_id, equipment in equipments.items()
+                if equipment.get("location") == location
+            ]
+            if not matches:
+                errors.append(f"nenhum equipamento em {location}")
+            targets.update(dict.fromkeys(matches))
+
+        if not any(field in change for field in BULK_TARGET_FIELDS):
+            errors.append("informe equipment_ids e/ou location")
+
+        return list(targets)
+
+    # =========================================================
+    # IMPORTAÇÃO / EXPORTAÇÃO
+    # =========================================================
+
+    def export_equipments(self) -> list[dict[str, Any]]:
+        """
+        Equipamentos no formato de importação (ver
+        `async_import_equipments`), em ordem de id.
+
+        `filters` e `telemetry` trazem só o que foi configurado
+        (ausente = padrão).
+        """
+        records = []
+        for equipment_id, equipment in sorted(
+            self.get_equipments().items()
+        ):
+            door_cfg = equipment.get("door", {})
+            records.append(
+                {
+                    "id": equipment_id,
+                    "name": equipment["name"],
+                    "location": equipment.get("location", ""),
+                    "enabled": equipment.get("enabled", True),
+                    "collect_interval": equipment.get(
+                        "collect_interval", 30
+                    ),
+                    "enable_siren": door_cfg.get("enable_siren", True),
+                    "open_timeout": door_cfg.get("open_timeout", 120),
+                    "sensors": dict(equipment.get("sensors", {})),
+                    "filters": deepcopy(equipment.get("filters", {})),
+                    "telemetry": dict(equipment.get("telemetry", {})),
+                }
+            )
+        return records
+
+    async def async_import_equipments(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        *,
+        replace: bool = False,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Importa equipamentos e associações de sensores em uma transação.
+
+        Cada registro traz `id`, `name`, `location` e, opcionalmente,
+        os campos de `async_bulk_update`. Equipamentos existentes são
+        atualizados (campos ausentes ficam como estão); novos partem da
+        configuração padrão. Com `replace`, os que não estão na
+        importação são removidos.
+
+        Tudo ou nada: com qualquer registro inválido nada muda. Sucesso
+        = uma única gravação. Retorna o relatório de validação:
+        `created`, `updated`, `removed`, `unchanged`, `errors`
+        ([{row, id, errors}]) e `applied`.
+        """
+        equipments = self.get_equipments()
+        staged: dict[str, dict[str, Any]] = {}
+        errors: list[dict[str, Any]] = []
+        rows: dict[str, int] = {}
+
+        for row, record in enumerate(records):
+            problems = _validate_import_record(record)
+            equipment_id = (
+                record.get("id") if isinstance(record, Mapping) else None
+            )
+
+            if not problems and equipment_id in rows:
+                problems.append(f"id repetido (registro {rows[equipment_id]})")
+            if problems:
+                errors.append(
+                    {"row": row, "id": equipment_id, "errors": problems}
+                )
+                continue
+
+            rows[equipment_id] = row
+            current = equipments.get(equipment_id)
+            equipment = (
+                deepcopy(current)
+                if current is not None
+                else _new_equipment(equipment_id, "", "")
+            )
+            equipment["name"] = record["name"]
+            equipment["location"] = record.get(
+                "location", equipment["location"]
+            )
+            _apply_bulk_change(equipment, record)
+            staged[equipment_id] = equipment
+
+        report: dict[str, Any] = {
+            "created": [e for e in staged if e not in equipments],
+            "updated": [
+                e
+                for e, equipment in staged.items()
+                if e in equipments and equipment != equipments[e]
+            ],
+            "removed": (
+                [e for e in equipments if e not in staged] if replace else []
+            ),
+            "unchanged": [
+                e
+                for e, equipment in staged.items()
+                if equipments.get(e) == equipment
+            ],
+            "errors": errors,
+            "applied": False,
+        }
+
+        if errors or dry_run:
+            return report
+
+        changed = [*report["created"], *report["updated"]]
+        if changed or report["removed"]:
+            for equipment_id in report["removed"]:
+                self._pop_equipment(equipment_id)
+            for equipment_id in changed:
+                self._put_equipment(staged[equipment_id])
+            await self.async_save()
+
+        report["applied"] = True
+        return report
 
     # =========================================================
     # CONFIGURAÇÃO DO EQUIPAMENTO
     # =========================================================
 
+    async def set_equipment_info(
+        self,
+        equipment_id: str,
+        *,
+        name: str | None = None,
+        location: str | None = None,
+    ) -> None:
+        equipment = self.get_equipment(equipment_id)
+        if equipment is None:
+            return
+
+        if name is not None:
+            equipment["name"] = name
+        if location is not None:
+            equipment["location"] = location
+
+        self.async_schedule_save()
+
     async def set_equipment_enabled(
         self, equipment_id: str, enabled: bool
     ) -> None:
@@ -112,7 +853,7 @@ class EasySmartMonitorStorage:
             return
 
         equipment["enabled"] = enabled
-        await self.async_save()
+        self.async_schedule_save()
 
     async def set_collect_interval(
         self, equipment_id: str, interval: int
@@ -122,7 +863,7 @@ class EasySmartMonitorStorage:
             return
 
         equipment["collect_interval"] = interval
-        await self.async_save()
+        self.async_schedule_save()
 
     async def set_door_config(
         self,
@@ -141,7 +882,48 @@ class EasySmartMonitorStorage:
         if open_timeout is not None:
             door_cfg["open_timeout"] = open_timeout
 
-        await self.async_save()
+        self.async_schedule_save()
+
+    async def set_telemetry_mode(
+        self,
+        equipment_id: str,
+        *,
+        mode: str | None = None,
+        window: int | None = None,
+    ) -> None:
+        """
+        Define como a telemetria do equipamento é enviada.
+
+        mode: "raw" (cada leitura) ou "aggregate" (um evento por janela
+        de `window` segundos).
+        """
+        equipment = self.get_equipment(equipment_id)
+        if equipment is None:
+            return
+
+        if mode not in (None, TELEMETRY_MODE_RAW, TELEMETRY_MODE_AGGREGATE):
+            raise ValueError(f"Modo de telemetria inválido: {mode}")
+
+        telemetry_cfg = equipment.setdefault("telemetry", {})
+        if mode is not None:
+            telemetry_cfg["mode"] = mode
+        if window is not None:
+            telemetry_cfg["window"] = window
+
+        self.async_schedule_save()
+
+    def get_telemetry_mode(self, equipment_id: str) -> dict[str, Any]:
+        """Retorna a configuração de telemetria com os defaults aplicados."""
+        telemetry_cfg = {
+            "mode": TELEMETRY_MODE_RAW,
+            "window": DEFAULT_AGGREGATE_WINDOW,
+        }
+
+        equipment = self.get_equipment(equipment_id)
+        if equipment is not None:
+            telemetry_cfg.update(equipment.get("telemetry", {}))
+
+        return telemetry_cfg
 
     # =========================================================
     # ASSOCIAÇÃO DE SENSORES
@@ -163,7 +945,7 @@ class EasySmartMonitorStorage:
         sensors = equipment.setdefault("sensors", {})
         sensors[sensor_type] = entity_id
 
-        await self.async_save()
+        self.async_schedule_save()
 
     def get_sensor_source(
         self, equipment_id: str, sensor_type: str
@@ -172,4 +954,64 @@ class EasySmartMonitorStorage:
         if equipment is None:
             return None
 
-        return equipment.get("sensors", {}).get(sensor_type)
\ No newline at end of file
+        return equipment.get("sensors", {}).get(sensor_type)
+
+    # =========================================================
+    # FILTROS POR SENSOR (DEADBAND / HEARTBEAT)
+    # =========================================================
+
+    async def set_sensor_filter(
+        self,
+        equipment_id: str,
+        sensor_type: str,
+        *,
+        deadband: float | None = None,
+        deadband_mode: str | None = None,
+        heartbeat: int | None = None,
+    ) -> None:
+        """
+        Configura o filtro por mudança de valor de um sensor.
+
+        deadband_mode: "absolute" (mesma unidade do sensor) ou
+        "percent" (relativo ao último valor enviado).
+        """
+        equipment = self.get_equipment(equipment_id)
+        if equipment is None:
+            return
+
+        if deadband_mode not in (
+            None,
+            DEADBAND_MODE_ABSOLUTE,
+            DEADBAND_MODE_PERCENT,
+        ):
+            raise ValueError(f"deadband_mode inválido: {deadband_mode}")
+
+        filter_cfg = equipment.setdefault("filters", {}).setdefault(
+            sensor_type, {}
+        )
+        if deadband is not None:
+            filter_cfg["deadband"] = deadband
+        if deadband_mode is not None:
+            filter_cfg["deadband_mode"] = deadband_mode
+        if heartbeat is not None:
+            filter_cfg["heartbeat"] = heartbeat
+
+        self.async_schedule_save()
+
+    def get_sensor_filter(
+        self, equipment_id: str, sensor_type: str
+    ) -> dict[str, Any]:
+        """Retorna o filtro do sensor com os defaults aplicados."""
+        filter_cfg = {
+            "deadband": DEFAULT_DEADBAND,
+            "deadband_mode": DEADBAND_MODE_ABSOLUTE,
+            "heartbeat": DEFAULT_HEARTBEAT_SECONDS,
+        }
+
+        equipment = self.get_equipment(equipment_id)
+        if equipment is not None:
+            filter_cfg.update(
+                equipment.get("filters", {}).get(sensor_type, {})
+            )
+
+        return filter_cfg
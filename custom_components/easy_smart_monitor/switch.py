@@ -2,15 +2,14 @@ from __future__ import annotations
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    DOMAIN,
-    MANUFACTURER,
-    MODEL_VIRTUAL,
-)
+from .const import DOMAIN
 from .storage import EasySmartMonitorStorage
 from .coordinator import EasySmartMonitorCoordinator
+from .entity import (
+    EasySmartMonitorEquipmentEntity,
+    async_setup_equipment_entities,
+)
 
 
 # ============================================================
@@ -23,35 +22,25 @@ async def async_setup_entry(hass, entry, async_add_entities):
     ]
     storage: EasySmartMonitorStorage = coordinator.storage
 
-    entities: list[SwitchEntity] = []
-
-    for equipment_id, equipment in storage.get_equipments().items():
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, equipment_id)},
-            name=equipment["name"],
-            manufacturer=MANUFACTURER,
-            model=MODEL_VIRTUAL,
-            suggested_area=equipment.get("location"),
-        )
-
-        entities.extend(
-            [
-                EasySmartMonitorEquipmentEnabledSwitch(
-                    coordinator,
-                    storage,
-                    equipment_id,
-                    device_info,
-                ),
-                EasySmartMonitorEnableSirenSwitch(
-                    coordinator,
-                    storage,
-                    equipment_id,
-                    device_info,
-                ),
-            ]
-        )
-
-    async_add_entities(entities)
+    def _equipment_entities(equipment_id, equipment, device_info):
+        return [
+            EasySmartMonitorEquipmentEnabledSwitch(
+                coordinator,
+                storage,
+                equipment_id,
+                device_info,
+            ),
+            EasySmartMonitorEnableSirenSwitch(
+                coordinator,
+                storage,
+                equipment_id,
+                device_info,
+            ),
+        ]
+
+    async_setup_equipment_entities(
+        coordinator, entry, async_add_entities, _equipment_entities
+    )
 
 
 # ============================================================
@@ -59,11 +48,10 @@ async def async_setup_entry(hass, entry, async_add_entities):
 # ============================================================
 
 class EasySmartMonitorEquipmentEnabledSwitch(
-    CoordinatorEntity, SwitchEntity
+    EasySmartMonitorEquipmentEntity, SwitchEntity
 ):
     """Ativa ou desativa o equipamento."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:power"
 
     def __init__(
@@ -73,13 +61,11 @@ class EasySmartMonitorEquipmentEnabledSwitch(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, equipment_id, device_info)
         self.storage = storage
-        self.equipment_id = equipment_id
 
         self._attr_name = "Equipamento Ativo"
         self._attr_unique_id = f"{equipment_id}_enabled"
-        self._attr_device_info = device_info
 
     @property
     def is_on(self) -> bool:
@@ -90,13 +76,13 @@ class EasySmartMonitorEquipmentEnabledSwitch(
         await self.storage.set_equipment_enabled(
             self.equipment_id, True
         )
-        self.coordinator.async_set_updated_data({})
+        self.coordinator.async_update_equipment(self.equipment_id)
 
     async def async_turn_off(self, **kwargs):
         await self.storage.set_equipment_enabled(
             self.equipment_id, False
         )
-        self.coordinator.async_set_updated_data({})
+        self.coordinator.async_update_equipment(self.equipment_id)
 
 
 # ============================================================
@@ -104,11 +90,10 @@ class EasySmartMonitorEquipmentEnabledSwitch(
 # ============================================================
 
 class EasySmartMonitorEnableSirenSwitch(
-    CoordinatorEntity, SwitchEntity
+    EasySmartMonitorEquipmentEntity, SwitchEntity
 ):
     """Ativa ou desativa a sirene do equipamento."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:bell-ring"
 
     def __init__(
@@ -118,13 +103,11 @@ class EasySmartMonitorEnableSirenSwitch(
         equipment_id: str,
         device_info: DeviceInfo,
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, equipment_id, device_info)
         self.storage = storage
-        self.equipment_id = equipment_id
 
         self._attr_name = "Sirene Ativa"
         self._attr_unique_id = f"{equipment_id}_enable_siren"
-        self._attr_device_info = device_info
 
     @property
     def is_on(self) -> bool:
@@ -139,11 +122,11 @@ class EasySmartMonitorEnableSirenSwitch(
             self.equipment_id,
             enable_siren=True,
         )
-        self.coordinator.async_set_updated_data({})
+        self.coordinator.async_update_equipment(self.equipment_id)
 
     async def async_turn_off(self, **kwargs):
         await self.storage.set_door_config(
             self.equipment_id,
             enable_siren=False,
         )
-        self.coordinator.async_set_updated_data({})
\ No newline at end of file
+        self.coordinator.async_update_equipment(self.equipment_id)
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Servidor local que substitui a API Easy Smart Monitor nos testes.
+
+Implementa (via aiohttp):
+- POST /auth/login
+- POST /auth/refresh
+- POST /events (JSON e MessagePack)
+- GET  /status
+
+Permite injetar:
+- Latência por requisição
+- Taxa de erros (HTTP 500)
+- Respostas 401 (token expirado/revogado), 429 e 413
+- Gravação dos payloads recebidos
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.easy_smart_monitor.encoders import (
+    ENCODERS,
+    get_encoder,
+)
+
+
+@dataclass
+class RecordedBatch:
+    """Lote de eventos recebido em /events."""
+
+    content_type: str
+    size: int
+    events: list[dict[str, Any]]
+    received_at: float = field(default_factory=time.monotonic)
+
+
+class StandInApiServer:
+    """API fake com comportamento configurável."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        max_body_bytes: int | None = None,
+        content_types: list[str] | None = None,
+        username: str = "user",
+        password: str = "pass",
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_body_bytes = max_body_bytes
+        self.content_types = (
+            list(ENCODERS) if content_types is None else content_types
+        )
+        self.username = username
+        self.password = password
+
+        self.batches: list[RecordedBatch] = []
+        self.requests: list[tuple[str, str]] = []
+
+        self._random = random.Random(seed)
+        self._tokens: dict[str, bool] = {}
+        self._forced: list[tuple[int, dict[str, str]]] = []
+
+        self.base_url: str | None = None
+        self._server: TestServer | None = None
+
+    # =========================================================
+    # CICLO DE VIDA
+    # =========================================================
+
+    async def start(self) -> str:
+        """Sobe o servidor em uma porta local e retorna a URL base."""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/auth/login", self._handle_login)
+        app.router.add_post("/auth/refresh", self._handle_refresh)
+        app.router.add_post("/events", self._handle_events)
+        app.router.add_get("/status", self._handle_status)
+
+        self._server = TestServer(app, host="127.0.0.1")
+        await self._server.start_server()
+        self.base_url = str(self._server.make_url("")).rstrip("/")
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
+
+    # =========================================================
+    # INJEÇÃO DE FALHAS
+    # =========================================================
+
+    def expire_tokens(self) -> None:
+        """Tokens atuais passam a receber 401 (refresh ainda aceito)."""
+        for token in self._tokens:
+            self._tokens[token] = False
+
+    def revoke_tokens(self) -> None:
+        """Tokens atuais deixam de existir (refresh também recebe 401)."""
+        self._tokens.clear()
+
+    def reject_next(
+        self,
+        status: int,
+        count: int = 1,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """As próximas `count` requisições a /events recebem `status`."""
+        self._forced.extend([(status, headers or {})] * count)
+
+    # =========================================================
+    # CONSULTAS
+    # =========================================================
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        """Todos os eventos recebidos, na ordem de chegada."""
+        return [event for batch in self.batches for event in batch.events]
+
+    # =========================================================
+    # HANDLERS
+    # =========================================================
+
+    def _issue_token(self) -> web.Response:
+        token = secrets.token_hex(8)
+        self._tokens[token] = True
+        return web.json_response(
+            {"access_token": token, "expires_at": time.time() + 3600}
+        )
+
+    def _bearer(self, request: web.Request) -> str | None:
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return None
+        return header.removeprefix("Bearer ")
+
+    async def _delay(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        self.requests.append(("POST", "/auth/login"))
+        await self._delay()
+
+        data = await request.json()
+        if (
+            data.get("username") != self.username
+            or data.get("password") != self.password
+        ):
+            return web.json_response({"error": "invalid"}, status=401)
+
+        return self._issue_token()
+
+    async def _handle_refresh(self, request: web.Request) -> web.Response:
+        self.requests.append(("POST", "/auth/refresh"))
+        await self._delay()
+
+        token = self._bearer(request)
+        if token not in self._tokens:
+            return web.json_response({"error": "invalid"}, status=401)
+
+        del self._tokens[token]
+        return self._issue_token()
+
+    def _authorized(self, request: web.Request) -> bool:
+        return self._tokens.get(self._bearer(request) or "", False)
+
+    async def _handle_status(self, request: web.Request) -> web.Response:
+        self.requests.append(("GET", "/status"))
+        await self._delay()
+
+        if not self._authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        return web.json_response(
+            {"status": "online", "content_types": self.content_types}
+        )
+
+    async def _handle_events(self, request: web.Request) -> web.Response:
+        self.requests.append(("POST", "/events"))
+        await self._delay()
+
+        if not self._authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+
+        if self._forced:
+            status, headers = self._forced.pop(0)
+            return web.json_response(
+                {"error": "forced"}, status=status, headers=headers
+            )
+
+        body = await request.read()
+
+        if self.max_body_bytes is not None and len(body) > self.max_body_bytes:
+            return web.json_response({"error": "too_large"}, status=413)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.json_response({"error": "internal"}, status=500)
+
+        content_type = request.content_type
+        if content_type not in self.content_types:
+            return web.json_response({"error": "unsupported"}, status=415)
+
+        events = get_encoder(content_type).decode(body)
+        self.batches.append(RecordedBatch(content_type, len(body), events))
+
+        return web.json_response({"accepted": len(events)})
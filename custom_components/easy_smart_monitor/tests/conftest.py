@@ -5,10 +5,13 @@ Responsabilidades:
 - Forçar TEST_MODE
 - Garantir ambiente limpo
 - Disponibilizar fixture hass (Home Assistant)
+- Disponibilizar fábrica de coordinators sobre o hass simulado
+- Disponibilizar API local (stand-in) para testes HTTP
 """
 
 import os
 import pytest
+import pytest_asyncio
 
 from homeassistant.core import HomeAssistant
 from homeassistant.setup import async_setup_component
@@ -49,6 +52,84 @@ async def hass(hass: HomeAssistant) -> HomeAssistant:
     return hass
 
 
+# ============================================================
+# FIXTURE — HASS SIMULADO (SEM CORE)
+# ============================================================
+
+@pytest.fixture
+def mock_hass(tmp_path):
+    """
+    MagicMock de HomeAssistant para testes do coordinator.
+
+    - `hass.states.get` lê do dict `hass.test_states`
+    - `hass.config.path` aponta para um diretório temporário
+    - `hass.async_add_executor_job` executa a função imediatamente
+    """
+    from unittest.mock import MagicMock
+
+    hass = MagicMock()
+    hass.test_states = {}
+    hass.states.get = hass.test_states.get
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+
+    async def _executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _executor
+    return hass
+
+
+@pytest.fixture
+def mock_entry():
+    """ConfigEntry simulada, sem opções configuradas."""
+    from unittest.mock import MagicMock
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {}
+    entry.options = {}
+    return entry
+
+
+@pytest.fixture
+def coordinator_factory(mock_hass, mock_entry):
+    """
+    Fábrica de coordinators sobre o `mock_hass`, já inicializados.
+
+    - `equipments`: {equipment_id: dados} lidos pelo storage na carga
+      (campos omitidos recebem os padrões)
+    - `options`: options da entry
+    - Dispatcher real (`async_run_hass_job` executa na hora)
+    - Gravações do storage simuladas (`async_save` / `async_delay_save`)
+    """
+    from unittest.mock import AsyncMock, MagicMock
+
+    from custom_components.easy_smart_monitor.coordinator import (
+        EasySmartMonitorCoordinator,
+    )
+
+    async def _factory(equipments=None, *, options=None):
+        if options is not None:
+            mock_entry.options = options
+        mock_hass.data = {}
+        mock_hass.async_run_hass_job = lambda job, *args: job.target(*args)
+
+        coordinator = EasySmartMonitorCoordinator(
+            mock_hass, mock_entry, MagicMock()
+        )
+        store = coordinator.storage._store
+        store.async_load = AsyncMock(
+            return_value={"equipments": dict(equipments or {})}
+        )
+        store.async_save = AsyncMock()
+        store.async_delay_save = MagicMock()
+
+        await coordinator.async_initialize()
+        return coordinator
+
+    return _factory
+
+
 # ============================================================
 # FIXTURE UTILITÁRIA — EVENT LOOP
 # ============================================================
@@ -64,4 +145,31 @@ def event_loop():
 
     loop = asyncio.new_event_loop()
     yield loop
-    loop.close()
\ No newline at end of file
+    loop.close()
+
+# ============================================================
+# FIXTURES — API LOCAL (SEM TEST_MODE)
+# ============================================================
+
+@pytest.fixture
+def live_mode(monkeypatch):
+    """
+    Desativa TEST_MODE nos módulos que falam com a API.
+
+    Usado junto com `api_server` para exercitar o caminho HTTP real.
+    """
+    from custom_components.easy_smart_monitor import client, coordinator
+
+    monkeypatch.setattr(client, "TEST_MODE", False)
+    monkeypatch.setattr(coordinator, "TEST_MODE", False)
+
+
+@pytest_asyncio.fixture
+async def api_server(socket_enabled):
+    """Servidor local que substitui a API Easy Smart Monitor."""
+    from .api_server import StandInApiServer
+
+    server = StandInApiServer()
+    await server.start()
+    yield server
+    await server.close()
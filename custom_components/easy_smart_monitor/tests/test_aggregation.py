@@ -0,0 +1,171 @@
+"""
+Testes da agregação de telemetria por janela e da compactação da fila.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.easy_smart_monitor.aggregation import (
+    BacklogCompactor,
+    WindowAggregator,
+    compact_events,
+)
+
+
+START = datetime(2026, 1, 11, 10, 0, tzinfo=timezone.utc)
+
+
+def test_window_emits_single_aggregate_when_closed():
+    aggregator = WindowAggregator()
+
+    for offset, value in enumerate((-18.0, -17.0, -19.0, -18.0)):
+        assert aggregator.add(
+            "1",
+            "temperature",
+            value,
+            START + timedelta(seconds=offset * 60),
+            300,
+        ) is None
+
+    event = aggregator.add(
+        "1", "temperature", -16.0, START + timedelta(seconds=300), 300
+    )
+
+    assert event == {
+        "equipment_id": "1",
+        "type": "temperature",
+        "value": -18.0,
+        "min": -19.0,
+        "max": -17.0,
+        "count": 4,
+        "last": -18.0,
+        "window": 300,
+        "aggregate": True,
+        "timestamp": START.isoformat(),
+    }
+
+
+def test_close_expired_only_closes_finished_windows():
+    aggregator = WindowAggregator()
+    aggregator.add("1", "temperature", -18.0, START, 300)
+    aggregator.add("1", "humidity", 60.0, START, 3600)
+
+    closed = aggregator.close_expired(START + timedelta(seconds=300))
+
+    assert [e["type"] for e in closed] == ["temperature"]
+    assert aggregator.close_expired(START + timedelta(seconds=301)) == []
+    assert len(aggregator.close_expired(START + timedelta(hours=1))) == 1
+
+
+def test_windows_are_kept_per_equipment_and_type():
+    aggregator = WindowAggregator()
+    aggregator.add("1", "temperature", -18.0, START, 300)
+    aggregator.add("2", "temperature", 4.0, START, 300)
+    aggregator.add("1", "energy", 120.0, START, 300)
+
+    closed = aggregator.close_expired(START + timedelta(minutes=5))
+
+    assert {(e["equipment_id"], e["type"]) for e in closed} == {
+        ("1", "temperature"),
+        ("2", "temperature"),
+        ("1", "energy"),
+    }
+
+
+# ============================================================
+# COMPACTAÇÃO
+# ============================================================
+
+def _raw(minute, value, sensor_type="temperature", equipment_id="1"):
+    return {
+        "equipment_id": equipment_id,
+        "type": sensor_type,
+        "value": value,
+        "timestamp": (START + timedelta(minutes=minute)).isoformat(),
+    }
+
+
+def _alarm(minute):
+    return {
+        "equipment_id": "1",
+        "type": "door_alarm",
+        "value": 130.0,
+        "timestamp": (START + timedelta(minutes=minute)).isoformat(),
+    }
+
+
+def test_compact_events_keeps_alarms_untouched():
+    alarm = _alarm(2)
+    events = [_raw(0, -18.0), _raw(1, -17.0), alarm, _raw(6, -19.0)]
+
+    compacted = compact_events(events, 300)
+
+    assert len(compacted) == 3
+    assert compacted[1] is alarm
+    assert compacted[0]["count"] == 2
+    assert compacted[0]["value"] == -17.5
+    assert compacted[2]["count"] == 1
+
+
+def test_compacted_aggregates_merge_into_larger_windows():
+    events = [_raw(minute, float(minute)) for minute in range(15)]
+
+    fine = compact_events(events, 300)
+    coarse = compact_events(fine, 900)
+
+    assert len(fine) == 3
+    assert coarse == compact_events(events, 900)
+    assert coarse[0]["count"] == 15
+    assert coarse[0]["min"] == 0.0
+    assert coarse[0]["max"] == 14.0
+    assert coarse[0]["last"] == 14.0
+
+
+def test_compact_events_keeps_larger_aggregates():
+    events = [_raw(minute, float(minute)) for minute in range(120)]
+    hourly = compact_events(events[:60], 3600)
+    quarter = compact_events(events[60:75], 900)
+    queue = [*hourly, *quarter, *events[75:]]
+
+    compacted = compact_events(queue, 900)
+
+    # Janela maior ou igual: mantidos como estão
+    assert compacted[0] is hourly[0]
+    assert compacted[1] is quarter[0]
+    assert [e["window"] for e in compacted] == [3600, 900, 900, 900, 900]
+    assert sum(e["count"] for e in compacted) == 120
+
+
+def test_compactor_works_in_resumable_chunks():
+    queue = [_raw(minute, -18.0) for minute in range(60)]
+    queue.insert(30, _alarm(30))
+    compactor = BacklogCompactor(watermark=5, chunk_size=20)
+    now = START + timedelta(days=1)
+
+    assert compactor.compact_step(queue, now)
+    first_cursor = compactor.cursor
+    assert 0 < first_cursor < len(queue)
+
+    while compactor.needs_compaction(queue) and compactor.compact_step(
+        queue, now
+    ):
+        pass
+
+    alarms = [e for e in queue if e["type"] == "door_alarm"]
+    telemetry = [e for e in queue if e["type"] == "temperature"]
+
+    assert alarms == [_alarm(30)]
+    assert sum(e["count"] for e in telemetry) == 60
+    assert len(queue) <= 5
+
+
+def test_compactor_skips_recent_events():
+    now = START + timedelta(minutes=10)
+    queue = [_raw(minute, -18.0) for minute in range(10)]
+    compactor = BacklogCompactor(watermark=1, windows=(300,))
+
+    while compactor.compact_step(queue, now):
+        pass
+
+    # Só os 5 primeiros minutos são mais antigos que a janela
+    assert queue[0]["count"] == 5
+    assert len(queue) == 6
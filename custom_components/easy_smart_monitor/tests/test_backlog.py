@@ -0,0 +1,205 @@
+"""
+Testes do backlog em disco e da compressão Gorilla.
+
+Foco:
+- Round-trip de séries (delta-of-delta / XOR)
+- Blocos de eventos com alarmes e telemetria
+- Registros persistidos e recarregados
+- Recuperação após queda (segmento truncado ou corrompido)
+"""
+
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+from custom_components.easy_smart_monitor.backlog import (
+    SEGMENT_SUFFIX,
+    SegmentBacklog,
+)
+from custom_components.easy_smart_monitor.gorilla import (
+    decode_block,
+    decode_series,
+    encode_block,
+    encode_series,
+)
+
+
+START = datetime(2026, 1, 11, 10, 0, tzinfo=timezone.utc)
+
+
+def _events(count=200):
+    events = []
+    for i in range(count):
+        ts = (START + timedelta(seconds=30 * i)).isoformat()
+        events.append(
+            {
+                "equipment_id": "1",
+                "type": "temperature",
+                "value": -18.0 + (i % 4) * 0.5,
+                "timestamp": ts,
+            }
+        )
+        events.append(
+            {
+                "equipment_id": 2,
+                "type": "energy",
+                "value": 1000.0 + i * 0.25,
+                "timestamp": ts,
+            }
+        )
+    events.append(
+        {
+            "equipment_id": "1",
+            "type": "door_alarm",
+            "value": 130.0,
+            "timestamp": (START + timedelta(seconds=45)).isoformat(),
+        }
+    )
+    return events
+
+
+def _sorted(events):
+    return sorted(
+        events,
+        key=lambda e: (e["timestamp"], str(e["equipment_id"]), e["type"]),
+    )
+
+
+# ============================================================
+# GORILLA
+# ============================================================
+
+def test_series_round_trip_irregular_points():
+    ts = 1_768_125_600_000
+    points = []
+    for i, jitter in enumerate([0, 0, 7, -3, 900, 0, 86_400_000, 1, 0, 0]):
+        ts += 30_000 + jitter
+        points.append((ts, [-18.0, -18.0, -17.5, 3.14159, -0.0][i % 5]))
+
+    assert list(decode_series(encode_series(points), len(points))) == points
+
+
+def test_block_round_trip_is_compact_and_chronological():
+    events = _events()
+    block = encode_block(events)
+    decoded = list(decode_block(block))
+
+    assert _sorted(decoded) == _sorted(events)
+    assert [e["timestamp"] for e in decoded] == sorted(
+        e["timestamp"] for e in decoded
+    )
+    assert len(block) * 5 < len(json.dumps(events))
+
+
+# ============================================================
+# SEGMENTOS
+# ============================================================
+
+def test_records_survive_reload(tmp_path):
+    backlog = SegmentBacklog(str(tmp_path / "backlog"))
+    backlog.append(_events(10))
+    backlog.append(_events(5))
+
+    reloaded = SegmentBacklog(str(tmp_path / "backlog"))
+    reloaded.load()
+
+    assert [r.count for r in reloaded.records] == [21, 11]
+    assert reloaded.event_count == 32
+
+    first = reloaded.records[0]
+    assert _sorted(reloaded.read_record(first)) == _sorted(_events(10))
+
+    reloaded.ack(first)
+    reloaded.append(_events(1))
+
+    assert [r.count for r in reloaded.records] == [11, 3]
+
+    # O cursor sobrevive ao reinício: o registro confirmado não volta
+    again = SegmentBacklog(str(tmp_path / "backlog"))
+    again.load()
+    assert [r.count for r in again.records] == [11, 3]
+
+
+def test_segments_roll_over_and_are_removed_when_acked(tmp_path):
+    backlog = SegmentBacklog(str(tmp_path / "backlog"), segment_max_bytes=1)
+    for _ in range(3):
+        backlog.append(_events(5))
+
+    assert len({r.seq for r in backlog.records}) == 3
+
+    for record in backlog.records:
+        backlog.ack(record)
+
+    assert backlog.records == []
+    assert backlog.size_bytes == 0
+    assert not [
+        name for name in os.listdir(tmp_path / "backlog")
+        if name.endswith(SEGMENT_SUFFIX)
+    ]
+
+    backlog.append(_events(1))
+    reloaded = SegmentBacklog(str(tmp_path / "backlog"))
+    reloaded.load()
+    assert [r.count for r in reloaded.records] == [3]
+
+
+# ============================================================
+# CONSISTÊNCIA APÓS QUEDA
+# ============================================================
+
+def test_recovery_after_truncation_at_random_offsets(tmp_path):
+    source = tmp_path / "source"
+    backlog = SegmentBacklog(str(source))
+    batches = [_events(count) for count in (3, 8, 1, 12, 5)]
+    ends = [
+        record.offset + record.size
+        for record in (backlog.append(batch) for batch in batches)
+    ]
+    (path,) = source.glob(f"*{SEGMENT_SUFFIX}")
+    data = path.read_bytes()
+
+    rng = random.Random(1234)
+    offsets = {0, len(data), *ends, *(e - 1 for e in ends)}
+    offsets.update(rng.randrange(len(data)) for _ in range(50))
+
+    for offset in sorted(offsets):
+        directory = tmp_path / f"crash_{offset}"
+        directory.mkdir()
+        (directory / path.name).write_bytes(data[:offset])
+
+        recovered = SegmentBacklog(str(directory))
+        recovered.load()
+
+        valid = sum(1 for end in ends if end <= offset)
+        assert len(recovered.records) == valid
+        for record, batch in zip(recovered.records, batches):
+            assert _sorted(recovered.read_record(record)) == _sorted(batch)
+
+        # O lixo do registro incompleto é removido; novos registros
+        # continuam legíveis após o último válido
+        assert recovered.size_bytes == (ends[valid - 1] if valid else 0)
+        if valid:
+            assert (directory / path.name).stat().st_size == ends[valid - 1]
+
+        recovered.append(_events(2))
+        reloaded = SegmentBacklog(str(directory))
+        reloaded.load()
+        assert len(reloaded.records) == valid + 1
+
+
+def test_recovery_stops_at_corrupted_record(tmp_path):
+    backlog = SegmentBacklog(str(tmp_path))
+    first = backlog.append(_events(3))
+    second = backlog.append(_events(4))
+    backlog.append(_events(5))
+
+    (path,) = tmp_path.glob(f"*{SEGMENT_SUFFIX}")
+    data = bytearray(path.read_bytes())
+    data[second.offset + second.size // 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    recovered = SegmentBacklog(str(tmp_path))
+    recovered.load()
+
+    assert recovered.records == [first]
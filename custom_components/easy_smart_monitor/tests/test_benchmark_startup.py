@@ -0,0 +1,176 @@
+"""
+Benchmark do setup: dispositivos e entidades de uma frota.
+
+Mede, com o device registry real, o tempo para:
+- Criar / atualizar os dispositivos de todos os equipamentos de uma vez
+  (`async_sync_equipment_devices`, como no setup da entry)
+- Configurar as 7 plataformas, resolvendo o dispositivo de cada entidade
+  como o entity platform do HA faz
+
+E compara com o caminho anterior (DeviceInfo completo em cada entidade).
+
+Rodar com `pytest -s` para ver o relatório.
+"""
+
+from __future__ import annotations
+
+import importlib
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.easy_smart_monitor import entity as entity_module
+from custom_components.easy_smart_monitor.const import DOMAIN, PLATFORMS
+from custom_components.easy_smart_monitor.devices import (
+    async_sync_equipment_devices,
+    equipment_device_info,
+)
+
+
+# Sensores (3), porta, switches (2), numbers (2), selects (4), sirene
+# e botão
+ENTITIES_PER_EQUIPMENT = 14
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def _fleet(size: int) -> dict:
+    return {
+        f"eq{i}": {
+            "name": f"Equipamento {i}",
+            "location": f"Loja {i % 20}",
+        }
+        for i in range(size)
+    }
+
+
+@pytest.fixture
+def registry(mock_hass, mock_entry):
+    """Device registry real sobre o hass simulado (sem disco)."""
+    mock_entry.domain = DOMAIN
+    mock_hass.config_entries.async_get_entry = {
+        mock_entry.entry_id: mock_entry
+    }.get
+
+    # Stubs simples: o tempo medido é o do registry, não o dos mocks
+    mock_hass.bus.async_fire = lambda *args, **kwargs: None
+    registry = dr.DeviceRegistry(mock_hass)
+    registry.async_schedule_save = lambda: None
+    registry.devices = dr.DeviceRegistryItems()
+    registry.deleted_devices = dr.DeviceRegistryItems()
+    registry._device_data = registry.devices.data
+
+    areas = MagicMock()
+    areas.async_get_or_create = lambda name: SimpleNamespace(id=name)
+
+    with patch(
+        "custom_components.easy_smart_monitor.devices.dr.async_get",
+        return_value=registry,
+    ), patch(
+        "homeassistant.helpers.area_registry.async_get",
+        return_value=areas,
+    ), patch(
+        "custom_components.easy_smart_monitor.select.async_get_entity_index"
+    ):
+        yield registry
+
+
+async def _setup_platforms(coordinator, registry):
+    """Setup das plataformas; retorna (entidades, dispositivos)."""
+    entities = []
+    devices = []
+
+    def _add_entities(new_entities):
+        # Mesmo passo do entity platform do HA por entidade
+        for entity in new_entities:
+            entities.append(entity)
+            if device_info := entity.device_info:
+                devices.append(
+                    registry.async_get_or_create(
+                        config_entry_id=coordinator.entry.entry_id,
+                        **device_info,
+                    )
+                )
+
+    for platform in PLATFORMS:
+        module = importlib.import_module(
+            f"custom_components.easy_smart_monitor.{platform}"
+        )
+        await module.async_setup_entry(
+            coordinator.hass, coordinator.entry, _add_entities
+        )
+    return entities, devices
+
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+
+@pytest.mark.parametrize("size", [100, 1000])
+@pytest.mark.asyncio
+async def test_benchmark_startup(
+    coordinator_factory, mock_hass, registry, size
+):
+    coordinator = await coordinator_factory(_fleet(size))
+    mock_hass.data[DOMAIN] = {coordinator.entry.entry_id: coordinator}
+    equipments = coordinator.storage.get_equipments()
+
+    # Caminho anterior: cada entidade traz o DeviceInfo completo
+    with patch.object(
+        entity_module,
+        "equipment_device_link",
+        lambda equipment_id: equipment_device_info(
+            equipment_id, equipments[equipment_id]
+        ),
+    ):
+        started = time.perf_counter()
+        await _setup_platforms(coordinator, registry)
+        before = time.perf_counter() - started
+
+    registry.devices = dr.DeviceRegistryItems()
+    registry._device_data = registry.devices.data
+
+    # Dispositivos de uma vez no setup da entry
+    started = time.perf_counter()
+    async_sync_equipment_devices(
+        mock_hass, coordinator.entry, equipments
+    )
+    sync = time.perf_counter() - started
+
+    # Plataformas só referenciam o dispositivo
+    started = time.perf_counter()
+    entities, devices = await _setup_platforms(coordinator, registry)
+    platforms = time.perf_counter() - started
+
+    print(
+        "\n[bench] equipamentos=%d entidades=%d antes=%.1fms "
+        "dispositivos=%.1fms plataformas=%.1fms total=%.1fms"
+        % (
+            size,
+            len(entities),
+            before * 1000,
+            sync * 1000,
+            platforms * 1000,
+            (sync + platforms) * 1000,
+        )
+    )
+
+    # Um dispositivo por equipamento, criado antes das entidades
+    assert len(registry.devices) == size
+    device = registry.async_get_device(identifiers={(DOMAIN, "eq7")})
+    assert device.name == "Equipamento 7"
+    assert device.suggested_area == "Loja 7"
+
+    # Toda entidade de equipamento referencia um dispositivo existente
+    per_equipment = [e for e in entities if e.device_info]
+    assert len(per_equipment) == len(devices) == size * ENTITIES_PER_EQUIPMENT
+    assert all(
+        set(e.device_info) == {"identifiers"} for e in per_equipment
+    )
+    assert {d.id for d in devices} == set(registry.devices)
@@ -0,0 +1,192 @@
+"""
+Benchmark ponta a ponta: coordinator -> cliente HTTP -> API local.
+
+Simula uma frota de equipamentos e mede:
+- Eventos entregues por segundo
+- Latência de upload (p50 / p99)
+- Tempo de bloqueio do event loop
+
+Tamanho da simulação ajustável por variáveis de ambiente:
+- ESM_BENCH_EQUIPMENTS (padrão 200)
+- ESM_BENCH_CYCLES (padrão 10)
+- ESM_BENCH_LATENCY (segundos por requisição, padrão 0.005)
+
+Rodar com `pytest -s` para ver o relatório.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import time
+from unittest.mock import AsyncMock
+
+import aiohttp
+import pytest
+
+from homeassistant.core import State
+
+from custom_components.easy_smart_monitor.client import (
+    EasySmartMonitorApiClient,
+)
+from custom_components.easy_smart_monitor.coordinator import (
+    EasySmartMonitorCoordinator,
+)
+
+
+EQUIPMENTS = int(os.environ.get("ESM_BENCH_EQUIPMENTS", "200"))
+CYCLES = int(os.environ.get("ESM_BENCH_CYCLES", "10"))
+LATENCY = float(os.environ.get("ESM_BENCH_LATENCY", "0.005"))
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+class LoopLagMonitor:
+    """Mede quanto tempo o event loop ficou bloqueado."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.blocked = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            if lag > 0:
+                self.blocked += lag
+                self.max_lag = max(self.max_lag, lag)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _fleet(size: int) -> dict:
+    return {
+        "equipments": {
+            f"eq{i}": {
+                "id": f"eq{i}",
+                "name": f"Equipamento {i}",
+                "location": "Bench",
+                "enabled": True,
+                "collect_interval": 30,
+                "door": {"enable_siren": True, "open_timeout": 120},
+                "sensors": {
+                    "temperature": f"sensor.temp_{i}",
+                    "humidity": f"sensor.hum_{i}",
+                    "energy": f"sensor.energy_{i}",
+                    "door": f"binary_sensor.door_{i}",
+                },
+            }
+            for i in range(size)
+        }
+    }
+
+
+def _publish_states(states: dict[str, State], size: int, cycle: int) -> None:
+    """Simula novas leituras de todos os sensores da frota."""
+    for i in range(size):
+        states[f"sensor.temp_{i}"] = State(
+            f"sensor.temp_{i}", str(-18.0 + (cycle + i) % 7 * 0.5)
+        )
+        states[f"sensor.hum_{i}"] = State(
+            f"sensor.hum_{i}", str(60 + (cycle + i) % 11)
+        )
+        states[f"sensor.energy_{i}"] = State(
+            f"sensor.energy_{i}", str(100.0 + cycle + i)
+        )
+        states[f"binary_sensor.door_{i}"] = State(
+            f"binary_sensor.door_{i}", "off"
+        )
+
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+
+@pytest.mark.asyncio
+async def test_benchmark_fleet_upload_throughput(
+    live_mode, api_server, mock_hass, mock_entry
+):
+    api_server.latency = LATENCY
+    states: dict[str, State] = mock_hass.test_states
+
+    async with aiohttp.ClientSession() as session:
+        client = EasySmartMonitorApiClient(
+            base_url=api_server.base_url,
+            username="user",
+            password="pass",
+            session=session,
+        )
+
+        upload_latencies: list[float] = []
+        send_events = client.send_events
+
+        async def timed_send_events(events):
+            start = time.perf_counter()
+            await send_events(events)
+            upload_latencies.append(time.perf_counter() - start)
+
+        client.send_events = timed_send_events
+
+        coordinator = EasySmartMonitorCoordinator(
+            mock_hass, mock_entry, client
+        )
+        coordinator.storage._store.async_load = AsyncMock(
+            return_value=_fleet(EQUIPMENTS)
+        )
+        await coordinator.async_initialize()
+
+        monitor = LoopLagMonitor()
+        monitor.start()
+        started = time.perf_counter()
+
+        for cycle in range(CYCLES):
+            _publish_states(states, EQUIPMENTS, cycle)
+            await coordinator.async_process()
+
+        elapsed = time.perf_counter() - started
+        await monitor.stop()
+
+    delivered = len(api_server.events)
+
+    print(
+        "\n[bench] equipamentos=%d ciclos=%d eventos=%d "
+        "eventos/s=%.0f upload_p50=%.1fms upload_p99=%.1fms "
+        "loop_bloqueado=%.1fms (max %.1fms) bytes=%d"
+        % (
+            EQUIPMENTS,
+            CYCLES,
+            delivered,
+            delivered / elapsed,
+            _percentile(upload_latencies, 50) * 1000,
+            _percentile(upload_latencies, 99) * 1000,
+            monitor.blocked * 1000,
+            monitor.max_lag * 1000,
+            sum(batch.size for batch in api_server.batches),
+        )
+    )
+
+    assert coordinator.queue_size == 0
+    assert delivered == EQUIPMENTS * 3 * CYCLES
+    assert statistics.mean(upload_latencies) >= LATENCY
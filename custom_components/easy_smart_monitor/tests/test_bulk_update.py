@@ -0,0 +1,318 @@
+"""
+Testes das alterações de configuração em lote.
+
+Foco:
+- Validação completa antes de aplicar: nada muda se algo for inválido
+- Uma única gravação do storage por transação
+- Uma atualização de entidades por equipamento afetado
+- Filtro por sensor (deadband / heartbeat) e modo de telemetria
+  configuráveis em lote
+- Serviço `bulk_update`: schema, escolha da entry e erros de validação
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.easy_smart_monitor.const import DOMAIN
+from custom_components.easy_smart_monitor.services import (
+    BULK_UPDATE_SCHEMA,
+    SERVICE_BULK_UPDATE,
+    async_register_services,
+)
+
+
+EQUIPMENTS = {"1": "Loja", "2": "Loja", "3": "Depósito"}
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory):
+    coordinator = await coordinator_factory(
+        {
+            equipment_id: {"name": equipment_id, "location": location}
+            for equipment_id, location in EQUIPMENTS.items()
+        }
+    )
+    coordinator.async_update_equipment = MagicMock()
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_single_write(coordinator):
+    storage = coordinator.storage
+
+    updated = await coordinator.async_bulk_update(
+        [
+            {"location": "Loja", "collect_interval": 60},
+            {
+                "equipment_ids": ["2", "3"],
+                "enable_siren": False,
+                "open_timeout": 300,
+                "sensors": {"door": "binary_sensor.porta"},
+            },
+            # Sem efeito: já é o valor atual
+            {"equipment_ids": ["3"], "enabled": True},
+        ]
+    )
+
+    assert updated == ["1", "2", "3"]
+    storage._store.async_save.assert_awaited_once()
+    assert storage.has_pending_save is False
+
+    assert storage.get_equipment("1")["collect_interval"] == 60
+    assert storage.get_equipment("1")["door"]["enable_siren"] is True
+    assert storage.get_equipment("2")["collect_interval"] == 60
+    assert storage.get_equipment("2")["door"] == {
+        "enable_siren": False,
+        "open_timeout": 300,
+    }
+    assert storage.get_equipment("3")["collect_interval"] == 30
+    assert storage.get_sensor_source("3", "door") == "binary_sensor.porta"
+    assert storage.get_sensor_source("3", "temperature") is None
+
+    assert [
+        c.args[0] for c in coordinator.async_update_equipment.call_args_list
+    ] == ["1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_only_changed_equipments(coordinator):
+    updated = await coordinator.async_bulk_update(
+        [
+            {"location": "Loja", "enabled": True},
+            {"equipment_ids": ["2"], "collect_interval": 90},
+        ]
+    )
+
+    assert updated == ["2"]
+    coordinator.async_update_equipment.assert_called_once_with("2")
+
+    # Nada mudou: nenhuma gravação, nenhuma atualização
+    coordinator.storage._store.async_save.reset_mock()
+    coordinator.async_update_equipment.reset_mock()
+
+    assert await coordinator.async_bulk_update(
+        [{"equipment_ids": ["2"], "collect_interval": 90}]
+    ) == []
+    coordinator.storage._store.async_save.assert_not_awaited()
+    coordinator.async_update_equipment.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_atomic(coordinator):
+    storage = coordinator.storage
+    before = {
+        equipment_id: dict(equipment)
+        for equipment_id, equipment in storage.get_equipments().items()
+    }
+
+    with pytest.raises(ValueError) as err:
+        await coordinator.async_bulk_update(
+            [
+                # Válida, mas não pode ser aplicada sozinha
+                {"location": "Loja", "collect_interval": 60},
+                {"equipment_ids": ["9"], "enabled": False},
+                {"location": "Fábrica", "enabled": False},
+                {"equipment_ids": ["1"], "collect_interval": 5},
+                {"equipment_ids": ["1"], "open_timeout": "120"},
+                {"equipment_ids": ["1"], "sensors": {"co2": None}},
+                {
+                    "equipment_ids": ["1"],
+                    "sensors": {"door": "sensor.temperatura"},
+                },
+                {"equipment_ids": ["1"], "color": "azul"},
+                {"collect_interval": 60},
+                {"equipment_ids": ["1"]},
+            ]
+        )
+
+    message = str(err.value)
+    for expected in (
+        "alteração 1: equipamento inexistente: 9",
+        "alteração 2: nenhum equipamento em Fábrica",
+        "alteração 3: collect_interval deve ser inteiro entre 10 e 3600",
+        "alteração 4: open_timeout deve ser inteiro entre 10 e 900",
+        "alteração 5: tipo de sensor inválido: co2",
+        "alteração 6: entidade inválida para door: sensor.temperatura",
+        "alteração 7: campos desconhecidos: color",
+        "alteração 8: informe equipment_ids e/ou location",
+        "alteração 9: nenhum campo a alterar",
+    ):
+        assert expected in message
+    assert "alteração 0" not in message
+
+    assert storage.get_equipments() == before
+    storage._store.async_save.assert_not_awaited()
+    coordinator.async_update_equipment.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_sensor_filters(coordinator):
+    storage = coordinator.storage
+
+    updated = await coordinator.async_bulk_update(
+        BULK_UPDATE_SCHEMA(
+            {
+                "changes": [
+                    {
+                        "location": "Loja",
+                        "filters": {
+                            "temperature": {
+                                "deadband": "0.5",
+                                "heartbeat": "600",
+                            }
+                        },
+                    },
+                    # Só o modo muda; deadband / heartbeat continuam
+                    {
+                        "equipment_ids": ["2"],
+                        "filters": {
+                            "temperature": {"deadband_mode": "percent"}
+                        },
+                    },
+                ]
+            }
+        )["changes"]
+    )
+
+    assert updated == ["1", "2"]
+    assert storage.get_sensor_filter("1", "temperature") == {
+        "deadband": 0.5,
+        "deadband_mode": "absolute",
+        "heartbeat": 600,
+    }
+    assert storage.get_sensor_filter("2", "temperature") == {
+        "deadband": 0.5,
+        "deadband_mode": "percent",
+        "heartbeat": 600,
+    }
+    assert "filters" not in storage.get_equipment("3")
+
+    with pytest.raises(ValueError) as err:
+        await coordinator.async_bulk_update(
+            [
+                {"equipment_ids": ["3"], "filters": {"door": {}}},
+                {
+                    "equipment_ids": ["3"],
+                    "filters": {
+                        "humidity": {
+                            "deadband": -1,
+                            "deadband_mode": "log",
+                            "heartbeat": 5,
+                            "window": 60,
+                        }
+                    },
+                },
+            ]
+        )
+
+    message = str(err.value)
+    for expected in (
+        "alteração 0: tipo de sensor sem filtro: door",
+        "alteração 1: campos desconhecidos no filtro de humidity: window",
+        "alteração 1: deadband de humidity deve ser um número >= 0",
+        "alteração 1: deadband_mode de humidity deve ser absolute ou "
+        "percent",
+        "alteração 1: heartbeat de humidity deve ser inteiro entre 10 e "
+        "86400",
+    ):
+        assert expected in message
+    assert "filters" not in storage.get_equipment("3")
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_telemetry_mode(coordinator):
+    storage = coordinator.storage
+
+    updated = await coordinator.async_bulk_update(
+        BULK_UPDATE_SCHEMA(
+            {
+                "changes": [
+                    {
+                        "location": "Loja",
+                        "telemetry": {"mode": "aggregate", "window": "900"},
+                    },
+                    {"equipment_ids": ["2"], "telemetry": {"mode": "raw"}},
+                ]
+            }
+        )["changes"]
+    )
+
+    assert updated == ["1", "2"]
+    assert storage.get_telemetry_mode("1") == {
+        "mode": "aggregate",
+        "window": 900,
+    }
+    assert storage.get_telemetry_mode("2") == {"mode": "raw", "window": 900}
+    assert "telemetry" not in storage.get_equipment("3")
+
+    with pytest.raises(ValueError) as err:
+        await coordinator.async_bulk_update(
+            [
+                {
+                    "equipment_ids": ["3"],
+                    "telemetry": {"mode": "média", "window": 5},
+                },
+                {"equipment_ids": ["3"], "telemetry": {"size": 1}},
+            ]
+        )
+
+    message = str(err.value)
+    for expected in (
+        "alteração 0: mode deve ser raw ou aggregate",
+        "alteração 0: window deve ser inteiro entre 60 e 86400",
+        "alteração 1: campos desconhecidos em telemetry: size",
+    ):
+        assert expected in message
+    assert "telemetry" not in storage.get_equipment("3")
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_service(coordinator):
+    hass = MagicMock()
+    hass.services.has_service.return_value = False
+    hass.data = {DOMAIN: {"test_entry": coordinator}}
+
+    async_register_services(hass)
+
+    handler = next(
+        c.args[2]
+        for c in hass.services.async_register.call_args_list
+        if c.args[:2] == (DOMAIN, SERVICE_BULK_UPDATE)
+    )
+
+    data = BULK_UPDATE_SCHEMA(
+        {
+            "changes": [
+                {
+                    "equipment_ids": "3",
+                    "collect_interval": "45",
+                    "enabled": "off",
+                }
+            ]
+        }
+    )
+    assert data["changes"][0] == {
+        "equipment_ids": ["3"],
+        "collect_interval": 45,
+        "enabled": False,
+    }
+
+    call = MagicMock(data=data)
+    assert await handler(call) == {"updated": ["3"]}
+    assert coordinator.storage.get_equipment("3")["enabled"] is False
+
+    call = MagicMock(
+        data=BULK_UPDATE_SCHEMA(
+            {"changes": [{"equipment_ids": ["9"], "enabled": True}]}
+        )
+    )
+    with pytest.raises(ServiceValidationError, match="inexistente: 9"):
+        await handler(call)
+
+    call = MagicMock(data={"entry_id": "outra", "changes": []})
+    with pytest.raises(ServiceValidationError, match="entry_id"):
+        await handler(call)
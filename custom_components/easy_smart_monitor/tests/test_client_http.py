@@ -0,0 +1,146 @@
+"""
+Testes do EasySmartMonitorApiClient contra a API local (stand-in).
+
+Foco:
+- Caminho HTTP real (TEST_MODE desativado)
+- Negociação e round-trip JSON / MessagePack
+- Tratamento de 401, 413, 415 e 429
+"""
+
+import aiohttp
+import pytest
+from aiohttp import ClientResponseError
+
+from custom_components.easy_smart_monitor.client import (
+    EasySmartMonitorApiClient,
+)
+from custom_components.easy_smart_monitor.const import (
+    CONTENT_TYPE_JSON,
+    CONTENT_TYPE_MSGPACK,
+)
+
+
+EVENTS = [
+    {
+        "equipment_id": "1",
+        "type": "temperature",
+        "value": -18.5,
+        "timestamp": "2026-01-11T10:00:00+00:00",
+    },
+    {
+        "equipment_id": "1",
+        "type": "door_alarm",
+        "value": 130.0,
+        "timestamp": "2026-01-11T10:00:05+00:00",
+    },
+]
+
+
+def _client(api_server, session) -> EasySmartMonitorApiClient:
+    return EasySmartMonitorApiClient(
+        base_url=api_server.base_url,
+        username="user",
+        password="pass",
+        session=session,
+    )
+
+
+# ============================================================
+# ROUND-TRIP
+# ============================================================
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "content_types, expected",
+    [
+        ([CONTENT_TYPE_JSON], CONTENT_TYPE_JSON),
+        ([CONTENT_TYPE_JSON, CONTENT_TYPE_MSGPACK], CONTENT_TYPE_MSGPACK),
+    ],
+)
+async def test_send_events_round_trip(
+    live_mode, api_server, content_types, expected
+):
+    api_server.content_types = content_types
+
+    async with aiohttp.ClientSession() as session:
+        client = _client(api_server, session)
+        await client.send_events(EVENTS)
+
+    assert client.content_type == expected
+    assert api_server.batches[0].content_type == expected
+    assert api_server.events == EVENTS
+
+
+@pytest.mark.asyncio
+async def test_unsupported_format_falls_back_to_json(live_mode, api_server):
+    async with aiohttp.ClientSession() as session:
+        client = _client(api_server, session)
+        await client.async_negotiate_encoding()
+        assert client.content_type == CONTENT_TYPE_MSGPACK
+
+        api_server.content_types = [CONTENT_TYPE_JSON]
+        await client.send_events(EVENTS)
+
+    assert client.content_type == CONTENT_TYPE_JSON
+    assert api_server.events == EVENTS
+
+
+# ============================================================
+# AUTENTICAÇÃO
+# ============================================================
+
+@pytest.mark.asyncio
+async def test_expired_token_is_refreshed(live_mode, api_server):
+    async with aiohttp.ClientSession() as session:
+        client = _client(api_server, session)
+        await client.send_events(EVENTS)
+
+        api_server.expire_tokens()
+        await client.send_events(EVENTS)
+
+    assert ("POST", "/auth/refresh") in api_server.requests
+    assert len(api_server.events) == 4
+
+
+@pytest.mark.asyncio
+async def test_revoked_token_falls_back_to_login(live_mode, api_server):
+    async with aiohttp.ClientSession() as session:
+        client = _client(api_server, session)
+        await client.send_events(EVENTS)
+
+        api_server.revoke_tokens()
+        await client.send_events(EVENTS)
+
+    assert api_server.requests.count(("POST", "/auth/login")) == 2
+    assert len(api_server.events) == 4
+
+
+# ============================================================
+# ERROS HTTP
+# ============================================================
+
+@pytest.mark.asyncio
+async def test_rate_limited_request_raises(live_mode, api_server):
+    api_server.reject_next(429, headers={"Retry-After": "30"})
+
+    async with aiohttp.ClientSession() as session:
+        client = _client(api_server, session)
+
+        with pytest.raises(ClientResponseError) as err:
+            await client.send_events(EVENTS)
+
+    assert err.value.status == 429
+    assert api_server.events == []
+
+
+@pytest.mark.asyncio
+async def test_payload_too_large_raises(live_mode, api_server):
+    api_server.max_body_bytes = 16
+
+    async with aiohttp.ClientSession() as session:
+        client = _client(api_server, session)
+
+        with pytest.raises(ClientResponseError) as err:
+            await client.send_events(EVENTS)
+
+    assert err.value.status == 413
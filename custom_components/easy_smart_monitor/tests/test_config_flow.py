@@ -64,7 +64,8 @@ async def test_config_flow_user_step_in_test_mode(hass: HomeAssistant):
     assert entry.domain == DOMAIN
     assert entry.data["api_host"] == "http://fake-api"
     assert entry.data["username"] == "test_user"
-    assert entry.options["equipments"] == []
+    # Equipamentos ficam no registro do storage, não nas options
+    assert "equipments" not in entry.options
     assert entry.options["send_interval"] == 60
     assert entry.options["paused"] is False
 
@@ -203,11 +204,15 @@ async def test_options_flow_add_equipment(hass: HomeAssistant):
 
     assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
 
-    updated_entry = hass.config_entries.async_get_entry(entry.entry_id)
-    equipments = updated_entry.options["equipments"]
+    storage = hass.data[DOMAIN][entry.entry_id].storage
+    equipments = [
+        e
+        for e in storage.get_equipments().values()
+        if e["name"] == "Freezer Teste"
+    ]
 
     assert len(equipments) == 1
-    assert equipments[0]["name"] == "Freezer Teste"
     assert equipments[0]["location"] == "Cozinha"
     assert equipments[0]["enabled"] is True
-    assert equipments[0]["sensors"] == []
\ No newline at end of file
+    assert equipments[0]["collect_interval"] == 30
+    assert storage.get_equipment_by_uuid(equipments[0]["uuid"]) is not None
\ No newline at end of file
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from custom_components.easy_smart_monitor.coordinator import (
     EasySmartMonitorCoordinator
@@ -20,4 +20,193 @@ async def test_enqueue_and_persist_queue():
     await coordinator._enqueue_event({"event": "test"})
 
     assert len(coordinator._queue) == 1
-    coordinator._store.async_save.assert_called_once()
\ No newline at end of file
+    coordinator._store.async_save.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_failed_flush_compacts_queue_above_watermark(
+    mock_hass, mock_entry
+):
+    from datetime import timedelta
+
+    from homeassistant.util.dt import utcnow
+
+    client = MagicMock()
+    client.send_events = AsyncMock(side_effect=OSError("API offline"))
+
+    coordinator = EasySmartMonitorCoordinator(mock_hass, mock_entry, client)
+    coordinator._compactor.watermark = 100
+    # Disco indisponível: eventos ficam em memória
+    coordinator._backlog.append = MagicMock(side_effect=OSError("disco"))
+
+    start = utcnow() - timedelta(days=1)
+    for minute in range(500):
+        coordinator._queue.append(
+            {
+                "equipment_id": "1",
+                "type": "temperature",
+                "value": -18.0,
+                "timestamp": (start + timedelta(minutes=minute)).isoformat(),
+            }
+        )
+    coordinator._queue.append(
+        {
+            "equipment_id": "1",
+            "type": "manual_alarm",
+            "timestamp": start.isoformat(),
+        }
+    )
+
+    with patch(
+        "custom_components.easy_smart_monitor.coordinator.TEST_MODE", False
+    ):
+        await coordinator._flush_queue()
+
+    assert coordinator.queue_size <= 100
+    assert coordinator._queue[-1]["type"] == "manual_alarm"
+    assert sum(
+        e.get("count", 1)
+        for e in coordinator._queue
+        if e["type"] == "temperature"
+    ) == 500
+
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_spills_to_backlog_and_resends(
+    mock_hass, mock_entry
+):
+    client = MagicMock()
+    client.send_events = AsyncMock(side_effect=OSError("API offline"))
+
+    coordinator = EasySmartMonitorCoordinator(mock_hass, mock_entry, client)
+    event = {
+        "equipment_id": "1",
+        "type": "temperature",
+        "value": -18.0,
+        "timestamp": "2026-01-11T10:00:00+00:00",
+    }
+    coordinator._queue.append(dict(event))
+
+    with patch(
+        "custom_components.easy_smart_monitor.coordinator.TEST_MODE", False
+    ):
+        await coordinator._flush_queue()
+
+        assert coordinator._queue == []
+        assert coordinator.queue_size == 1
+        assert len(coordinator._backlog.records) == 1
+
+        client.send_events = AsyncMock()
+        await coordinator._flush_queue()
+
+    client.send_events.assert_called_once_with([event])
+    assert coordinator.queue_size == 0
+    assert coordinator._backlog.records == []
+
+
+@pytest.mark.asyncio
+async def test_outage_compacts_durable_queue_above_watermark(
+    mock_hass, mock_entry
+):
+    from datetime import timedelta
+
+    from homeassistant.util.dt import utcnow
+
+    client = MagicMock()
+    client.send_events = AsyncMock(side_effect=OSError("API offline"))
+
+    coordinator = EasySmartMonitorCoordinator(mock_hass, mock_entry, client)
+    coordinator._retention.watermark = 100
+
+    start = utcnow() - timedelta(days=1)
+    with patch(
+        "custom_components.easy_smart_monitor.coordinator.TEST_MODE", False
+    ):
+        # Um envio falho por ciclo: cada ciclo vira um registro em disco
+        for cycle in range(5):
+            for minute in range(100):
+                coordinator._enqueue_event(
+                    {
+                        "equipment_id": "1",
+                        "type": "temperature",
+                        "value": -18.0 + minute % 7,
+                        "timestamp": (
+                            start + timedelta(minutes=100 * cycle + minute)
+                        ).isoformat(),
+                    }
+                )
+            coordinator._enqueue_event(
+                {
+                    "equipment_id": "1",
+                    "type": "manual_alarm",
+                    "timestamp": start.isoformat(),
+                }
+            )
+            await coordinator._flush_queue()
+
+    backlog = coordinator._backlog
+    assert coordinator._queue == []
+    assert backlog.event_count <= 100
+    events = [e for r in backlog.records for e in backlog.read_record(r)]
+    assert sum(
+        e.get("count", 1) for e in events if e["type"] == "temperature"
+    ) == 500
+    assert sum(e["type"] == "manual_alarm" for e in events) == 5
+    assert events[0]["aggregate"] is True
+
+
+@pytest.mark.asyncio
+async def test_backlog_sensors_follow_commit_and_ack(mock_hass, mock_entry):
+    from custom_components.easy_smart_monitor.sensor import (
+        EasySmartMonitorBacklogDiskUsageSensor,
+        EasySmartMonitorOldestBufferedEventSensor,
+    )
+
+    mock_hass.data = {}
+    mock_hass.async_run_hass_job = lambda job, *args: job.target(*args)
+    client = MagicMock()
+    client.send_events = AsyncMock(side_effect=OSError("API offline"))
+    coordinator = EasySmartMonitorCoordinator(mock_hass, mock_entry, client)
+
+    written = []
+    disk = EasySmartMonitorBacklogDiskUsageSensor(coordinator)
+    oldest = EasySmartMonitorOldestBufferedEventSensor(coordinator)
+    for sensor in (disk, oldest):
+        sensor.hass = mock_hass
+        sensor.async_write_ha_state = MagicMock(
+            side_effect=lambda s=sensor: written.append(
+                (type(s).__name__, s.native_value)
+            )
+        )
+        await sensor.async_added_to_hass()
+
+    coordinator._queue.append(
+        {
+            "equipment_id": "1",
+            "type": "temperature",
+            "value": -18.0,
+            "timestamp": "2026-01-11T10:00:00+00:00",
+        }
+    )
+
+    with patch(
+        "custom_components.easy_smart_monitor.coordinator.TEST_MODE", False
+    ):
+        # Envio falho: o grupo vai para o disco, sem ciclo de coleta
+        await coordinator._flush_queue()
+        assert [name for name, _ in written] == [
+            "EasySmartMonitorBacklogDiskUsageSensor",
+            "EasySmartMonitorOldestBufferedEventSensor",
+        ]
+        assert written[0][1] == coordinator.backlog_size_bytes > 0
+        assert written[1][1] > 0
+
+        # Reenvio confirmado: backlog vazio
+        written.clear()
+        client.send_events = AsyncMock()
+        await coordinator._flush_queue()
+
+    assert dict(written) == {
+        "EasySmartMonitorBacklogDiskUsageSensor": 0,
+        "EasySmartMonitorOldestBufferedEventSensor": 0,
+    }
@@ -0,0 +1,135 @@
+"""
+Testes da etapa de amostragem do coordinator.
+
+Foco:
+- Leituras repetidas não entram na fila (deadband)
+- Heartbeat mantém envios periódicos
+- Fontes sem atualização não geram leituras novas
+- Modo agregado gera um evento por janela
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+
+from homeassistant.core import State
+from homeassistant.util.dt import utcnow
+
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture
+def states(mock_hass):
+    return mock_hass.test_states
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory):
+    return await coordinator_factory(
+        {
+            "1": {
+                "id": "1",
+                "name": "Freezer",
+                "location": "Cozinha",
+                "enabled": True,
+                "sensors": {"temperature": "sensor.freezer"},
+            }
+        }
+    )
+
+
+def _set(states, entity_id, value, updated_at):
+    states[entity_id] = State(
+        entity_id,
+        str(value),
+        last_changed=updated_at,
+        last_updated=updated_at,
+    )
+
+
+# ============================================================
+# DEADBAND / HEARTBEAT
+# ============================================================
+
+@pytest.mark.asyncio
+async def test_repeated_readings_are_not_enqueued(coordinator, states):
+    equipment = coordinator.storage.get_equipment("1")
+    now = utcnow()
+
+    for offset, value in enumerate((-18.0, -18.0, -18.0, -17.5)):
+        ts = now + timedelta(seconds=offset * 30)
+        _set(states, "sensor.freezer", value, ts)
+        await coordinator._process_equipment("1", equipment, ts)
+
+    assert [e["value"] for e in coordinator._queue] == [-18.0, -17.5]
+
+
+@pytest.mark.asyncio
+async def test_deadband_and_heartbeat_per_binding(coordinator, states):
+    await coordinator.storage.set_sensor_filter(
+        "1", "temperature", deadband=1.0, heartbeat=120
+    )
+    equipment = coordinator.storage.get_equipment("1")
+    now = utcnow()
+
+    for offset, value in enumerate((-18.0, -18.4, -18.8, -18.8, -19.5)):
+        ts = now + timedelta(seconds=offset * 50)
+        _set(states, "sensor.freezer", value, ts)
+        await coordinator._process_equipment("1", equipment, ts)
+
+    # -18.8 entra pelo heartbeat (150s), -19.5 fica dentro da banda
+    assert [e["value"] for e in coordinator._queue] == [-18.0, -18.8]
+
+
+# ============================================================
+# FONTE SEM ATUALIZAÇÃO
+# ============================================================
+
+@pytest.mark.asyncio
+async def test_stale_source_is_not_resampled(coordinator, states):
+    await coordinator.storage.set_sensor_filter(
+        "1", "temperature", heartbeat=60
+    )
+    equipment = coordinator.storage.get_equipment("1")
+    updated_at = utcnow() - timedelta(hours=1)
+    _set(states, "sensor.freezer", -18.0, updated_at)
+
+    # Vários ciclos depois, a fonte continua parada: heartbeat não reenvia
+    for offset in range(5):
+        await coordinator._process_equipment(
+            "1", equipment, utcnow() + timedelta(minutes=offset * 10)
+        )
+
+    assert len(coordinator._queue) == 1
+    assert coordinator._queue[0]["timestamp"] == updated_at.isoformat()
+
+
+# ============================================================
+# MODO AGREGADO
+# ============================================================
+
+@pytest.mark.asyncio
+async def test_aggregate_mode_enqueues_one_event_per_window(
+    coordinator, states
+):
+    await coordinator.storage.set_telemetry_mode(
+        "1", mode="aggregate", window=300
+    )
+    start = datetime(2026, 1, 11, 10, 0, tzinfo=timezone.utc)
+
+    for offset in range(10):
+        ts = start + timedelta(seconds=offset * 30)
+        _set(states, "sensor.freezer", -18.0 - offset % 3, ts)
+        await coordinator._process_equipments(ts)
+
+    assert coordinator._queue == []
+
+    await coordinator._process_equipments(start + timedelta(seconds=300))
+
+    assert len(coordinator._queue) == 1
+    assert coordinator._queue[0]["count"] == 10
+    assert coordinator._queue[0]["min"] == -20.0
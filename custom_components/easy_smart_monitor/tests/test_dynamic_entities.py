@@ -0,0 +1,181 @@
+"""
+Testes da criação / remoção de entidades por equipamento, ao vivo.
+
+Foco:
+- Equipamento novo: cada plataforma cria só as entidades dele
+- Equipamento removido: só as entidades dele se removem, dispositivo
+  excluído, sem recarregar a entry
+- Descarregar a plataforma deixa de escutar o sinal
+- Fluxo de opções: adicionar / remover equipamento sem recarga
+"""
+
+import asyncio
+import importlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from custom_components.easy_smart_monitor.config_flow import (
+    EasySmartMonitorOptionsFlow,
+)
+from custom_components.easy_smart_monitor.const import DOMAIN, PLATFORMS
+
+
+EQUIPMENTS = ("1", "2", "3")
+
+
+@pytest.fixture
+def device_registry():
+    registry = MagicMock()
+    with patch(
+        "custom_components.easy_smart_monitor.devices.dr.async_get",
+        return_value=registry,
+    ):
+        yield registry
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory, mock_hass, device_registry):
+    mock_hass.async_create_task = asyncio.ensure_future
+
+    coordinator = await coordinator_factory(
+        {
+            equipment_id: {"name": equipment_id, "location": "Loja"}
+            for equipment_id in EQUIPMENTS
+        }
+    )
+    mock_hass.data[DOMAIN] = {coordinator.entry.entry_id: coordinator}
+    with patch(
+        "custom_components.easy_smart_monitor.select.async_get_entity_index"
+    ):
+        yield coordinator
+
+
+async def _setup_platforms(coordinator):
+    """Configura todas as plataformas; retorna {plataforma: add_entities}."""
+    added = {}
+    for platform in PLATFORMS:
+        module = importlib.import_module(
+            f"custom_components.easy_smart_monitor.{platform}"
+        )
+        added[platform] = MagicMock()
+        await module.async_setup_entry(
+            coordinator.hass, coordinator.entry, added[platform]
+        )
+    return added
+
+
+def _entities(add_entities, call=-1):
+    return add_entities.call_args_list[call].args[0]
+
+
+def _per_equipment(entities):
+    return [e for e in entities if hasattr(e, "equipment_id")]
+
+
+@pytest.mark.asyncio
+async def test_new_equipment_adds_only_its_entities(coordinator):
+    added = await _setup_platforms(coordinator)
+    initial = {
+        platform: _per_equipment(_entities(add_entities))
+        for platform, add_entities in added.items()
+    }
+    assert all(initial.values())
+
+    await coordinator.storage.add_equipment(
+        equipment_id="4", name="4", location="Depósito"
+    )
+    coordinator.async_apply_equipment_changes(added=["4"])
+
+    for platform, add_entities in added.items():
+        assert add_entities.call_count == 2
+        new = _entities(add_entities)
+        assert {e.equipment_id for e in new} == {"4"}
+        # Mesmas entidades por equipamento que no setup
+        assert len(new) * len(EQUIPMENTS) == len(initial[platform])
+
+    assert coordinator.data["4"].equipment_id == "4"
+    coordinator.hass.config_entries.async_schedule_reload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unloaded_platform_stops_listening(coordinator):
+    added = await _setup_platforms(coordinator)
+
+    for call in coordinator.entry.async_on_unload.call_args_list:
+        call.args[0]()
+
+    await coordinator.storage.add_equipment(
+        equipment_id="4", name="4", location="Depósito"
+    )
+    coordinator.async_apply_equipment_changes(added=["4"])
+
+    assert all(a.call_count == 1 for a in added.values())
+
+
+@pytest.mark.asyncio
+async def test_removed_equipment_removes_only_its_entities(
+    coordinator, device_registry
+):
+    added = await _setup_platforms(coordinator)
+    entities = [
+        entity
+        for add_entities in added.values()
+        for entity in _per_equipment(_entities(add_entities))
+        if entity.equipment_id in ("2", "3")
+    ]
+    for entity in entities:
+        entity.hass = coordinator.hass
+        entity.async_write_ha_state = MagicMock()
+        entity.async_remove = AsyncMock()
+        await entity.async_added_to_hass()
+
+    await coordinator.storage.remove_equipment("2")
+    coordinator.async_apply_equipment_changes(removed=["2"])
+    await asyncio.sleep(0)
+
+    for entity in entities:
+        if entity.equipment_id == "2":
+            entity.async_remove.assert_awaited_once_with(force_remove=True)
+        else:
+            entity.async_remove.assert_not_called()
+        entity.async_write_ha_state.assert_not_called()
+
+    assert set(coordinator.data) == {"1", "3"}
+    device_registry.async_get_device.assert_called_once_with(
+        identifiers={(DOMAIN, "2")}
+    )
+    device_registry.async_remove_device.assert_called_once()
+    coordinator.hass.config_entries.async_schedule_reload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_options_flow_adds_and_removes_live(
+    coordinator, device_registry
+):
+    coordinator.async_apply_equipment_changes = MagicMock()
+
+    flow = EasySmartMonitorOptionsFlow(coordinator.entry)
+    flow.hass = coordinator.hass
+
+    result = await flow.async_step_add_equipment(
+        {"name": "Câmara", "location": "Depósito", "collect_interval": 60}
+    )
+    assert result["type"] == "create_entry"
+    assert "equipments" not in result["data"]
+    assert coordinator.storage.get_equipment("4")["name"] == "Câmara"
+    coordinator.async_apply_equipment_changes.assert_called_once_with(
+        added=["4"]
+    )
+
+    result = await flow.async_step_remove_equipment()
+    assert result["step_id"] == "remove_equipment"
+
+    coordinator.async_apply_equipment_changes.reset_mock()
+    result = await flow.async_step_remove_equipment({"equipment_id": "1"})
+    assert result["type"] == "create_entry"
+    assert coordinator.storage.get_equipment("1") is None
+    coordinator.async_apply_equipment_changes.assert_called_once_with(
+        removed=["1"]
+    )
@@ -0,0 +1,80 @@
+"""
+Testes dos codificadores de payload de eventos.
+
+Foco:
+- Round-trip JSON e MessagePack
+- Negociação do formato com o servidor
+"""
+
+import pytest
+
+from custom_components.easy_smart_monitor.const import (
+    CONTENT_TYPE_JSON,
+    CONTENT_TYPE_MSGPACK,
+)
+from custom_components.easy_smart_monitor.encoders import (
+    EventEncoder,
+    JsonEventEncoder,
+    MsgpackEventEncoder,
+    negotiate_encoder,
+)
+
+
+EVENTS = [
+    {
+        "equipment_id": "1",
+        "type": "temperature",
+        "value": -18.0,
+        "timestamp": "2026-01-11T10:00:00+00:00",
+    },
+    {
+        "equipment_id": "1",
+        "type": "manual_alarm",
+        "timestamp": "2026-01-11T10:00:01+00:00",
+    },
+]
+
+
+# ============================================================
+# ROUND-TRIP
+# ============================================================
+
+@pytest.mark.parametrize(
+    "encoder_cls", [JsonEventEncoder, MsgpackEventEncoder]
+)
+def test_encoder_round_trip(encoder_cls):
+    encoder = encoder_cls()
+
+    assert encoder.decode(encoder.encode(EVENTS)) == EVENTS
+    assert encoder.decode(encoder.encode([])) == []
+
+
+def test_base_encoder_is_abstract():
+    with pytest.raises(TypeError):
+        EventEncoder()
+
+
+def test_msgpack_is_smaller_than_json():
+    events = EVENTS * 50
+
+    assert len(MsgpackEventEncoder().encode(events)) < len(
+        JsonEventEncoder().encode(events)
+    )
+
+
+# ============================================================
+# NEGOCIAÇÃO
+# ============================================================
+
+def test_negotiate_prefers_binary_when_accepted():
+    encoder = negotiate_encoder([CONTENT_TYPE_JSON, CONTENT_TYPE_MSGPACK])
+
+    assert encoder.content_type == CONTENT_TYPE_MSGPACK
+
+
+def test_negotiate_falls_back_to_json():
+    assert negotiate_encoder(None).content_type == CONTENT_TYPE_JSON
+    assert (
+        negotiate_encoder(["application/cbor"]).content_type
+        == CONTENT_TYPE_JSON
+    )
@@ -0,0 +1,356 @@
+"""
+Testes do índice de entidades usado pelos selects de origem.
+
+Foco:
+- Uma varredura do registry, compartilhada por todos os selects
+- Cada tipo de sensor só recebe entidades compatíveis
+  (domínio + device_class + unidade)
+- Atualização incremental por eventos do entity registry
+- Selects já criados reescrevem o estado (opções) quando uma entidade
+  compatível é registrada; os demais tipos não são acordados
+- Options flow só aceita origem compatível com o tipo escolhido
+- Associação incompatível anterior continua como opção, marcada
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from homeassistant.core import Event
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.easy_smart_monitor.config_flow import (
+    EasySmartMonitorOptionsFlow,
+)
+from custom_components.easy_smart_monitor.const import DOMAIN
+from custom_components.easy_smart_monitor.entity_index import (
+    async_get_entity_index,
+    async_release_entity_index,
+)
+from custom_components.easy_smart_monitor.select import (
+    EasySmartMonitorSensorSourceSelect,
+)
+
+
+class _Registry:
+    """Entity registry mínimo: `entities` e `async_get`."""
+
+    def __init__(self) -> None:
+        self.entities = {}
+
+    def add(
+        self,
+        entity_id,
+        device_class=None,
+        unit=None,
+        disabled=False,
+        original_device_class=None,
+    ):
+        self.entities[entity_id] = er.RegistryEntry(
+            entity_id=entity_id,
+            unique_id=entity_id,
+            platform="test",
+            device_class=device_class,
+            original_device_class=original_device_class,
+            unit_of_measurement=unit,
+            disabled_by=er.RegistryEntryDisabler.USER if disabled else None,
+        )
+
+    def async_get(self, entity_id):
+        return self.entities.get(entity_id)
+
+
+@pytest.fixture
+def registry():
+    registry = _Registry()
+    registry.add("sensor.freezer_b", "temperature", "°C")
+    registry.add("sensor.freezer_a", original_device_class="temperature")
+    registry.add("sensor.template_temp", unit="°F")
+    registry.add("sensor.umidade", "humidity", "%")
+    registry.add("sensor.bateria", "battery", "%")
+    registry.add("sensor.consumo", "energy", "kWh")
+    registry.add("sensor.potencia", "power", "W")
+    registry.add("sensor.off", "temperature", "°C", disabled=True)
+    registry.add("binary_sensor.porta", "door")
+    registry.add("binary_sensor.abertura", "opening")
+    registry.add("binary_sensor.movimento", "motion")
+    registry.add("light.cozinha")
+
+    with patch(
+        "custom_components.easy_smart_monitor.entity_index.er.async_get",
+        return_value=registry,
+    ):
+        yield registry
+
+
+@pytest.fixture
+def hass():
+    hass = MagicMock()
+    hass.data = {}
+    return hass
+
+
+def _fire(hass, **data):
+    handler = next(
+        c.args[1]
+        for c in hass.bus.async_listen.call_args_list
+        if c.args[0] == er.EVENT_ENTITY_REGISTRY_UPDATED
+    )
+    handler(Event(er.EVENT_ENTITY_REGISTRY_UPDATED, data))
+
+
+def test_options_filtered_by_sensor_type(hass, registry):
+    index = async_get_entity_index(hass)
+
+    assert async_get_entity_index(hass) is index
+    hass.bus.async_listen.assert_called_once()
+
+    assert index.options("temperature") == [
+        "Nenhum",
+        "sensor.freezer_a",
+        "sensor.freezer_b",
+        "sensor.template_temp",
+    ]
+    assert index.options("humidity") == ["Nenhum", "sensor.umidade"]
+    assert index.options("energy") == ["Nenhum", "sensor.consumo"]
+    assert index.options("door") == [
+        "Nenhum",
+        "binary_sensor.abertura",
+        "binary_sensor.porta",
+    ]
+    # Config flow: compatíveis com qualquer tipo, em ordem
+    assert index.entity_ids() == [
+        "binary_sensor.abertura",
+        "binary_sensor.porta",
+        "sensor.consumo",
+        "sensor.freezer_a",
+        "sensor.freezer_b",
+        "sensor.template_temp",
+        "sensor.umidade",
+    ]
+    # Mesma lista para todos os selects enquanto nada muda
+    assert index.options("temperature") is index.options("temperature")
+
+
+def test_registry_events_update_index(hass, registry):
+    index = async_get_entity_index(hass)
+    door = index.options("door")
+    temperature = index.options("temperature")
+
+    registry.add("sensor.freezer_c", "temperature", "°C")
+    _fire(hass, action="create", entity_id="sensor.freezer_c")
+
+    assert index.options("temperature")[-2:] == [
+        "sensor.freezer_c",
+        "sensor.template_temp",
+    ]
+    # Só as listas afetadas são refeitas
+    assert index.options("door") is door
+    assert temperature[-1] == "sensor.template_temp"
+
+    # Renomeação
+    registry.entities.pop("sensor.freezer_a")
+    registry.add("sensor.freezer_z", original_device_class="temperature")
+    _fire(
+        hass,
+        action="update",
+        entity_id="sensor.freezer_z",
+        old_entity_id="sensor.freezer_a",
+        changes={"entity_id": "sensor.freezer_a"},
+    )
+    # Classe alterada pelo usuário
+    registry.add("binary_sensor.movimento", "door")
+    _fire(
+        hass,
+        action="update",
+        entity_id="binary_sensor.movimento",
+        changes={"device_class": None},
+    )
+    # Habilitada / desabilitada
+    registry.add("sensor.off", "temperature", "°C")
+    _fire(hass, action="update", entity_id="sensor.off", changes={})
+    registry.add("sensor.freezer_b", "temperature", "°C", disabled=True)
+    _fire(hass, action="update", entity_id="sensor.freezer_b", changes={})
+
+    assert index.options("temperature") == [
+        "Nenhum",
+        "sensor.freezer_c",
+        "sensor.freezer_z",
+        "sensor.off",
+        "sensor.template_temp",
+    ]
+    assert index.options("door") == [
+        "Nenhum",
+        "binary_sensor.abertura",
+        "binary_sensor.movimento",
+        "binary_sensor.porta",
+    ]
+
+    _fire(hass, action="remove", entity_id="binary_sensor.porta")
+    assert "binary_sensor.porta" not in index.options("door")
+    assert "binary_sensor.porta" not in index.entity_ids()
+
+
+@pytest.mark.asyncio
+async def test_existing_select_writes_new_options(
+    coordinator_factory, registry
+):
+    coordinator = await coordinator_factory(
+        {"1": {"name": "Freezer", "location": "Loja"}}
+    )
+    hass = coordinator.hass
+    index = async_get_entity_index(hass)
+
+    written = {}
+    selects = {}
+    for sensor_type, name in (
+        ("humidity", "Sensor de Umidade"),
+        ("door", "Sensor de Porta"),
+    ):
+        select = selects[sensor_type] = EasySmartMonitorSensorSourceSelect(
+            coordinator,
+            coordinator.storage,
+            "1",
+            sensor_type,
+            name,
+            {},
+            index,
+        )
+        select.hass = hass
+        select.async_write_ha_state = MagicMock(
+            side_effect=lambda s=select: written.setdefault(
+                s.sensor_type, []
+            ).append((s.state, s.capability_attributes))
+        )
+        await select.async_added_to_hass()
+
+    registry.add("sensor.umidade_2", "humidity", "%")
+    _fire(hass, action="create", entity_id="sensor.umidade_2")
+
+    assert written == {
+        "humidity": [
+            (
+                "Nenhum",
+                {
+                    "options": [
+                        "Nenhum",
+                        "sensor.umidade",
+                        "sensor.umidade_2",
+                    ]
+                },
+            )
+        ]
+    }
+
+    async_release_entity_index(hass)
+
+
+@pytest.mark.asyncio
+async def test_select_keeps_incompatible_source(
+    coordinator_factory, registry
+):
+    # Associação gravada antes da validação por tipo
+    coordinator = await coordinator_factory(
+        {
+            "1": {
+                "name": "Freezer",
+                "location": "Loja",
+                "sensors": {
+                    "temperature": "binary_sensor.porta",
+                    "humidity": "sensor.umidade",
+                },
+            }
+        }
+    )
+    index = async_get_entity_index(coordinator.hass)
+
+    temperature, humidity = (
+        EasySmartMonitorSensorSourceSelect(
+            coordinator, coordinator.storage, "1", sensor_type, "", {}, index
+        )
+        for sensor_type in ("temperature", "humidity")
+    )
+
+    # Estado definido (não unknown) e a associação marcada
+    assert temperature.state == "binary_sensor.porta"
+    assert temperature.options == [
+        "Nenhum",
+        "sensor.freezer_a",
+        "sensor.freezer_b",
+        "sensor.template_temp",
+        "binary_sensor.porta",
+    ]
+    assert temperature.extra_state_attributes == {
+        "incompatible_source": True
+    }
+
+    assert humidity.state == "sensor.umidade"
+    assert humidity.options is index.options("humidity")
+    assert humidity.extra_state_attributes == {"incompatible_source": False}
+
+    # Trocada por uma compatível, sai das opções
+    coordinator.async_update_equipment = MagicMock()
+    await temperature.async_select_option("sensor.freezer_a")
+    assert temperature.options is index.options("temperature")
+    assert temperature.extra_state_attributes == {
+        "incompatible_source": False
+    }
+
+    async_release_entity_index(coordinator.hass)
+
+
+def test_release_stops_listening(hass, registry):
+    async_get_entity_index(hass)
+    unsub = hass.bus.async_listen.return_value
+
+    async_release_entity_index(hass)
+
+    unsub.assert_called_once()
+    assert hass.data == {}
+
+
+def test_accepts_checks_sensor_type(hass, registry):
+    index = async_get_entity_index(hass)
+
+    assert index.accepts("temperature", "sensor.template_temp")
+    assert index.accepts("door", "binary_sensor.porta")
+    assert not index.accepts("temperature", "binary_sensor.porta")
+    assert not index.accepts("humidity", "sensor.bateria")
+    assert not index.accepts("temperature", "sensor.off")
+    assert not index.accepts("door", "binary_sensor.inexistente")
+
+
+@pytest.mark.asyncio
+async def test_add_sensor_rejects_incompatible_entity(
+    coordinator_factory, registry
+):
+    coordinator = await coordinator_factory(
+        {"1": {"name": "Freezer", "location": "Loja"}}
+    )
+    coordinator.async_apply_equipment_changes = MagicMock()
+    hass = coordinator.hass
+    hass.data[DOMAIN] = {coordinator.entry.entry_id: coordinator}
+
+    flow = EasySmartMonitorOptionsFlow(coordinator.entry)
+    flow.hass = hass
+    flow._selected_equipment_id = "1"
+
+    # Porta como origem de temperatura: erro no formulário, nada gravado
+    result = await flow.async_step_add_sensor(
+        {"entity_id": "binary_sensor.porta", "sensor_type": "temperature"}
+    )
+    assert result["type"] == "form"
+    assert result["errors"] == {"entity_id": "incompatible_entity"}
+    assert coordinator.storage.get_sensor_source("1", "temperature") is None
+    coordinator.async_apply_equipment_changes.assert_not_called()
+
+    result = await flow.async_step_add_sensor(
+        {"entity_id": "binary_sensor.porta", "sensor_type": "door"}
+    )
+    assert result["type"] == "create_entry"
+    assert (
+        coordinator.storage.get_sensor_source("1", "door")
+        == "binary_sensor.porta"
+    )
+
+    async_release_entity_index(hass)
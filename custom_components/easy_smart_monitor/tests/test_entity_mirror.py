@@ -0,0 +1,181 @@
+"""
+Testes do modo espelho das entidades de sensor.
+
+Foco:
+- Entidade escreve o estado só quando a própria fonte muda
+- Entidades em modo espelho nem se inscrevem nas atualizações do
+  coordinator
+- Trocar a origem (select) move a inscrição
+- Pausar a integração (sinal próprio) solta as inscrições; retomar
+  refaz, sem acordar as demais entidades
+"""
+
+from collections import defaultdict
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from homeassistant.core import Event, State
+from homeassistant.helpers.entity import DeviceInfo
+
+from custom_components.easy_smart_monitor.binary_sensor import (
+    EasySmartMonitorDoorBinarySensor,
+)
+from custom_components.easy_smart_monitor.sensor import (
+    EasySmartMonitorTemperatureSensor,
+)
+from custom_components.easy_smart_monitor.switch import (
+    EasySmartMonitorEquipmentEnabledSwitch,
+)
+
+
+class _StateTracker:
+    """Substitui `async_track_state_change_event` nos testes."""
+
+    def __init__(self) -> None:
+        self.listeners = defaultdict(list)
+
+    def track(self, hass, entity_id, action):
+        self.listeners[entity_id].append(action)
+        return lambda: self.listeners[entity_id].remove(action)
+
+    def fire(self, entity_id, value):
+        event = Event(
+            "state_changed",
+            {"entity_id": entity_id, "new_state": State(entity_id, value)},
+        )
+        for action in list(self.listeners[entity_id]):
+            action(event)
+
+
+@pytest.fixture
+def tracker():
+    tracker = _StateTracker()
+    with patch(
+        "custom_components.easy_smart_monitor.entity."
+        "async_track_state_change_event",
+        tracker.track,
+    ):
+        yield tracker
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory, mock_hass):
+    mock_hass.test_states["sensor.a"] = State("sensor.a", "-18.0")
+
+    return await coordinator_factory(
+        {
+            "1": {
+                "name": "Freezer",
+                "location": "Loja",
+                "sensors": {
+                    "temperature": "sensor.a",
+                    "door": "binary_sensor.porta",
+                },
+            }
+        },
+        options={"entity_update_mode": "mirror"},
+    )
+
+
+async def _add(entity, hass):
+    entity.hass = hass
+    entity.async_write_ha_state = MagicMock()
+    await entity.async_added_to_hass()
+    return entity
+
+
+@pytest.mark.asyncio
+async def test_mirror_writes_only_on_source_change(
+    coordinator, mock_hass, tracker
+):
+    device_info = DeviceInfo(identifiers={("easy_smart_monitor", "1")})
+    sensor = await _add(
+        EasySmartMonitorTemperatureSensor(coordinator, "1", device_info),
+        mock_hass,
+    )
+    door = await _add(
+        EasySmartMonitorDoorBinarySensor(coordinator, "1", device_info),
+        mock_hass,
+    )
+
+    assert sensor.native_value == -18.0
+    assert door.is_on is None
+
+    tracker.fire("sensor.a", "-17.5")
+    assert sensor.native_value == -17.5
+    sensor.async_write_ha_state.assert_called_once()
+    door.async_write_ha_state.assert_not_called()
+
+    tracker.fire("binary_sensor.porta", "on")
+    assert door.is_on is True
+    sensor.async_write_ha_state.assert_called_once()
+
+    # Ciclo do coordinator: nenhuma entidade espelhada é acordada
+    assert coordinator._listeners == {}
+    coordinator._publish({})
+    sensor.async_write_ha_state.assert_called_once()
+    door.async_write_ha_state.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_rebinding_moves_subscription(coordinator, mock_hass, tracker):
+    device_info = DeviceInfo(identifiers={("easy_smart_monitor", "1")})
+    sensor = await _add(
+        EasySmartMonitorTemperatureSensor(coordinator, "1", device_info),
+        mock_hass,
+    )
+    mock_hass.test_states["sensor.b"] = State("sensor.b", "4.0")
+
+    # Mesmo caminho do select de origem
+    await coordinator.storage.set_sensor_source("1", "temperature", "sensor.b")
+    coordinator.async_update_equipment("1")
+
+    assert tracker.listeners["sensor.a"] == []
+    assert len(tracker.listeners["sensor.b"]) == 1
+    assert sensor.native_value == 4.0
+
+    tracker.fire("sensor.a", "-30.0")
+    assert sensor.native_value == 4.0
+
+    await sensor.async_remove()
+    assert tracker.listeners["sensor.b"] == []
+
+
+@pytest.mark.asyncio
+async def test_pause_releases_subscriptions(coordinator, mock_hass, tracker):
+    device_info = DeviceInfo(identifiers={("easy_smart_monitor", "1")})
+    sensor = await _add(
+        EasySmartMonitorTemperatureSensor(coordinator, "1", device_info),
+        mock_hass,
+    )
+    door = await _add(
+        EasySmartMonitorDoorBinarySensor(coordinator, "1", device_info),
+        mock_hass,
+    )
+    switch = await _add(
+        EasySmartMonitorEquipmentEnabledSwitch(
+            coordinator, coordinator.storage, "1", device_info
+        ),
+        mock_hass,
+    )
+    switch.async_write_ha_state.reset_mock()
+
+    coordinator.async_set_paused(True)
+
+    assert tracker.listeners["sensor.a"] == []
+    assert tracker.listeners["binary_sensor.porta"] == []
+    # Última leitura mantida, sem escrita de estado
+    assert sensor.native_value == -18.0
+    sensor.async_write_ha_state.assert_not_called()
+
+    mock_hass.test_states["sensor.a"] = State("sensor.a", "-16.0")
+    coordinator.async_set_paused(False)
+
+    assert len(tracker.listeners["sensor.a"]) == 1
+    assert len(tracker.listeners["binary_sensor.porta"]) == 1
+    assert sensor.native_value == -16.0
+    sensor.async_write_ha_state.assert_called_once()
+    # Pausa não passa pelo coordinator: as demais entidades não acordam
+    switch.async_write_ha_state.assert_not_called()
@@ -0,0 +1,106 @@
+"""
+Testes da atualização de entidades por equipamento.
+
+Foco:
+- Alterar um equipamento só reescreve o estado das entidades dele
+- Entidades removidas deixam de escutar o sinal do equipamento
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+
+from homeassistant.helpers.entity import DeviceInfo
+
+from custom_components.easy_smart_monitor.binary_sensor import (
+    EasySmartMonitorDoorBinarySensor,
+)
+from custom_components.easy_smart_monitor.number import (
+    EasySmartMonitorCollectIntervalNumber,
+)
+from custom_components.easy_smart_monitor.sensor import (
+    EasySmartMonitorTemperatureSensor,
+)
+from custom_components.easy_smart_monitor.switch import (
+    EasySmartMonitorEnableSirenSwitch,
+    EasySmartMonitorEquipmentEnabledSwitch,
+)
+
+
+EQUIPMENTS = ("1", "2", "3")
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory):
+    return await coordinator_factory(
+        {
+            equipment_id: {"name": equipment_id, "location": "Loja"}
+            for equipment_id in EQUIPMENTS
+        }
+    )
+
+
+async def _add_entities(coordinator, equipment_id):
+    storage = coordinator.storage
+    device_info = DeviceInfo(identifiers={("easy_smart_monitor", equipment_id)})
+    entities = [
+        EasySmartMonitorEquipmentEnabledSwitch(
+            coordinator, storage, equipment_id, device_info
+        ),
+        EasySmartMonitorEnableSirenSwitch(
+            coordinator, storage, equipment_id, device_info
+        ),
+        EasySmartMonitorCollectIntervalNumber(
+            coordinator, storage, equipment_id, device_info
+        ),
+        EasySmartMonitorTemperatureSensor(
+            coordinator, equipment_id, device_info
+        ),
+        EasySmartMonitorDoorBinarySensor(
+            coordinator, equipment_id, device_info
+        ),
+    ]
+    for entity in entities:
+        entity.hass = coordinator.hass
+        entity.async_write_ha_state = MagicMock()
+        await entity.async_added_to_hass()
+    return entities
+
+
+@pytest.mark.asyncio
+async def test_setter_updates_only_its_equipment(coordinator):
+    entities = {
+        equipment_id: await _add_entities(coordinator, equipment_id)
+        for equipment_id in EQUIPMENTS
+    }
+
+    siren_switch = entities["2"][1]
+    await siren_switch.async_turn_off()
+
+    assert siren_switch.is_on is False
+    for equipment_id, group in entities.items():
+        expected = 1 if equipment_id == "2" else 0
+        assert [
+            e.async_write_ha_state.call_count for e in group
+        ] == [expected] * len(group)
+
+    await entities["3"][2].async_set_native_value(60)
+
+    assert entities["3"][2].native_value == 60
+    assert all(e.async_write_ha_state.call_count == 0 for e in entities["1"])
+    assert all(e.async_write_ha_state.call_count == 1 for e in entities["3"])
+
+
+@pytest.mark.asyncio
+async def test_removed_entity_stops_listening(coordinator):
+    entities = await _add_entities(coordinator, "1")
+    removed = entities[0]
+
+    await removed.async_remove()
+    coordinator.async_update_equipment("1")
+
+    removed.async_write_ha_state.assert_not_called()
+    assert all(
+        e.async_write_ha_state.call_count == 1 for e in entities[1:]
+    )
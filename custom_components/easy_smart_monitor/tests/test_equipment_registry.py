@@ -0,0 +1,250 @@
+"""
+Testes do registro único de equipamentos (storage).
+
+Foco:
+- Busca por id e por uuid; próximo id livre sem varrer a lista
+- Equipamentos antigos de `entry.options["equipments"]` migrados no
+  setup, com o mesmo uuid
+- Sirene e botão leem o registro e o snapshot do coordinator
+- Dispositivos antigos (por uuid) migrados para o equipment_id
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo
+
+from custom_components.easy_smart_monitor.button import (
+    EasySmartMonitorSilenceAlarmButton,
+)
+from custom_components.easy_smart_monitor.const import DOMAIN
+from custom_components.easy_smart_monitor.devices import (
+    async_migrate_legacy_devices,
+    async_sync_equipment_devices,
+)
+from custom_components.easy_smart_monitor.siren import EasySmartMonitorSiren
+
+
+LEGACY = [
+    {
+        "id": 1,
+        "uuid": "equip-uuid",
+        "name": "Freezer Legado",
+        "location": "Cozinha",
+        "collect_interval": 60,
+        "enabled": True,
+        "door": {"enable_siren": False, "open_timeout": 300},
+        "sensors": [
+            {
+                "id": 1,
+                "uuid": "sensor-door-uuid",
+                "entity_id": "binary_sensor.porta",
+                "type": "door",
+                "enabled": True,
+            },
+            {
+                "id": 2,
+                "uuid": "sensor-temp-uuid",
+                "entity_id": "sensor.temperatura",
+                "type": "temperature",
+                "enabled": False,
+            },
+        ],
+    }
+]
+
+
+@pytest.mark.asyncio
+async def test_lookup_by_id_and_uuid(coordinator_factory):
+    coordinator = await coordinator_factory(
+        {
+            "1": {"id": "1", "uuid": "u1", "name": "A"},
+            "7": {"id": "7", "name": "B"},
+            "camara": {"id": "camara", "uuid": "u3", "name": "C"},
+        }
+    )
+    storage = coordinator.storage
+
+    assert storage.get_equipment_by_uuid("u1")["name"] == "A"
+    assert storage.get_equipment_by_uuid("u3")["id"] == "camara"
+    assert storage.get_equipment_by_uuid("nada") is None
+
+    # uuid derivado do id, o mesmo a cada carga
+    backfilled = storage.get_equipment("7")["uuid"]
+    await storage.async_load()
+    assert storage.get_equipment("7")["uuid"] == backfilled
+    assert storage.get_equipment_by_uuid(backfilled)["id"] == "7"
+
+    assert storage.next_equipment_id() == "8"
+    await storage.add_equipment(
+        equipment_id="8", name="D", location="Loja"
+    )
+    assert storage.next_equipment_id() == "9"
+
+    uuid_d = storage.get_equipment("8")["uuid"]
+    assert storage.get_equipment_by_uuid(uuid_d)["name"] == "D"
+    await storage.remove_equipment("8")
+    assert storage.get_equipment_by_uuid(uuid_d) is None
+
+
+@pytest.mark.asyncio
+async def test_legacy_options_are_adopted(
+    coordinator_factory, mock_hass, mock_entry
+):
+    coordinator = await coordinator_factory(
+        {"1": {"id": "1", "uuid": "u1", "name": "Atual"}},
+        options={"equipments": LEGACY, "send_interval": 60},
+    )
+    storage = coordinator.storage
+
+    # id 1 já existia: o legado recebe o próximo livre, mantendo o uuid
+    equipment = storage.get_equipment_by_uuid("equip-uuid")
+    assert equipment["id"] == "2"
+    assert equipment["name"] == "Freezer Legado"
+    assert equipment["collect_interval"] == 60
+    assert equipment["door"] == {"enable_siren": False, "open_timeout": 300}
+    assert equipment["sensors"] == {
+        "temperature": None,
+        "humidity": None,
+        "energy": None,
+        "door": "binary_sensor.porta",
+    }
+    assert storage.get_equipment("1")["name"] == "Atual"
+    assert set(coordinator.data) == {"1", "2"}
+
+    mock_hass.config_entries.async_update_entry.assert_called_once_with(
+        mock_entry, options={"send_interval": 60}
+    )
+
+    # Adotado uma única vez
+    assert storage.adopt_legacy_equipments(LEGACY) == []
+
+
+@pytest.mark.asyncio
+async def test_siren_and_button_use_registry_and_snapshot(
+    coordinator_factory,
+):
+    coordinator = await coordinator_factory()
+    storage = coordinator.storage
+    await storage.add_equipment(
+        equipment_id="1", name="Freezer", location="Loja"
+    )
+    equipment_uuid = storage.get_equipment("1")["uuid"]
+
+    device_info = DeviceInfo(identifiers={("easy_smart_monitor", "1")})
+    siren = EasySmartMonitorSiren(
+        coordinator, "1", equipment_uuid, device_info
+    )
+    button = EasySmartMonitorSilenceAlarmButton(
+        coordinator, "1", equipment_uuid, device_info
+    )
+    assert siren.unique_id == f"{equipment_uuid}_siren"
+    assert button.unique_id == f"{equipment_uuid}_silence_alarm"
+
+    coordinator.async_update_equipment("1")
+    assert siren.is_on is False
+
+    await siren.async_turn_on()
+    assert siren.is_on is True
+    assert siren.extra_state_attributes["reason"] == "manual"
+    assert siren.extra_state_attributes["triggered_at"] is not None
+
+    await button.async_press()
+    assert siren.is_on is False
+    assert siren.extra_state_attributes["reason"] is None
+
+
+@pytest.fixture
+def registries(mock_hass, mock_entry):
+    """Device / entity registries reais sobre o hass simulado."""
+    mock_entry.domain = DOMAIN
+    mock_hass.config_entries.async_get_entry = {
+        mock_entry.entry_id: mock_entry
+    }.get
+    mock_hass.bus.async_fire = lambda *args, **kwargs: None
+
+    devices = dr.DeviceRegistry(mock_hass)
+    devices.async_schedule_save = lambda: None
+    devices.devices = dr.DeviceRegistryItems()
+    devices.deleted_devices = dr.DeviceRegistryItems()
+    devices._device_data = devices.devices.data
+
+    entities = er.EntityRegistry(mock_hass)
+    entities.async_schedule_save = lambda: None
+    entities.entities = er.EntityRegistryItems()
+    entities.deleted_entities = {}
+    entities._entities_data = entities.entities.data
+
+    areas = MagicMock()
+    areas.async_get_or_create = lambda name: SimpleNamespace(id=name)
+
+    with patch(
+        "homeassistant.helpers.device_registry.async_get",
+        return_value=devices,
+    ), patch(
+        "homeassistant.helpers.entity_registry.async_get",
+        return_value=entities,
+    ), patch(
+        "homeassistant.helpers.area_registry.async_get",
+        return_value=areas,
+    ):
+        yield devices, entities
+
+
+@pytest.mark.asyncio
+async def test_legacy_uuid_devices_are_migrated(
+    coordinator_factory, mock_entry, registries
+):
+    devices, entities = registries
+
+    # Instalação anterior: sirene / botão no dispositivo do uuid; o
+    # equipamento 1 também já tinha o dispositivo pelo id
+    def _device(identifier, **kwargs):
+        return devices.async_get_or_create(
+            config_entry_id=mock_entry.entry_id,
+            identifiers={(DOMAIN, identifier)},
+            **kwargs,
+        )
+
+    def _entity(domain, unique_id, device):
+        return entities.async_get_or_create(
+            domain, DOMAIN, unique_id, device_id=device.id
+        )
+
+    legacy = _device("equip-uuid", name="Freezer Legado")
+    devices.async_update_device(legacy.id, name_by_user="Meu freezer")
+    siren = _entity("siren", "equip-uuid_siren", legacy)
+
+    old = _device("u1", name="Atual")
+    button = _entity("button", "u1_silence_alarm", old)
+    current = _device("1", name="Atual")
+
+    coordinator = await coordinator_factory(
+        {"1": {"id": "1", "uuid": "u1", "name": "Atual"}},
+        options={"equipments": LEGACY},
+    )
+    equipments = coordinator.storage.get_equipments()
+    async_migrate_legacy_devices(coordinator.hass, mock_entry, equipments)
+    async_sync_equipment_devices(coordinator.hass, mock_entry, equipments)
+
+    # Um dispositivo por equipamento, nenhum órfão
+    assert len(devices.devices) == 2
+
+    # Só o antigo: mesmo dispositivo, novo identificador
+    migrated = devices.async_get_device(identifiers={(DOMAIN, "2")})
+    assert migrated.id == legacy.id
+    assert migrated.identifiers == {(DOMAIN, "2")}
+    assert migrated.name_by_user == "Meu freezer"
+    assert entities.async_get(siren.entity_id).device_id == legacy.id
+
+    # Os dois: entidades do antigo vão para o atual
+    assert devices.async_get_device(identifiers={(DOMAIN, "u1")}) is None
+    assert entities.async_get(button.entity_id).device_id == current.id
+
+    # Idempotente nas próximas cargas
+    async_migrate_legacy_devices(coordinator.hass, mock_entry, equipments)
+    assert len(devices.devices) == 2
@@ -0,0 +1,76 @@
+"""
+Testes do filtro por mudança de valor (deadband / heartbeat).
+"""
+
+from datetime import timedelta
+
+from homeassistant.util.dt import utcnow
+
+from custom_components.easy_smart_monitor.filters import (
+    ChangeOfValueFilter,
+)
+
+
+KEY = ("1", "temperature")
+SOURCE = "sensor.freezer"
+
+
+def _cfg(**kwargs):
+    cfg = {"deadband": 0.0, "deadband_mode": "absolute", "heartbeat": 900}
+    cfg.update(kwargs)
+    return cfg
+
+
+def test_repeated_value_is_dropped():
+    value_filter = ChangeOfValueFilter()
+    now = utcnow()
+
+    assert value_filter.accept(KEY, SOURCE, -18.0, now, _cfg())
+    assert not value_filter.accept(
+        KEY, SOURCE, -18.0, now + timedelta(seconds=30), _cfg()
+    )
+    assert value_filter.accept(
+        KEY, SOURCE, -17.9, now + timedelta(seconds=60), _cfg()
+    )
+
+
+def test_absolute_deadband():
+    value_filter = ChangeOfValueFilter()
+    now = utcnow()
+    cfg = _cfg(deadband=0.5)
+
+    assert value_filter.accept(KEY, SOURCE, -18.0, now, cfg)
+    assert not value_filter.accept(KEY, SOURCE, -17.6, now, cfg)
+    assert value_filter.accept(KEY, SOURCE, -17.4, now, cfg)
+
+
+def test_percent_deadband_is_relative_to_last_sent():
+    value_filter = ChangeOfValueFilter()
+    now = utcnow()
+    cfg = _cfg(deadband=10, deadband_mode="percent")
+
+    assert value_filter.accept(KEY, SOURCE, 200.0, now, cfg)
+    assert not value_filter.accept(KEY, SOURCE, 215.0, now, cfg)
+    assert value_filter.accept(KEY, SOURCE, 221.0, now, cfg)
+
+
+def test_heartbeat_sends_unchanged_value():
+    value_filter = ChangeOfValueFilter()
+    now = utcnow()
+    cfg = _cfg(heartbeat=300)
+
+    assert value_filter.accept(KEY, SOURCE, -18.0, now, cfg)
+    assert not value_filter.accept(
+        KEY, SOURCE, -18.0, now + timedelta(seconds=299), cfg
+    )
+    assert value_filter.accept(
+        KEY, SOURCE, -18.0, now + timedelta(seconds=300), cfg
+    )
+
+
+def test_rebinding_resets_the_binding():
+    value_filter = ChangeOfValueFilter()
+    now = utcnow()
+
+    assert value_filter.accept(KEY, SOURCE, -18.0, now, _cfg())
+    assert value_filter.accept(KEY, "sensor.other", -18.0, now, _cfg())
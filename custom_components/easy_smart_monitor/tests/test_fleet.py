@@ -0,0 +1,378 @@
+"""
+Testes da importação / exportação da frota de equipamentos.
+
+Foco:
+- Ida e volta JSON / CSV sem perda, inclusive dos filtros por sensor e
+  do modo de telemetria
+- Relatório de validação por linha; com erro nada é aplicado
+- Uma gravação do storage e dispositivos criados de uma vez
+- Entidades criadas / atualizadas só dos equipamentos afetados, sem
+  recarregar a entry
+- 1.000 equipamentos importados em poucos segundos
+- Serviços `import_equipments` / `export_equipments`
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from custom_components.easy_smart_monitor.const import DOMAIN
+from custom_components.easy_smart_monitor.fleet import (
+    dump_equipments,
+    iter_import_records,
+)
+from custom_components.easy_smart_monitor.services import (
+    EXPORT_EQUIPMENTS_SCHEMA,
+    IMPORT_EQUIPMENTS_SCHEMA,
+    SERVICE_EXPORT_EQUIPMENTS,
+    SERVICE_IMPORT_EQUIPMENTS,
+    async_register_services,
+)
+
+
+CSV = """id,name,location,enabled,collect_interval,enable_siren,open_timeout,\
+temperature,humidity,energy,door
+1,Freezer 1,Loja,true,60,false,300,sensor.t1,,,binary_sensor.p1
+2,Freezer 2,Loja,,,,,sensor.t2,sensor.u2,,
+"""
+
+
+@pytest.fixture
+def device_registry():
+    registry = MagicMock()
+    with patch(
+        "custom_components.easy_smart_monitor.devices.dr.async_get",
+        return_value=registry,
+    ):
+        yield registry
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory, device_registry):
+    coordinator = await coordinator_factory(
+        {
+            "2": {"name": "Antigo", "location": "Depósito"},
+            "3": {"name": "Balcão", "location": "Loja"},
+        }
+    )
+    coordinator.async_update_equipment = MagicMock()
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_import_csv(coordinator, device_registry):
+    storage = coordinator.storage
+    added = MagicMock()
+    async_dispatcher_connect(
+        coordinator.hass, coordinator.equipments_added_signal, added
+    )
+    untouched = coordinator.data["3"]
+
+    report = await coordinator.async_import_equipments(
+        iter_import_records(CSV, "csv")
+    )
+
+    assert report == {
+        "created": ["1"],
+        "updated": ["2"],
+        "removed": [],
+        "unchanged": [],
+        "errors": [],
+        "applied": True,
+    }
+    storage._store.async_save.assert_awaited_once()
+
+    equipment = dict(storage.get_equipment("1"))
+    assert storage.get_equipment_by_uuid(equipment.pop("uuid")) is not None
+    assert equipment == {
+        "id": "1",
+        "name": "Freezer 1",
+        "location": "Loja",
+        "enabled": True,
+        "collect_interval": 60,
+        "door": {"enable_siren": False, "open_timeout": 300},
+        "sensors": {
+            "temperature": "sensor.t1",
+            "humidity": None,
+            "energy": None,
+            "door": "binary_sensor.p1",
+        },
+    }
+    # Células vazias mantêm a configuração atual
+    assert storage.get_equipment("2")["name"] == "Freezer 2"
+    assert storage.get_equipment("2")["location"] == "Loja"
+    assert storage.get_equipment("2")["collect_interval"] == 30
+    assert storage.get_sensor_source("2", "humidity") == "sensor.u2"
+    # Fora da importação sem `replace`: continua
+    assert storage.get_equipment("3") is not None
+
+    assert device_registry.async_get_or_create.call_count == 2
+    # Só o equipamento novo ganha entidades; nada é recarregado
+    added.assert_called_once_with(["1"])
+    assert set(coordinator.data) == {"1", "2", "3"}
+    assert coordinator.data["3"] is untouched
+    coordinator.hass.config_entries.async_schedule_reload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_import_replace_removes_missing(coordinator, device_registry):
+    report = await coordinator.async_import_equipments(
+        [{"id": "2", "name": "Antigo", "location": "Depósito"}],
+        replace=True,
+    )
+
+    assert report["removed"] == ["3"]
+    assert report["unchanged"] == ["2"]
+    assert list(coordinator.storage.get_equipments()) == ["2"]
+    device_registry.async_remove_device.assert_called_once()
+    device_registry.async_get_device.assert_called_once_with(
+        identifiers={(DOMAIN, "3")}
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_updates_refresh_entities(coordinator):
+    updated = {equipment_id: MagicMock() for equipment_id in ("2", "3")}
+    for equipment_id, listener in updated.items():
+        async_dispatcher_connect(
+            coordinator.hass,
+            coordinator.equipment_signal(equipment_id),
+            listener,
+        )
+
+    report = await coordinator.async_import_equipments(
+        [{"id": "3", "name": "Balcão", "location": "Loja", "enabled": False}]
+    )
+
+    assert report["updated"] == ["3"]
+    coordinator.hass.config_entries.async_schedule_reload.assert_not_called()
+    updated["3"].assert_called_once_with()
+    updated["2"].assert_not_called()
+    assert coordinator.data["3"].enabled is False
+
+
+@pytest.mark.asyncio
+async def test_validation_report(coordinator, device_registry):
+    storage = coordinator.storage
+    before = storage.export_equipments()
+
+    csv = """id,name,location,enabled,collect_interval,door,extra
+1,Freezer 1,Loja,talvez,5,sensor.porta
+,Sem id,Loja,,,
+4,Câmara,Loja,,60,binary_sensor.p4,x
+5,Freezer 5,Loja,,60,
+5,Freezer 5,Loja,,60,
+"""
+    report = await coordinator.async_import_equipments(
+        iter_import_records(csv, "csv")
+    )
+
+    assert report["applied"] is False
+    assert report["created"] == ["5"]
+    assert report["errors"] == [
+        {
+            "row": 0,
+            "id": "1",
+            "errors": [
+                "enabled deve ser booleano",
+                "collect_interval deve ser inteiro entre 10 e 3600",
+                "entidade inválida para door: sensor.porta",
+            ],
+        },
+        {"row": 1, "id": None, "errors": ["id obrigatório"]},
+        {"row": 2, "id": "4", "errors": ["campos desconhecidos: extra"]},
+        {"row": 4, "id": "5", "errors": ["id repetido (registro 3)"]},
+    ]
+
+    # Nada aplicado
+    assert storage.export_equipments() == before
+    storage._store.async_save.assert_not_awaited()
+    device_registry.async_get_or_create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_dry_run(coordinator, device_registry):
+    report = await coordinator.async_import_equipments(
+        iter_import_records(CSV, "csv"), dry_run=True
+    )
+
+    assert report["created"] == ["1"]
+    assert report["applied"] is False
+    assert coordinator.storage.get_equipment("1") is None
+    device_registry.async_get_or_create.assert_not_called()
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv"])
+@pytest.mark.asyncio
+async def test_export_round_trip(coordinator, fmt):
+    storage = coordinator.storage
+    await coordinator.async_import_equipments(
+        iter_import_records(CSV, "csv")
+    )
+    exported = storage.export_equipments()
+
+    report = await coordinator.async_import_equipments(
+        iter_import_records(dump_equipments(exported, fmt), fmt),
+        replace=True,
+    )
+
+    assert report["errors"] == []
+    assert report["unchanged"] == ["1", "2", "3"]
+    assert storage.export_equipments() == exported
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv"])
+@pytest.mark.asyncio
+async def test_sensor_filters_round_trip(coordinator, fmt):
+    storage = coordinator.storage
+    await coordinator.async_import_equipments(
+        [
+            {
+                "id": "3",
+                "name": "Balcão",
+                "location": "Loja",
+                "filters": {
+                    "temperature": {"deadband": 0.5, "heartbeat": 600},
+                    "energy": {"deadband": 2, "deadband_mode": "percent"},
+                },
+            }
+        ]
+    )
+    exported = storage.export_equipments()
+    text = dump_equipments(exported, fmt)
+    if fmt == "csv":
+        header = text.splitlines()[0].split(",")
+        assert "temperature_deadband" in header
+        assert "energy_deadband_mode" in header
+
+    storage.get_equipment("3").pop("filters")
+    report = await coordinator.async_import_equipments(
+        iter_import_records(text, fmt)
+    )
+
+    assert report["errors"] == []
+    assert report["updated"] == ["3"]
+    assert report["unchanged"] == ["2"]
+    assert storage.export_equipments() == exported
+    assert storage.get_sensor_filter("3", "temperature") == {
+        "deadband": 0.5,
+        "deadband_mode": "absolute",
+        "heartbeat": 600,
+    }
+    assert storage.get_sensor_filter("3", "energy")["deadband_mode"] == (
+        "percent"
+    )
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv"])
+@pytest.mark.asyncio
+async def test_telemetry_mode_round_trip(coordinator, fmt):
+    storage = coordinator.storage
+    report = await coordinator.async_import_equipments(
+        iter_import_records(
+            "id,name,location,telemetry_mode,telemetry_window\n"
+            "3,Balcão,Loja,aggregate,900\n",
+            "csv",
+        )
+    )
+    assert report["updated"] == ["3"]
+    assert storage.get_telemetry_mode("3") == {
+        "mode": "aggregate",
+        "window": 900,
+    }
+
+    exported = storage.export_equipments()
+    assert exported[1]["telemetry"] == {"mode": "aggregate", "window": 900}
+    assert exported[0]["telemetry"] == {}
+
+    storage.get_equipment("3").pop("telemetry")
+    report = await coordinator.async_import_equipments(
+        iter_import_records(dump_equipments(exported, fmt), fmt)
+    )
+
+    assert report["errors"] == []
+    assert report["updated"] == ["3"]
+    assert report["unchanged"] == ["2"]
+    assert storage.export_equipments() == exported
+
+
+@pytest.mark.asyncio
+async def test_import_thousand_equipments(coordinator, device_registry):
+    records = [
+        {
+            "id": f"eq{i:04}",
+            "name": f"Freezer {i}",
+            "location": f"Loja {i % 40}",
+            "collect_interval": 60,
+            "sensors": {"temperature": f"sensor.freezer_{i}"},
+        }
+        for i in range(1000)
+    ]
+    text = dump_equipments(records, "csv")
+
+    started = time.perf_counter()
+    report = await coordinator.async_import_equipments(
+        iter_import_records(text, "csv")
+    )
+    elapsed = time.perf_counter() - started
+
+    assert report["errors"] == []
+    assert len(report["created"]) == 1000
+    coordinator.storage._store.async_save.assert_awaited_once()
+    assert device_registry.async_get_or_create.call_count == 1000
+    assert elapsed < 2
+
+
+@pytest.mark.asyncio
+async def test_services(coordinator, tmp_path):
+    hass = coordinator.hass
+    hass.services.has_service.return_value = False
+    hass.data = {DOMAIN: {"test_entry": coordinator}}
+    hass.config.is_allowed_path = lambda path: path.startswith(
+        str(tmp_path)
+    )
+
+    async_register_services(hass)
+    handlers = {
+        c.args[1]: c.args[2]
+        for c in hass.services.async_register.call_args_list
+    }
+    export = handlers[SERVICE_EXPORT_EQUIPMENTS]
+    import_ = handlers[SERVICE_IMPORT_EQUIPMENTS]
+
+    path = str(tmp_path / "frota.csv")
+    response = await export(
+        MagicMock(
+            data=EXPORT_EQUIPMENTS_SCHEMA({"format": "csv", "path": path})
+        )
+    )
+    assert response == {"count": 2, "path": path}
+
+    report = await import_(
+        MagicMock(
+            data=IMPORT_EQUIPMENTS_SCHEMA(
+                {"format": "csv", "path": path, "dry_run": True}
+            )
+        )
+    )
+    assert report["unchanged"] == ["2", "3"]
+
+    response = await export(MagicMock(data=EXPORT_EQUIPMENTS_SCHEMA({})))
+    assert response["count"] == 2
+    assert '"id": "3"' in response["data"]
+
+    with pytest.raises(ServiceValidationError, match="allowlist"):
+        await import_(
+            MagicMock(
+                data=IMPORT_EQUIPMENTS_SCHEMA({"path": "/etc/frota.json"})
+            )
+        )
+    with pytest.raises(ServiceValidationError, match="JSON inválido"):
+        await import_(
+            MagicMock(data=IMPORT_EQUIPMENTS_SCHEMA({"data": "[{"}))
+        )
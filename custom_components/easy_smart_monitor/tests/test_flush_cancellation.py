@@ -0,0 +1,153 @@
+"""
+Testes de cancelamento do envio da fila.
+
+Foco:
+- Cancelar `_flush_queue` em qualquer ponto de espera não perde eventos
+- O lote em voo volta para o início da fila
+- Registros do backlog só são confirmados após resposta da API
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.easy_smart_monitor.coordinator import (
+    EasySmartMonitorCoordinator,
+)
+
+
+START = datetime(2026, 1, 11, 10, 0, tzinfo=timezone.utc)
+
+
+def _event(i):
+    return {
+        "equipment_id": "1",
+        "type": "temperature",
+        "value": -18.0 + i % 3,
+        "timestamp": (START + timedelta(seconds=30 * i)).isoformat(),
+    }
+
+
+class _SlowApi:
+    """API com pontos de espera antes e depois do "envio"."""
+
+    def __init__(self, fail: bool) -> None:
+        self.fail = fail
+        self.delivered: list[dict] = []
+
+    async def send_events(self, events):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise OSError("API offline")
+        await asyncio.sleep(0)
+        self.delivered.extend(events)
+
+
+def _build(mock_hass, mock_entry, step, fail):
+    async def _executor(func, *args):
+        await asyncio.sleep(0)
+        return func(*args)
+
+    mock_hass.async_add_executor_job = _executor
+    mock_entry.entry_id = f"step_{step}"
+
+    coordinator = EasySmartMonitorCoordinator(
+        mock_hass, mock_entry, _SlowApi(fail)
+    )
+    coordinator._backlog.append([_event(i) for i in range(0, 5)])
+    coordinator._backlog.append([_event(i) for i in range(5, 10)])
+    for i in range(10, 20):
+        coordinator._queue.append(_event(i))
+    return coordinator
+
+
+def _remaining(coordinator):
+    """Pendentes na ordem de envio: backlog (mais antigo) e depois fila."""
+    events = []
+    for info in coordinator._backlog.records:
+        events.extend(coordinator._backlog.read_record(info))
+    return events + coordinator._queue
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("api_fails", [False, True])
+async def test_cancel_at_every_await_point_loses_nothing(
+    mock_hass, mock_entry, api_fails
+):
+    expected = [_event(i)["timestamp"] for i in range(20)]
+    step = 0
+
+    with patch(
+        "custom_components.easy_smart_monitor.coordinator.TEST_MODE", False
+    ):
+        while True:
+            coordinator = _build(mock_hass, mock_entry, step, api_fails)
+            task = asyncio.ensure_future(coordinator._flush_queue())
+
+            for _ in range(step):
+                await asyncio.sleep(0)
+
+            finished = task.done()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+            # Gravações e confirmações protegidas terminam em background
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            delivered = [e["timestamp"] for e in coordinator.api.delivered]
+            remaining = [e["timestamp"] for e in _remaining(coordinator)]
+
+            assert coordinator._in_flight == []
+            assert sorted(set(delivered) | set(remaining)) == expected
+            # Nada pendente foi também entregue (sem duplicatas)
+            assert not set(delivered) & set(remaining)
+            # A fila continua em ordem cronológica
+            assert remaining == sorted(remaining)
+
+            if finished:
+                break
+
+            step += 1
+            assert step < 200
+
+    assert step > 5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_send_returns_batch_to_queue_head(
+    mock_hass, mock_entry
+):
+    started = asyncio.Event()
+
+    async def _hang(events):
+        started.set()
+        await asyncio.Event().wait()
+
+    coordinator = _build(mock_hass, mock_entry, 0, False)
+    coordinator._backlog.ack(coordinator._backlog.records[0])
+    coordinator._backlog.ack(coordinator._backlog.records[0])
+    coordinator.api.send_events = _hang
+
+    with patch(
+        "custom_components.easy_smart_monitor.coordinator.TEST_MODE", False
+    ):
+        task = asyncio.ensure_future(coordinator._flush_queue())
+        await started.wait()
+
+        assert coordinator._queue == []
+        assert len(coordinator._in_flight) == 10
+        assert coordinator.queue_size == 10
+
+        coordinator._enqueue_event(_event(20))
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    assert coordinator._in_flight == []
+    assert coordinator._queue == [_event(i) for i in range(10, 21)]
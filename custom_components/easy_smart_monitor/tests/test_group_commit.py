@@ -0,0 +1,137 @@
+"""
+Testes do group commit do backlog em disco.
+
+Foco:
+- Um registro e um fsync por grupo, não por leitura
+- Commit disparado pela janela de durabilidade ou pelo volume
+- Falha de disco mantém os eventos em memória
+- `on_commit` só após um grupo gravado
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.easy_smart_monitor.backlog import SegmentBacklog
+from custom_components.easy_smart_monitor.group_commit import (
+    GroupCommitWriter,
+)
+
+
+def _event(i):
+    return {
+        "equipment_id": str(i % 7),
+        "type": "temperature",
+        "value": -18.0 + i % 3,
+        "timestamp": f"2026-01-11T10:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+    }
+
+
+@pytest.fixture
+def loop_hass(mock_hass):
+    """mock_hass com timers e tasks rodando no event loop real."""
+    loop = asyncio.get_event_loop()
+    mock_hass.loop = loop
+    mock_hass.async_create_task = loop.create_task
+    mock_hass.async_run_hass_job = lambda job, *args: job.target(*args)
+    return mock_hass
+
+
+@pytest.mark.asyncio
+async def test_group_is_committed_with_a_single_fsync(mock_hass, tmp_path):
+    backlog = SegmentBacklog(str(tmp_path))
+    writer = GroupCommitWriter(mock_hass, backlog, interval=3600)
+
+    for i in range(500):
+        writer.add(_event(i))
+
+    with patch(
+        "custom_components.easy_smart_monitor.backlog.os.fsync"
+    ) as fsync:
+        assert await writer.async_commit()
+
+    assert writer.pending == []
+    assert [r.count for r in backlog.records] == [500]
+    # Arquivo + diretório do segmento recém-criado
+    assert fsync.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_durability_window_triggers_commit(loop_hass, tmp_path):
+    backlog = SegmentBacklog(str(tmp_path))
+    writer = GroupCommitWriter(loop_hass, backlog, interval=0.05)
+
+    writer.add(_event(1))
+    writer.add(_event(2))
+    assert backlog.records == []
+
+    await asyncio.sleep(0.2)
+
+    assert [r.count for r in backlog.records] == [2]
+    assert writer.pending == []
+
+
+@pytest.mark.asyncio
+async def test_byte_threshold_triggers_early_commit(loop_hass, tmp_path):
+    backlog = SegmentBacklog(str(tmp_path))
+    writer = GroupCommitWriter(
+        loop_hass, backlog, interval=3600, max_bytes=96 * 50
+    )
+
+    for i in range(50):
+        writer.add(_event(i))
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert [r.count for r in backlog.records] == [50]
+    writer.async_cancel()
+
+
+@pytest.mark.asyncio
+async def test_disk_failure_keeps_events_in_memory(mock_hass, tmp_path):
+    backlog = SegmentBacklog(str(tmp_path))
+    backlog.append = MagicMock(side_effect=OSError("disco cheio"))
+    failed = []
+
+    async def _on_failed():
+        failed.append(True)
+
+    on_commit = MagicMock()
+    writer = GroupCommitWriter(
+        mock_hass,
+        backlog,
+        interval=3600,
+        on_commit_failed=_on_failed,
+        on_commit=on_commit,
+    )
+    events = [_event(i) for i in range(10)]
+    for event in events:
+        writer.add(event)
+
+    assert not await writer.async_commit()
+    assert writer.pending == events
+    assert failed == [True]
+    on_commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_on_commit_after_group_is_written(mock_hass, tmp_path):
+    backlog = SegmentBacklog(str(tmp_path))
+    sizes = []
+    writer = GroupCommitWriter(
+        mock_hass,
+        backlog,
+        interval=3600,
+        on_commit=lambda: sizes.append(backlog.size_bytes),
+    )
+
+    # Nada pendente: nada gravado, ninguém avisado
+    assert await writer.async_commit()
+    assert sizes == []
+
+    writer.add(_event(1))
+    assert await writer.async_commit()
+    assert len(sizes) == 1
+    assert sizes[0] > 0
@@ -0,0 +1,205 @@
+"""
+Testes da aplicação ao vivo das options e do agendamento.
+
+Foco:
+- Um timer de coleta por intervalo distinto; o equipamento muda de
+  grupo quando o intervalo muda
+- Cada disparo coleta só o próprio grupo
+- `send_interval` refaz só o timer de envio
+- Pausa cancela todos os timers; retomada recria
+- Options sem mudança efetiva não mexem em nada; backend / modo das
+  entidades pedem recarga
+- Listener de options da entry
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from custom_components.easy_smart_monitor import async_options_updated
+from custom_components.easy_smart_monitor.const import DOMAIN
+
+
+class _Timers:
+    """Substitui `async_track_time_interval` nos testes."""
+
+    def __init__(self) -> None:
+        self.active = {}
+
+    def track(self, hass, action, interval, *, name=None):
+        key = object()
+        self.active[key] = (action, interval)
+        return lambda: self.active.pop(key)
+
+    def intervals(self):
+        return sorted(
+            interval.total_seconds() for _, interval in self.active.values()
+        )
+
+    def action(self, seconds):
+        return next(
+            action
+            for action, interval in self.active.values()
+            if interval == timedelta(seconds=seconds)
+        )
+
+
+@pytest.fixture
+def timers():
+    timers = _Timers()
+    with patch(
+        "custom_components.easy_smart_monitor.scheduler."
+        "async_track_time_interval",
+        timers.track,
+    ), patch(
+        "custom_components.easy_smart_monitor.coordinator."
+        "async_track_time_interval",
+        timers.track,
+    ), patch("custom_components.easy_smart_monitor.devices.dr.async_get"):
+        yield timers
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory, timers):
+    coordinator = await coordinator_factory(
+        {
+            equipment_id: {
+                "name": equipment_id,
+                "location": "Loja",
+                "collect_interval": interval,
+            }
+            for equipment_id, interval in (("1", 30), ("2", 30), ("3", 90))
+        },
+        options={"send_interval": 60},
+    )
+    coordinator.async_start()
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_one_timer_per_interval(coordinator, timers):
+    # Coleta 30 s e 90 s, envio 60 s
+    assert timers.intervals() == [30, 60, 90]
+
+    # Equipamento muda de grupo: o de 90 s fica vazio e some
+    await coordinator.storage.set_collect_interval("3", 30)
+    coordinator.async_update_equipment("3")
+    assert timers.intervals() == [30, 60]
+
+    # Desativado: fora da coleta; removido: idem
+    await coordinator.storage.set_equipment_enabled("1", False)
+    coordinator.async_update_equipment("1")
+    await coordinator.storage.remove_equipment("2")
+    coordinator.async_apply_equipment_changes(removed=["2"])
+    assert timers.intervals() == [30, 60]
+    assert coordinator._scheduler.interval("1") is None
+    assert coordinator._scheduler.interval("3") == 30
+
+
+@pytest.mark.asyncio
+async def test_tick_collects_only_its_group(coordinator, timers):
+    processed = []
+
+    async def _process(equipment_id, equipment, now):
+        processed.append(equipment_id)
+        return coordinator._read_equipment(equipment_id, equipment, now)
+
+    coordinator._process_equipment = _process
+    data = coordinator.data
+
+    await timers.action(90)(None)
+
+    assert processed == ["3"]
+    # Snapshot dos demais equipamentos mantido
+    assert coordinator.data["1"] is data["1"]
+    assert set(coordinator.data) == {"1", "2", "3"}
+
+
+@pytest.mark.asyncio
+async def test_send_interval_retunes_upload_only(coordinator, timers):
+    collect = timers.action(30)
+
+    assert coordinator.async_apply_options({"send_interval": 120}) is False
+
+    assert timers.intervals() == [30, 90, 120]
+    assert timers.action(30) is collect
+
+
+@pytest.mark.asyncio
+async def test_pause_and_resume(coordinator, timers):
+    coordinator.async_apply_options({"send_interval": 60, "paused": True})
+
+    assert coordinator.paused is True
+    assert timers.active == {}
+
+    # Mudanças durante a pausa não criam timers
+    await coordinator.storage.set_collect_interval("1", 45)
+    coordinator.async_update_equipment("1")
+    coordinator.async_apply_options({"send_interval": 30, "paused": True})
+    assert timers.active == {}
+
+    coordinator.async_apply_options({"send_interval": 30, "paused": False})
+    assert timers.intervals() == [30, 30, 45, 90]
+
+
+@pytest.mark.asyncio
+async def test_options_diff(coordinator, timers):
+    before = dict(timers.active)
+
+    # Valores padrão explicitados pelo options flow: nada muda
+    assert (
+        coordinator.async_apply_options(
+            {
+                "send_interval": 60,
+                "paused": False,
+                "durability_window": 30,
+                "backlog_backend": "segments",
+                "entity_update_mode": "snapshot",
+            }
+        )
+        is False
+    )
+    assert timers.active == before
+
+    assert (
+        coordinator.async_apply_options(
+            {
+                "send_interval": 60,
+                "durability_window": 5,
+                "disk_budget_mb": 10,
+                "shutdown_deadline": 3,
+            }
+        )
+        is False
+    )
+    assert coordinator._writer.interval == 5
+    assert coordinator._retention.budget_bytes == 10 * 1024 * 1024
+    assert coordinator._shutdown_deadline == 3
+    assert timers.active == before
+
+    assert coordinator.async_apply_options(
+        {"send_interval": 60, "backlog_backend": "sqlite"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_listener(coordinator, timers):
+    hass = coordinator.hass
+    hass.data[DOMAIN] = {coordinator.entry.entry_id: coordinator}
+
+    coordinator.entry.options = {"send_interval": 60, "paused": True}
+    await async_options_updated(hass, coordinator.entry)
+    assert timers.active == {}
+    hass.config_entries.async_schedule_reload.assert_not_called()
+
+    coordinator.entry.options = {
+        "send_interval": 60,
+        "paused": True,
+        "entity_update_mode": "mirror",
+    }
+    await async_options_updated(hass, coordinator.entry)
+    hass.config_entries.async_schedule_reload.assert_called_once_with(
+        coordinator.entry.entry_id
+    )
@@ -0,0 +1,166 @@
+"""
+Testes da retenção do backlog em disco.
+
+Foco:
+- Compactação dos segmentos mais antigos ao passar do orçamento
+- Alarmes preservados enquanto houver telemetria para descartar
+- Contabilização dos bytes liberados
+- Compactação por watermark, independente do orçamento de disco
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.easy_smart_monitor.backlog import SegmentBacklog
+from custom_components.easy_smart_monitor.retention import RetentionManager
+
+
+START = datetime(2026, 1, 10, 0, 0, tzinfo=timezone.utc)
+
+
+def _hour(hour):
+    """Uma hora de leituras (a cada 10 s) com valores variados + 1 alarme."""
+    base = START + timedelta(hours=hour)
+    events = [
+        {
+            "equipment_id": "1",
+            "type": "temperature",
+            "value": -18.0 + (i * 7 % 13) * 0.37,
+            "timestamp": (base + timedelta(seconds=10 * i)).isoformat(),
+        }
+        for i in range(360)
+    ]
+    events.append(
+        {
+            "equipment_id": "1",
+            "type": "door_alarm",
+            "value": 130.0,
+            "timestamp": (base + timedelta(minutes=30)).isoformat(),
+        }
+    )
+    return events
+
+
+def _backlog(tmp_path, hours=6):
+    backlog = SegmentBacklog(str(tmp_path), segment_max_bytes=1)
+    for hour in range(hours):
+        backlog.append(_hour(hour))
+    return backlog
+
+
+def _all_events(backlog):
+    return [
+        event
+        for record in backlog.records
+        for event in backlog.read_record(record)
+    ]
+
+
+def test_under_budget_is_untouched(tmp_path):
+    backlog = _backlog(tmp_path)
+    size = backlog.size_bytes
+    retention = RetentionManager(backlog, budget_bytes=size)
+
+    assert retention.enforce() == 0
+    assert backlog.size_bytes == size
+    assert retention.evicted_bytes == 0
+
+
+def test_oldest_segments_are_compacted_first(tmp_path):
+    backlog = _backlog(tmp_path)
+    size = backlog.size_bytes
+    retention = RetentionManager(backlog, budget_bytes=int(size * 0.8))
+
+    freed = retention.enforce()
+
+    assert backlog.size_bytes <= retention.budget_bytes
+    assert freed == size - backlog.size_bytes
+    assert retention.evicted_bytes == freed
+
+    events = _all_events(backlog)
+    telemetry = [e for e in events if e["type"] == "temperature"]
+    # Nenhuma leitura perdida: agregados somam todas as amostras
+    assert sum(e.get("count", 1) for e in telemetry) == 6 * 360
+    assert [e for e in events if e["type"] == "door_alarm"] == [
+        e for hour in range(6) for e in _hour(hour) if e["type"] == "door_alarm"
+    ]
+    # Só os segmentos mais antigos foram compactados
+    assert telemetry[0].get("aggregate") is True
+    assert "aggregate" not in telemetry[-1]
+
+
+def test_telemetry_is_dropped_before_alarms(tmp_path):
+    backlog = _backlog(tmp_path)
+    retention = RetentionManager(
+        backlog, budget_bytes=backlog.size_bytes // 10
+    )
+
+    retention.enforce()
+
+    assert backlog.size_bytes <= retention.budget_bytes
+    alarms = [e for e in _all_events(backlog) if e["type"] == "door_alarm"]
+    assert len(alarms) == 6
+
+
+def test_everything_is_evicted_as_last_resort(tmp_path):
+    backlog = _backlog(tmp_path)
+    size = backlog.size_bytes
+    retention = RetentionManager(backlog, budget_bytes=0)
+
+    assert retention.enforce() == size
+    assert backlog.records == []
+    assert backlog.size_bytes == 0
+
+    # Estado consistente após reinício
+    reloaded = SegmentBacklog(str(tmp_path))
+    reloaded.load()
+    assert reloaded.records == []
+
+
+def test_compacted_segments_survive_reload(tmp_path):
+    backlog = _backlog(tmp_path)
+    retention = RetentionManager(
+        backlog, budget_bytes=int(backlog.size_bytes * 0.8)
+    )
+    retention.enforce()
+    expected = _all_events(backlog)
+
+    reloaded = SegmentBacklog(str(tmp_path))
+    reloaded.load()
+
+    assert _all_events(reloaded) == expected
+
+
+def test_watermark_compacts_oldest_segments(tmp_path):
+    backlog = _backlog(tmp_path)
+    retention = RetentionManager(
+        backlog, budget_bytes=backlog.size_bytes * 2, watermark=1000
+    )
+
+    assert retention.compact_to_watermark() > 0
+
+    assert backlog.event_count <= 1000
+    events = _all_events(backlog)
+    # Nada perdido: contagens somam as leituras originais
+    assert sum(
+        e.get("count", 1) for e in events if e["type"] == "temperature"
+    ) == 6 * 360
+    assert sum(e["type"] == "door_alarm" for e in events) == 6
+    # Só os segmentos mais antigos foram compactados
+    assert events[0]["aggregate"] is True
+    assert "aggregate" not in events[-2]
+    assert retention.evicted_bytes == 0
+
+
+def test_watermark_uses_coarser_windows(tmp_path):
+    backlog = _backlog(tmp_path)
+    retention = RetentionManager(backlog, watermark=20)
+
+    retention.compact_to_watermark()
+
+    # 300 s e 900 s não bastam (78 e 30 eventos): os mais antigos
+    # chegam à janela de 1 h, só até ficar abaixo do watermark
+    assert backlog.event_count == 18
+    events = _all_events(backlog)
+    assert events[0]["window"] == 3600
+    assert events[-1]["window"] == 900
+    assert retention.compact_to_watermark() == 0
@@ -0,0 +1,123 @@
+"""
+Testes do encerramento com envio final.
+
+Foco:
+- Alarmes enviados antes da telemetria
+- Janelas de agregação abertas não se perdem
+- Prazo esgotado: o que sobrar vai para o disco
+- Unload fecha a sessão HTTP só depois do envio final
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.easy_smart_monitor import async_unload_entry
+from custom_components.easy_smart_monitor.const import DOMAIN
+from custom_components.easy_smart_monitor.coordinator import (
+    EasySmartMonitorCoordinator,
+)
+
+
+START = datetime(2026, 1, 11, 10, 0, tzinfo=timezone.utc)
+
+
+def _telemetry(i):
+    return {
+        "equipment_id": "1",
+        "type": "temperature",
+        "value": -18.0,
+        "timestamp": (START + timedelta(seconds=30 * i)).isoformat(),
+    }
+
+
+ALARM = {
+    "equipment_id": "1",
+    "type": "door_alarm",
+    "value": 130.0,
+    "timestamp": (START + timedelta(minutes=2)).isoformat(),
+}
+
+
+@pytest.fixture
+def coordinator(mock_hass, mock_entry):
+    mock_entry.options = {"shutdown_deadline": 0.2}
+    client = MagicMock()
+    client.send_events = AsyncMock()
+
+    coordinator = EasySmartMonitorCoordinator(mock_hass, mock_entry, client)
+    for i in range(5):
+        coordinator._queue.append(_telemetry(i))
+    coordinator._queue.append(ALARM)
+    coordinator._aggregator.add("2", "humidity", 60.0, START, 300)
+
+    with patch(
+        "custom_components.easy_smart_monitor.coordinator.TEST_MODE", False
+    ):
+        yield coordinator
+
+
+@pytest.mark.asyncio
+async def test_shutdown_drains_alarms_first(coordinator):
+    await coordinator.async_shutdown()
+
+    batches = [c.args[0] for c in coordinator.api.send_events.call_args_list]
+    assert batches[0] == [ALARM]
+    assert batches[1][:5] == [_telemetry(i) for i in range(5)]
+    # Janela aberta enviada como agregado parcial
+    assert batches[1][5]["aggregate"] is True
+    assert batches[1][5]["count"] == 1
+    assert coordinator.queue_size == 0
+
+
+@pytest.mark.asyncio
+async def test_shutdown_persists_remainder_after_deadline(coordinator):
+    async def _hang(events):
+        await asyncio.Event().wait()
+
+    coordinator.api.send_events = _hang
+
+    started = time.monotonic()
+    await coordinator.async_shutdown()
+
+    assert time.monotonic() - started < 2
+    assert coordinator._queue == []
+    assert coordinator._in_flight == []
+    assert coordinator._backlog.event_count == 7
+
+    reloaded = type(coordinator._backlog)(coordinator._backlog.directory)
+    reloaded.load()
+    assert reloaded.event_count == 7
+
+
+@pytest.mark.asyncio
+async def test_shutdown_is_idempotent(coordinator):
+    await coordinator.async_shutdown()
+    await coordinator.async_shutdown()
+
+    assert coordinator.api.send_events.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unload_closes_session_after_drain():
+    order = []
+
+    coordinator = MagicMock()
+    coordinator.async_shutdown = AsyncMock(
+        side_effect=lambda: order.append("drain")
+    )
+    coordinator.api._session.close = AsyncMock(
+        side_effect=lambda: order.append("close")
+    )
+
+    hass = MagicMock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    entry = MagicMock()
+    entry.entry_id = "entry"
+    hass.data = {DOMAIN: {"entry": coordinator}}
+
+    assert await async_unload_entry(hass, entry)
+    assert order == ["drain", "close"]
@@ -0,0 +1,142 @@
+"""
+Testes do snapshot por equipamento publicado pelo coordinator.
+
+Foco:
+- Um ciclo lê e converte cada fonte uma única vez
+- Equipamento sem mudança mantém o mesmo objeto (entidade não escreve)
+- Entidades só indexam o snapshot
+- Estado do alarme (porta aberta além do tempo, disparo manual)
+"""
+
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+import pytest_asyncio
+
+from homeassistant.core import State
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.util.dt import utcnow
+
+from custom_components.easy_smart_monitor.binary_sensor import (
+    EasySmartMonitorDoorBinarySensor,
+)
+from custom_components.easy_smart_monitor.sensor import (
+    EasySmartMonitorTemperatureSensor,
+)
+from custom_components.easy_smart_monitor.snapshot import (
+    ALARM_REASON_DOOR,
+    ALARM_REASON_MANUAL,
+)
+
+
+def _equipment(equipment_id):
+    return {
+        "id": equipment_id,
+        "name": f"Freezer {equipment_id}",
+        "location": "Cozinha",
+        "enabled": True,
+        "door": {"enable_siren": True, "open_timeout": 60},
+        "sensors": {
+            "temperature": f"sensor.freezer_{equipment_id}",
+            "door": f"binary_sensor.porta_{equipment_id}",
+        },
+    }
+
+
+@pytest_asyncio.fixture
+async def coordinator(coordinator_factory):
+    return await coordinator_factory(
+        {i: _equipment(i) for i in ("1", "2")}
+    )
+
+
+def _set(states, entity_id, value, updated_at):
+    states[entity_id] = State(
+        entity_id,
+        str(value),
+        last_changed=updated_at,
+        last_updated=updated_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_processing_pass_publishes_snapshot(coordinator, mock_hass):
+    states = mock_hass.test_states
+    now = utcnow()
+    _set(states, "sensor.freezer_1", -18.5, now)
+    _set(states, "sensor.freezer_2", "unavailable", now)
+    _set(states, "binary_sensor.porta_1", "off", now)
+
+    await coordinator._process_equipments(now)
+
+    first = coordinator.data["1"]
+    assert first.values == {"temperature": -18.5}
+    assert first.sampled_at["temperature"] == now
+    assert first.door_open is False
+    assert coordinator.data["2"].values == {}
+    assert coordinator.data["2"].door_open is None
+
+    with pytest.raises(AttributeError):
+        first.door_open = True
+    with pytest.raises(TypeError):
+        first.values["temperature"] = 0.0
+
+    # Só o equipamento 2 mudou: o snapshot do 1 é o mesmo objeto
+    _set(states, "sensor.freezer_2", -20.0, now)
+    await coordinator._process_equipments(now + timedelta(seconds=30))
+
+    assert coordinator.data["1"] is first
+    assert coordinator.data["2"].values == {"temperature": -20.0}
+
+
+@pytest.mark.asyncio
+async def test_entities_read_snapshot_only(coordinator, mock_hass):
+    now = utcnow()
+    _set(mock_hass.test_states, "sensor.freezer_1", -18.5, now)
+    _set(mock_hass.test_states, "binary_sensor.porta_1", "on", now)
+    await coordinator._process_equipments(now)
+
+    device_info = DeviceInfo(identifiers={("easy_smart_monitor", "1")})
+    sensor = EasySmartMonitorTemperatureSensor(coordinator, "1", device_info)
+    door = EasySmartMonitorDoorBinarySensor(coordinator, "1", device_info)
+    for entity in (sensor, door):
+        entity.hass = mock_hass
+        entity.async_write_ha_state = MagicMock()
+        await entity.async_added_to_hass()
+
+    mock_hass.states.get = MagicMock(side_effect=AssertionError)
+
+    assert sensor.native_value == -18.5
+    assert door.is_on is True
+
+    # Ciclo sem mudança: nenhuma escrita de estado
+    coordinator._publish(dict(coordinator.data))
+    sensor.async_write_ha_state.assert_not_called()
+
+    coordinator._publish(
+        {**coordinator.data, "1": coordinator.data["2"]}
+    )
+    sensor.async_write_ha_state.assert_called_once()
+    door.async_write_ha_state.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_alarm_state_in_snapshot(coordinator, mock_hass):
+    now = utcnow()
+    _set(mock_hass.test_states, "binary_sensor.porta_1", "on", now)
+
+    await coordinator._process_equipments(now)
+    assert coordinator.data["1"].door_open_since == now
+    assert not coordinator.data["1"].alarm_active
+
+    await coordinator._process_equipments(now + timedelta(seconds=90))
+    snapshot = coordinator.data["1"]
+    assert snapshot.alarm_reason == ALARM_REASON_DOOR
+    assert snapshot.alarm_triggered_at == now + timedelta(seconds=60)
+
+    await coordinator.async_trigger_siren("2")
+    assert coordinator.data["2"].alarm_reason == ALARM_REASON_MANUAL
+
+    await coordinator.async_silence_siren("2")
+    assert not coordinator.data["2"].alarm_active
@@ -0,0 +1,373 @@
+"""
+Testes do backlog em SQLite (modo WAL).
+
+Foco:
+- Inserção em lote e leitura por faixa de rowid (rowids do SQLite)
+- Pendentes reindexados após reinício
+- Consulta local por equipamento / período
+- Histórico local contado a partir do envio (relógios injetados)
+- Retenção e migração a partir do backlog em segmentos
+- Serviço `query_history` (só resposta)
+"""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.easy_smart_monitor.backlog import (
+    SegmentBacklog,
+    migrate_pending,
+)
+from custom_components.easy_smart_monitor.coordinator import (
+    EasySmartMonitorCoordinator,
+)
+from custom_components.easy_smart_monitor.const import DOMAIN
+from custom_components.easy_smart_monitor.retention import RetentionManager
+from custom_components.easy_smart_monitor.services import (
+    QUERY_HISTORY_SCHEMA,
+    SERVICE_QUERY_HISTORY,
+    async_register_services,
+)
+from custom_components.easy_smart_monitor.sqlite_backlog import (
+    SqliteBacklog,
+)
+
+
+START = datetime(2026, 1, 11, 10, 0, tzinfo=timezone.utc)
+
+
+class _Clock:
+    """Relógio controlado pelo teste."""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _events(count, start=START, equipment_id="1"):
+    events = [
+        {
+            "equipment_id": equipment_id,
+            "type": "temperature",
+            "value": -18.0 + i % 5 * 0.25,
+            "timestamp": (start + timedelta(seconds=30 * i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+    events.append(
+        {
+            "equipment_id": equipment_id,
+            "type": "manual_alarm",
+            "timestamp": start.isoformat(),
+        }
+    )
+    return events
+
+
+@pytest.fixture
+def wall():
+    return _Clock(START.timestamp())
+
+
+@pytest.fixture
+def monotonic():
+    return _Clock(1_000_000.0)
+
+
+@pytest.fixture
+def backlog(tmp_path, wall, monotonic):
+    backlog = SqliteBacklog(
+        str(tmp_path), batch_rows=50, clock=wall, monotonic=monotonic
+    )
+    backlog.load()
+    yield backlog
+    backlog.close()
+
+
+def test_database_uses_wal(backlog):
+    conn = sqlite3.connect(backlog.path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {
+            row[1] for row in conn.execute("PRAGMA index_list(events)")
+        }
+        assert "events_equipment_ts" in indexes
+    finally:
+        conn.close()
+
+
+def test_append_read_and_ack(backlog):
+    first = backlog.append(_events(10))
+    second = backlog.append(_events(3, equipment_id=2))
+
+    assert [r.count for r in backlog.records] == [11, 4]
+    assert list(backlog.read_record(first)) == _events(10)
+    assert list(backlog.read_record(second)) == _events(3, equipment_id=2)
+
+    backlog.ack(first)
+
+    assert backlog.records == [second]
+    assert backlog.event_count == 4
+    with pytest.raises(KeyError):
+        backlog.read_record(first)
+
+
+def test_append_uses_sqlite_rowids(backlog):
+    first = backlog.append(_events(10))
+    second = backlog.append(_events(3))
+    assert (first.seq, first.last_id) == (1, 11)
+    assert (second.seq, second.last_id) == (12, 15)
+
+    # Grupo mais novo descartado: o SQLite reaproveita os rowids
+    backlog.drop_segment(second.seq)
+    third = backlog.append(_events(5, equipment_id="2"))
+
+    assert (third.seq, third.last_id, third.count) == (12, 17, 6)
+    assert list(backlog.read_record(third)) == _events(5, equipment_id="2")
+    assert list(backlog.read_record(first)) == _events(10)
+
+
+def test_pending_rows_survive_reload(backlog, tmp_path):
+    for _ in range(3):
+        backlog.append(_events(39))
+    backlog.ack(backlog.records[0])
+    backlog.close()
+
+    reloaded = SqliteBacklog(str(tmp_path), batch_rows=50)
+    reloaded.load()
+
+    # 80 pendentes, regrupados em blocos de até 50 linhas
+    assert [r.count for r in reloaded.records] == [50, 30]
+    events = [e for r in reloaded.records for e in reloaded.read_record(r)]
+    assert events == _events(39) * 2
+    reloaded.close()
+
+
+def test_local_query_includes_sent_events(backlog, wall, monotonic):
+    info = backlog.append(_events(20))
+    backlog.append(_events(20, start=START + timedelta(days=1)))
+
+    # Enviado bem depois do evento, com a limpeza já devida
+    wall.now += 30 * 86400
+    monotonic.now += 7200
+    backlog.ack(info)
+
+    since = int((START + timedelta(minutes=5)).timestamp() * 1000)
+    until = int((START + timedelta(hours=1)).timestamp() * 1000)
+
+    result = backlog.query(
+        "1", since_ms=since, until_ms=until, sensor_type="temperature"
+    )
+
+    assert [e["timestamp"] for e in result] == [
+        e["timestamp"]
+        for e in _events(20)
+        if e["type"] == "temperature"
+        and START + timedelta(minutes=5)
+        <= datetime.fromisoformat(e["timestamp"])
+    ]
+
+
+def test_first_ack_does_not_purge(backlog, wall, monotonic):
+    old = backlog.append(_events(5))
+    backlog.ack(old)
+
+    # Mesmo com o envio já fora do histórico, a primeira limpeza só
+    # acontece um intervalo após abrir o banco
+    wall.now += 30 * 86400
+    backlog.ack(backlog.append(_events(5)))
+
+    assert len(backlog.query("1", since_ms=0)) == 12
+
+
+def test_history_purged_by_sent_time(backlog, wall, monotonic):
+    early = backlog.append(_events(5))
+    backlog.ack(early)
+
+    # Eventos antigos enviados só agora (fim de uma queda da API)
+    wall.now += 10 * 86400
+    monotonic.now += 7200
+    late = backlog.append(_events(5, equipment_id="2"))
+    backlog.ack(late)
+
+    assert backlog.query("1", since_ms=0) == []
+    assert len(backlog.query("2", since_ms=0)) == 6
+
+    # Saem quando o próprio envio fica mais velho que o histórico
+    wall.now += 8 * 86400
+    monotonic.now += 7200
+    backlog.ack(backlog.append(_events(1, equipment_id="3")))
+
+    assert backlog.query("2", since_ms=0) == []
+    assert len(backlog.query("3", since_ms=0)) == 2
+
+
+def test_sent_at_added_to_previous_database(tmp_path, wall):
+    conn = sqlite3.connect(str(tmp_path / "backlog.db"))
+    conn.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY, equipment_id, "
+        "type TEXT NOT NULL, ts INTEGER NOT NULL, value REAL, "
+        "payload BLOB, sent INTEGER NOT NULL DEFAULT 0)"
+    )
+    conn.executemany(
+        "INSERT INTO events (equipment_id, type, ts, value, sent) "
+        "VALUES ('1', 'temperature', 0, -18.0, ?)",
+        [(1,), (0,)],
+    )
+    conn.commit()
+    conn.close()
+
+    backlog = SqliteBacklog(str(tmp_path), clock=wall)
+    backlog.load()
+
+    conn = sqlite3.connect(backlog.path)
+    rows = conn.execute(
+        "SELECT sent, sent_at FROM events ORDER BY id"
+    ).fetchall()
+    conn.close()
+    assert rows == [(1, int(wall.now * 1000)), (0, None)]
+    assert backlog.event_count == 1
+    backlog.close()
+
+
+def test_retention_compacts_oldest_groups(backlog):
+    for hour in range(6):
+        backlog.append(
+            [
+                {
+                    "equipment_id": "1",
+                    "type": "temperature",
+                    "value": -18.0 + (i * 7 % 13) * 0.37,
+                    "timestamp": (
+                        START + timedelta(hours=hour, seconds=10 * i)
+                    ).isoformat(),
+                }
+                for i in range(360)
+            ]
+        )
+
+    retention = RetentionManager(
+        backlog, budget_bytes=int(backlog.size_bytes * 0.7)
+    )
+    retention.enforce()
+
+    assert backlog.size_bytes <= retention.budget_bytes
+    events = [e for r in backlog.records for e in backlog.read_record(r)]
+    assert sum(e.get("count", 1) for e in events) == 6 * 360
+    assert events[0]["aggregate"] is True
+    assert events == sorted(events, key=lambda e: e["timestamp"])
+
+
+def test_migration_from_segments(tmp_path):
+    segments = SegmentBacklog(str(tmp_path))
+    segments.append(_events(10))
+    segments.append(_events(5))
+
+    target = SqliteBacklog(str(tmp_path))
+    target.load()
+
+    assert migrate_pending(segments, target) == 17
+    assert segments.records == []
+    assert [r.count for r in target.records] == [11, 6]
+    target.close()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_uses_sqlite_backend(mock_hass, mock_entry):
+    mock_entry.options = {"backlog_backend": "sqlite"}
+    segments = SegmentBacklog(
+        mock_hass.config.path(
+            ".storage", "easy_smart_monitor_backlog", "test_entry"
+        )
+    )
+    segments.append(_events(3, start=datetime.now(timezone.utc)))
+
+    coordinator = EasySmartMonitorCoordinator(
+        mock_hass, mock_entry, MagicMock()
+    )
+    coordinator.storage._store.async_load = AsyncMock(return_value=None)
+    coordinator.storage._store.async_save = AsyncMock()
+    await coordinator.async_initialize()
+
+    assert isinstance(coordinator._backlog, SqliteBacklog)
+    assert coordinator.queue_size == 4
+
+    history = await coordinator.async_query_history("1")
+    assert len(history) == 4
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_query_history_service(coordinator_factory):
+    coordinator = await coordinator_factory(
+        {"1": {"name": "Freezer", "location": "Loja"}},
+        options={"backlog_backend": "sqlite"},
+    )
+    hass = coordinator.hass
+    hass.services.has_service.return_value = False
+    hass.data = {DOMAIN: {"test_entry": coordinator}}
+
+    async_register_services(hass)
+    register = next(
+        c
+        for c in hass.services.async_register.call_args_list
+        if c.args[:2] == (DOMAIN, SERVICE_QUERY_HISTORY)
+    )
+    assert register.kwargs["supports_response"] is SupportsResponse.ONLY
+    handler = register.args[2]
+
+    now = datetime.now(timezone.utc)
+    coordinator._backlog.append(_events(3, start=now))
+    coordinator._backlog.append(
+        _events(2, start=now - timedelta(days=3))
+    )
+
+    data = QUERY_HISTORY_SCHEMA({"equipment_id": "1", "days": "2"})
+    events = (await handler(MagicMock(data=data)))["events"]
+    assert sorted(e["type"] for e in events) == [
+        "manual_alarm",
+        *["temperature"] * 3,
+    ]
+
+    data = QUERY_HISTORY_SCHEMA(
+        {"equipment_id": "1", "sensor_type": "temperature", "days": 5}
+    )
+    response = await handler(MagicMock(data=data))
+    assert len(response["events"]) == 5
+
+    with pytest.raises(ServiceValidationError, match="inexistente: 9"):
+        await handler(
+            MagicMock(data=QUERY_HISTORY_SCHEMA({"equipment_id": "9"}))
+        )
+
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_query_history_requires_sqlite(coordinator_factory):
+    coordinator = await coordinator_factory(
+        {"1": {"name": "Freezer", "location": "Loja"}}
+    )
+    hass = coordinator.hass
+    hass.services.has_service.return_value = False
+    hass.data = {DOMAIN: {"test_entry": coordinator}}
+
+    async_register_services(hass)
+    handler = next(
+        c.args[2]
+        for c in hass.services.async_register.call_args_list
+        if c.args[:2] == (DOMAIN, SERVICE_QUERY_HISTORY)
+    )
+
+    with pytest.raises(ServiceValidationError, match="SQLite"):
+        await handler(
+            MagicMock(data=QUERY_HISTORY_SCHEMA({"equipment_id": "1"}))
+        )
@@ -0,0 +1,133 @@
+"""
+Testes da gravação agrupada do storage de configuração.
+
+Foco:
+- Várias alterações viram uma única gravação
+- O atraso é limitado, mesmo com alterações contínuas
+- Flush no encerramento grava o que estiver pendente
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from homeassistant.core import CoreState
+
+from custom_components.easy_smart_monitor.coordinator import (
+    EasySmartMonitorCoordinator,
+)
+from custom_components.easy_smart_monitor.storage import (
+    STORAGE_KEY,
+    EasySmartMonitorStorage,
+)
+
+
+@pytest_asyncio.fixture
+async def storage(mock_hass):
+    mock_hass.loop = asyncio.get_running_loop()
+    mock_hass.state = CoreState.running
+    mock_hass.data = {}
+    mock_hass.async_create_task = (
+        lambda target, *args, **kwargs: asyncio.ensure_future(target)
+    )
+
+    storage = EasySmartMonitorStorage(mock_hass)
+    await storage.async_load()
+
+    writes = []
+    write_data = storage._store._write_data
+
+    def _write(path, data):
+        writes.append(json.loads(json.dumps(data["data"])))
+        write_data(path, data)
+
+    storage._store._write_data = _write
+    storage.writes = writes
+    return storage
+
+
+def _stored(mock_hass):
+    with open(mock_hass.config.path(".storage", STORAGE_KEY)) as file:
+        return json.load(file)["data"]
+
+
+@pytest.mark.asyncio
+async def test_mutations_are_coalesced(storage, mock_hass):
+    with patch(
+        "custom_components.easy_smart_monitor.storage.STORAGE_SAVE_DELAY",
+        0.05,
+    ):
+        for i in range(200):
+            await storage.add_equipment(
+                equipment_id=str(i), name=f"Freezer {i}", location="Loja"
+            )
+            await storage.set_door_config(str(i), open_timeout=300)
+
+        assert storage.writes == []
+        assert storage.has_pending_save
+
+        await asyncio.sleep(0.1)
+
+    assert len(storage.writes) == 1
+    assert not storage.has_pending_save
+    assert len(_stored(mock_hass)["equipments"]) == 200
+    # Formato compacto: só o que difere do padrão
+    assert _stored(mock_hass)["equipments"]["199"]["door"] == {
+        "open_timeout": 300,
+    }
+
+
+@pytest.mark.asyncio
+async def test_delay_is_bounded(storage):
+    with patch(
+        "custom_components.easy_smart_monitor.storage.STORAGE_SAVE_DELAY",
+        0.05,
+    ), patch(
+        "custom_components.easy_smart_monitor.storage.STORAGE_SAVE_MAX_DELAY",
+        0.2,
+    ):
+        await storage.add_equipment(
+            equipment_id="1", name="Freezer", location="Loja"
+        )
+        # Alterações contínuas, mais rápidas que o atraso
+        for i in range(20):
+            await storage.set_collect_interval("1", 10 + i)
+            await asyncio.sleep(0.02)
+
+        # Sem o limite, nada seria gravado antes da última alteração
+        assert storage.writes
+        assert storage.writes[0]["equipments"]["1"]["collect_interval"] < 29
+
+        await asyncio.sleep(0.1)
+
+    assert storage.writes[-1]["equipments"]["1"]["collect_interval"] == 29
+    assert not storage.has_pending_save
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_pending_changes(
+    storage, mock_hass, mock_entry
+):
+    coordinator = EasySmartMonitorCoordinator(
+        mock_hass, mock_entry, MagicMock()
+    )
+    coordinator.storage = storage
+
+    await storage.add_equipment(
+        equipment_id="1", name="Freezer", location="Loja"
+    )
+    await storage.set_sensor_source("1", "temperature", "sensor.freezer")
+
+    await coordinator.async_shutdown()
+
+    assert len(storage.writes) == 1
+    assert _stored(mock_hass)["equipments"]["1"]["sensors"] == [
+        "sensor.freezer"
+    ]
+
+    # Nada pendente: flush não grava de novo
+    await storage.async_flush()
+    assert len(storage.writes) == 1
@@ -0,0 +1,153 @@
+"""
+Testes do formato em disco (v2) do storage de configuração.
+
+Foco:
+- Migração v1 → v2 na carga, sem perda
+- Formato compacto: associações em lista, padrões omitidos
+- Arquivo menor que o v1 para uma frota grande
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+import pytest
+
+from homeassistant.core import CoreState
+
+from custom_components.easy_smart_monitor.storage import (
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    EasySmartMonitorStorage,
+)
+
+
+def _v1_equipment(i):
+    return {
+        "id": str(i),
+        "name": f"Freezer {i}",
+        "location": "Loja",
+        "enabled": True,
+        "collect_interval": 30,
+        "door": {"enable_siren": True, "open_timeout": 120},
+        "sensors": {
+            "temperature": f"sensor.freezer_{i}",
+            "humidity": None,
+            "energy": None,
+            "door": f"binary_sensor.porta_{i}" if i % 2 else None,
+        },
+    }
+
+
+@pytest.fixture
+def hass(mock_hass):
+    mock_hass.state = CoreState.running
+    mock_hass.data = {}
+    mock_hass.async_create_task = (
+        lambda target, *args, **kwargs: asyncio.ensure_future(target)
+    )
+    return mock_hass
+
+
+def _path(hass):
+    return hass.config.path(".storage", STORAGE_KEY)
+
+
+def _write_v1(hass, equipments):
+    os.makedirs(os.path.dirname(_path(hass)), exist_ok=True)
+    with open(_path(hass), "w") as file:
+        json.dump(
+            {
+                "version": 1,
+                "key": STORAGE_KEY,
+                "data": {"equipments": equipments},
+            },
+            file,
+            indent=4,
+        )
+
+
+def _read(hass):
+    with open(_path(hass)) as file:
+        return json.load(file)
+
+
+@pytest.mark.asyncio
+async def test_migrates_v1(hass, caplog):
+    hass.loop = asyncio.get_running_loop()
+    equipments = {str(i): _v1_equipment(i) for i in range(1, 4)}
+    equipments["2"]["collect_interval"] = 60
+    equipments["2"]["door"]["enable_siren"] = False
+    equipments["2"]["telemetry"] = {"mode": "aggregate", "window": 300}
+    equipments["3"]["uuid"] = "u3"
+    _write_v1(hass, equipments)
+
+    storage = EasySmartMonitorStorage(hass)
+    with caplog.at_level(logging.DEBUG):
+        await storage.async_load()
+
+    # Em memória: formato completo, com uuid
+    for equipment_id, equipment in equipments.items():
+        loaded = dict(storage.get_equipment(equipment_id))
+        assert loaded.pop("uuid")
+        equipment.pop("uuid", None)
+        assert loaded == equipment
+    assert storage.get_equipment_by_uuid("u3")["id"] == "3"
+
+    # Em disco: migrado para v2 compacto
+    stored = _read(hass)
+    assert stored["version"] == STORAGE_VERSION == 2
+    assert stored["data"]["equipments"] == {
+        "1": {
+            "name": "Freezer 1",
+            "location": "Loja",
+            "sensors": [
+                "sensor.freezer_1",
+                None,
+                None,
+                "binary_sensor.porta_1",
+            ],
+        },
+        "2": {
+            "name": "Freezer 2",
+            "location": "Loja",
+            "collect_interval": 60,
+            "door": {"enable_siren": False},
+            "sensors": ["sensor.freezer_2"],
+            "telemetry": {"mode": "aggregate", "window": 300},
+        },
+        "3": {
+            "uuid": "u3",
+            "name": "Freezer 3",
+            "location": "Loja",
+            "sensors": [
+                "sensor.freezer_3",
+                None,
+                None,
+                "binary_sensor.porta_3",
+            ],
+        },
+    }
+
+    # Sem despejar o documento inteiro no log
+    assert "sensor.freezer_1" not in caplog.text
+
+    # Recarga do v2: mesmo conteúdo, mesmos uuids derivados
+    reloaded = EasySmartMonitorStorage(hass)
+    await reloaded.async_load()
+    assert reloaded.get_equipments() == storage.get_equipments()
+
+
+@pytest.mark.asyncio
+async def test_v2_is_smaller(hass):
+    hass.loop = asyncio.get_running_loop()
+    equipments = {str(i): _v1_equipment(i) for i in range(1000)}
+    _write_v1(hass, equipments)
+    v1_size = os.path.getsize(_path(hass))
+
+    storage = EasySmartMonitorStorage(hass)
+    await storage.async_load()
+
+    assert len(storage.get_equipments()) == 1000
+    assert os.path.getsize(_path(hass)) < v1_size / 2